@@ -7,585 +7,5162 @@ Requirements:
     pip install opencv-python mediapipe pyttsx3
 
 ASL Gesture Guide:
-    LETTERS (hold 1.2s):
-        A = Fist with thumb on side
-        B = Flat hand, fingers together
-        D = Index finger up, others closed
-        I = Pinky up only
-        L = Thumb + index up (L shape)
-        V = Index + middle up (peace sign)
-        W = Index + middle + ring up
+    The vocabulary lives in gestures.json (finger patterns thumb..pinky,
+    1 = up, 0 = down, x = either); the console help at startup lists the
+    loaded one. A gesture commits once the recognizer is sure of it, never
+    before its min_hold and at the latest after its hold (defaults: letters
+    0.3-1.2s, words 0.4-1.5s, actions 0.6-1.8s; --commit-policy hold always
+    waits the full hold). The bundled file has:
+
+    LETTERS: A B C D G H I J K L M N O P Q R S W X Y Z
+        e.g. A = thumb up, D = index up, L = thumb + index up
+
+    WORDS (both hands in view):
+        BOOK = both hands flat (four fingers up)
+        WORK = both thumbs up
+        HELP = left hand flat, right thumb up
+
+    ACTIONS:
+        SPACE = Closed fist
+        SPEAK = Open palm, all 5 fingers
+        DELETE = Index + middle up (V) - deletes last word
+        ACCEPT = Middle + ring + pinky up - takes the first word completion
+
+Usage:
+    1. Run the script
+    2. Allow webcam access
+    3. Make ASL signs in front of the camera
+    4. Hold each gesture until it commits (the progress bar fills)
+    5. Press 'q' to quit, 'c' to clear text
+"""
+
+import time
+_PROCESS_START = time.perf_counter()  # Origin of the startup timing breakdown
+
+import cv2
+import numpy as np
+from collections import deque, OrderedDict
+from typing import List, Tuple, Optional
+import threading
+import os
+import argparse
+import json
+import sys
+import types
+import gc
+import contextlib
+import queue
+import hashlib
+import shutil
+import struct
+import itertools
+import urllib.parse
+import re
+import math
+
+# mediapipe (~0.7s) and pyttsx3 are imported where they are first used, so
+# batch/benchmark/server paths that don't need them start faster and the live
+# loop can load them in the background while the camera opens. Likewise the
+# modules only one mode needs (http.server/http.client for --serve and
+# --load-test, multiprocessing for --streams, tracemalloc/tempfile for
+# --benchmark, subprocess for cached audio, mmap for --lexicon) are imported
+# inside that mode's code, keeping them off the live camera start path.
+_IMPORTS_DONE = time.perf_counter()
+
+NUM_LANDMARKS = 21
+
+# Hand skeleton as (start, end) landmark index pairs
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),  # Thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),  # Index
+    (0, 9), (9, 10), (10, 11), (11, 12),  # Middle
+    (0, 13), (13, 14), (14, 15), (15, 16),  # Ring
+    (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky
+    (5, 9), (9, 13), (13, 17)  # Palm
+])
+
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+FINGER_PIPS = np.array([3, 6, 10, 14, 18])
+PALM_POINTS = np.array([0, 5, 9, 13, 17])  # Wrist + finger bases: the palm centre
+
+
+class StageProfiler:
+    """Rolling per-stage timings, GC pauses and frame jitter for the live loop
+
+    Each stage keeps its last `window` durations (ms). Snapshots summarize them
+    as percentiles plus a fixed-bucket histogram and can be exported to JSON or
+    Prometheus text format.
+    """
+
+    BUCKETS_MS = (1, 2, 5, 10, 16, 33, 50, 100, 250, 1000)
+
+    def __init__(self, window: int = 300, frame_budget_ms: float = 33.0,
+                 export_path: Optional[str] = None, export_interval: float = 5.0):
+        self.window = window
+        self.frame_budget_ms = frame_budget_ms
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._last_frame = None
+        self._last_interval = None
+        self._last_export = time.perf_counter()
+        self._gc_start = None
+        gc.callbacks.append(self._on_gc)
+
+    def record(self, name: str, duration_ms: float):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(duration_ms)
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as one sample of the given stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000.0)
+
+    def frame_tick(self):
+        """Mark the end of a frame; records frame interval and frame-to-frame jitter"""
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            interval = (now - self._last_frame) * 1000.0
+            self.record("frame_interval", interval)
+            if self._last_interval is not None:
+                self.record("jitter", abs(interval - self._last_interval))
+            self._last_interval = interval
+        self._last_frame = now
+        if self.export_path and now - self._last_export >= self.export_interval:
+            self._last_export = now
+            self.export(self.export_path)
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self.record(f"gc_gen{info.get('generation', 0)}", (time.perf_counter() - self._gc_start) * 1000.0)
+            self._gc_start = None
+
+    def snapshot(self) -> dict:
+        """Summarize every stage: count, p50/p90/p99/max (ms) and histogram bucket counts"""
+        with self._lock:
+            samples = {name: np.fromiter(values, dtype=np.float64) for name, values in self._samples.items()}
+        summary = {}
+        for name, values in samples.items():
+            if not len(values):
+                continue
+            p50, p90, p99 = np.percentile(values, (50, 90, 99))
+            buckets = np.searchsorted(np.sort(values), self.BUCKETS_MS, side="right")
+            summary[name] = {
+                "count": int(len(values)),
+                "p50_ms": round(float(p50), 3),
+                "p90_ms": round(float(p90), 3),
+                "p99_ms": round(float(p99), 3),
+                "max_ms": round(float(values.max()), 3),
+                "sum_ms": round(float(values.sum()), 3),
+                "buckets": dict(zip((str(b) for b in self.BUCKETS_MS), buckets.tolist())),
+            }
+        return summary
+
+    def to_prometheus(self, summary: Optional[dict] = None) -> str:
+        """Render a snapshot as Prometheus text exposition (one histogram per stage)"""
+        summary = self.snapshot() if summary is None else summary
+        lines = [
+            "# HELP sign_to_voice_stage_ms Rolling-window stage duration in milliseconds",
+            "# TYPE sign_to_voice_stage_ms histogram",
+        ]
+        for name, stats in summary.items():
+            for bound, count in stats["buckets"].items():
+                lines.append(f'sign_to_voice_stage_ms_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'sign_to_voice_stage_ms_bucket{{stage="{name}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'sign_to_voice_stage_ms_sum{{stage="{name}"}} {stats["sum_ms"]}')
+            lines.append(f'sign_to_voice_stage_ms_count{{stage="{name}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str):
+        """Write a snapshot to path (.prom/.txt -> Prometheus text, otherwise JSON), atomically"""
+        summary = self.snapshot()
+        if path.endswith((".prom", ".txt")):
+            content = self.to_prometheus(summary)
+        else:
+            content = json.dumps({"timestamp": time.time(), "frame_budget_ms": self.frame_budget_ms,
+                                  "stages": summary}, indent=2)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def draw_panel(self, img, x: Optional[int] = None, y: int = 200):
+        """Draw a per-stage p50/p99 table; stages whose p99 exceeds the frame budget are red"""
+        summary = self.snapshot()
+        h, w = img.shape[:2]
+        if x is None:
+            x = w - 330
+        cv2.rectangle(img, (x - 10, y - 20), (w - 10, y + 20 * len(summary) + 5), (0, 0, 0), -1)
+        cv2.putText(img, "stage            p50    p99 (ms)", (x, y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
+        for i, (name, stats) in enumerate(summary.items(), start=1):
+            over = stats["p99_ms"] > self.frame_budget_ms and name not in ("frame_interval",)
+            color = (0, 0, 255) if over else (200, 200, 200)
+            cv2.putText(img, f"{name[:15]:<15} {stats['p50_ms']:6.1f} {stats['p99_ms']:6.1f}",
+                       (x, y + 20 * i), cv2.FONT_HERSHEY_SIMPLEX, 0.45, color, 1)
+
+    def close(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self.export_path:
+            self.export(self.export_path)
+
+
+def profile_stage(profiler: Optional[StageProfiler], name: str):
+    """Context manager timing a stage when profiling is enabled, no-op otherwise"""
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.stage(name)
+
+
+class LandmarkBuffer:
+    """Preallocated landmark storage: normalized (x, y, z) per hand, plus a pixel view"""
+
+    def __init__(self, max_num_hands: int = 2):
+        self.max_num_hands = max_num_hands
+        self.landmarks = np.zeros((max_num_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.pixels = np.zeros((max_num_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+        self.num_hands = 0
+
+    def fill(self, hand_landmarks, frame_shape, roi: Optional[Tuple[int, int, int, int]] = None):
+        """Copy MediaPipe hand_landmarks (list of 21-landmark lists) into the arrays
+
+        roi = (x0, y0, width, height) in frame pixels when the landmarks were
+        detected on a crop; they are mapped back to full-frame coordinates.
+        """
+        n = min(len(hand_landmarks), self.max_num_hands) if hand_landmarks else 0
+        for i in range(n):
+            self.landmarks[i].reshape(-1)[:] = [c for lm in hand_landmarks[i] for c in (lm.x, lm.y, lm.z)]
+        self.num_hands = n
+        if n:
+            h, w = frame_shape[:2]
+            if roi is not None:
+                x0, y0, rw, rh = roi
+                hands = self.landmarks[:n]
+                hands *= (rw / w, rh / h, rw / w)
+                hands += (x0 / w, y0 / h, 0.0)
+            np.multiply(self.landmarks[:n, :, :2], (w, h), out=self.pixels[:n])
+
+    def set(self, landmarks: np.ndarray, frame_shape):
+        """Overwrite the stored hands with a (hands, 21, 3) normalized array"""
+        n = min(len(landmarks), self.max_num_hands)
+        self.landmarks[:n] = landmarks[:n]
+        self.num_hands = n
+        if n:
+            h, w = frame_shape[:2]
+            np.multiply(self.landmarks[:n, :, :2], (w, h), out=self.pixels[:n])
+
+    def array(self) -> np.ndarray:
+        """(hands, 21, 3) float32 view of normalized landmarks"""
+        return self.landmarks[:self.num_hands]
+
+    def pixel_array(self) -> np.ndarray:
+        """(hands, 21, 2) float32 view of pixel landmarks"""
+        return self.pixels[:self.num_hands]
+
+    def to_tuples(self) -> Optional[List[List[Tuple[int, int, int]]]]:
+        """Legacy format: per hand, a list of (id, x, y) integer pixel tuples"""
+        if not self.num_hands:
+            return None
+        return [[(idx, x, y) for idx, (x, y) in enumerate(hand)]
+                for hand in self.pixel_array().astype(np.int32).tolist()]
+
+
+def preprocess_frame(frame):
+    """Brightness/contrast enhancement and BGR -> RGB conversion for the landmarker"""
+    # Enhance image for better detection
+    enhanced = cv2.convertScaleAbs(frame, alpha=1.1, beta=10)
+    return cv2.cvtColor(enhanced, cv2.COLOR_BGR2RGB)
+
+
+def enhancement_lut(alpha: float = 1.1, beta: float = 10) -> np.ndarray:
+    """256-entry table equal to cv2.convertScaleAbs(x, alpha, beta) for uint8 x"""
+    values = np.arange(256, dtype=np.float32) * np.float32(alpha) + np.float32(beta)
+    return np.clip(np.rint(np.abs(values)), 0, 255).astype(np.uint8)
+
+
+class FramePreprocessor:
+    """Reusable-buffer frame preparation: mirroring and enhanced BGR -> RGB
+
+    Output buffers are allocated once per frame shape and written in place
+    (cv2 dst= arguments). Brightness/contrast runs as a single in-place LUT
+    pass on the RGB buffer. mirror() cycles through ring_size buffers, for
+    callers that are done with a frame before mirroring the next one;
+    checkout_mirror() hands out pooled buffers that stay the caller's until
+    release(), for frames in flight across pipeline stages.
+    """
+
+    def __init__(self, alpha: float = 1.1, beta: float = 10, ring_size: int = 1):
+        self.lut = enhancement_lut(alpha, beta)
+        self.ring_size = max(1, ring_size)
+        self._mirror_ring = []
+        self._mirror_index = 0
+        self._free = deque()  # Released checkout_mirror() buffers
+        self._rgb = None
+        self._resized = None
+        self.bytes_allocated = 0
+        self.frames = 0
+
+    def _buffer(self, current: Optional[np.ndarray], shape) -> np.ndarray:
+        if current is None or current.shape != shape:
+            current = np.empty(shape, dtype=np.uint8)
+            self.bytes_allocated += current.nbytes
+        return current
+
+    def mirror(self, frame: np.ndarray) -> np.ndarray:
+        """Horizontally flipped frame, written into the next ring buffer"""
+        if len(self._mirror_ring) < self.ring_size or self._mirror_ring[self._mirror_index].shape != frame.shape:
+            buffer = self._buffer(None, frame.shape)
+            if len(self._mirror_ring) < self.ring_size:
+                self._mirror_ring.append(buffer)
+                self._mirror_index = len(self._mirror_ring) - 1
+            else:
+                self._mirror_ring[self._mirror_index] = buffer
+        out = self._mirror_ring[self._mirror_index]
+        self._mirror_index = (self._mirror_index + 1) % self.ring_size
+        return cv2.flip(frame, 1, dst=out)
+
+    def checkout_mirror(self, frame: np.ndarray) -> np.ndarray:
+        """Horizontally flipped frame in a pooled buffer that is not reused until release()
+
+        A new buffer is allocated when every pooled one is still checked out,
+        so the pool grows to the number of frames in flight.
+        """
+        out = None
+        while self._free:
+            buffer = self._free.pop()
+            if buffer.shape == frame.shape:
+                out = buffer
+                break
+        if out is None:
+            out = self._buffer(None, frame.shape)
+        return cv2.flip(frame, 1, dst=out)
+
+    def release(self, buffer: np.ndarray):
+        """Return a checkout_mirror() buffer to the pool (safe from any thread)"""
+        self._free.append(buffer)
+
+    def to_rgb(self, frame: np.ndarray) -> np.ndarray:
+        """Enhanced RGB copy of a BGR frame in the reusable RGB buffer"""
+        self.frames += 1
+        self._rgb = self._buffer(self._rgb, frame.shape)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return cv2.LUT(self._rgb, self.lut, dst=self._rgb)
+
+    def resize(self, frame: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+        """Area-downscale frame to size (width, height) into a reusable buffer"""
+        self._resized = self._buffer(self._resized, (size[1], size[0], frame.shape[2]))
+        return cv2.resize(frame, size, dst=self._resized, interpolation=cv2.INTER_AREA)
+
+    def bytes_per_frame(self) -> float:
+        return self.bytes_allocated / self.frames if self.frames else 0.0
+
+
+def draw_hand_landmarks(frame, landmarks: np.ndarray):
+    """Draw a (hands, 21, 3) array of normalized landmarks onto frame
+
+    All hands are drawn with two batched calls: one polylines call for the
+    skeleton segments and one for the joints (zero-length thick segments
+    render as filled dots, same footprint as a radius-5 circle).
+    """
+    if len(landmarks) == 0:
+        return
     
-    COMMON WORDS (hold 1.5s):
-        YES = Thumbs up only
-        NO = Pinky only
-        HELLO = Index + middle + ring fingers up
-        LOVE = Thumb + pinky (I love you sign)
-        THANK YOU = Index + pinky up
+    h, w = frame.shape[:2]
+    points = (landmarks[:, :, :2] * (w, h)).astype(np.int32)
+    # Connections as (hands * 23, 2, 2) segments
+    segments = points[:, HAND_CONNECTIONS].reshape(-1, 2, 2)
+    cv2.polylines(frame, segments, False, (0, 255, 0), 2)
+    # Landmarks as degenerate (p, p) segments
+    dots = np.repeat(points.reshape(-1, 1, 2), 2, axis=1)
+    cv2.polylines(frame, dots, False, (255, 0, 0), 10)
+
+
+MODEL_URL = 'https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task'
+MODEL_FILENAME = 'hand_landmarker.task'
+
+# Set from the command line by configure_model(); read by resolve_model_path()
+_model_settings = {"path": None, "cache_dir": None, "sha256": None, "allow_download": True}
+
+
+def default_model_cache_dir() -> str:
+    """$SIGN_TO_VOICE_CACHE, else the per-user cache directory of the platform"""
+    if os.environ.get("SIGN_TO_VOICE_CACHE"):
+        return os.environ["SIGN_TO_VOICE_CACHE"]
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "sign_to_voice")
+
+
+def configure_model(path: Optional[str] = None, cache_dir: Optional[str] = None,
+                    sha256: Optional[str] = None, allow_download: bool = True):
+    """Set where HandTracker finds its model when no model_path is passed"""
+    _model_settings.update(path=path, cache_dir=cache_dir,
+                           sha256=sha256.lower() if sha256 else None, allow_download=allow_download)
+
+
+def _write_model_record(path: str, digest: str):
+    st = os.stat(path)
+    with open(path + ".sha256", "w", encoding="utf-8") as f:
+        json.dump({"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}, f)
+
+
+def verify_model_file(path: str, expected_sha256: Optional[str] = None) -> str:
+    """Return the model's SHA-256, raising ValueError if it doesn't match
+
+    The digest is recorded in a `<model>.sha256` sidecar together with the
+    file's size and mtime, so later startups skip re-hashing an unchanged
+    file. A file that changed since it was recorded (e.g. a truncated copy)
+    is re-hashed and rejected unless expected_sha256 vouches for it.
+    """
+    st = os.stat(path)
+    record = None
+    try:
+        with open(path + ".sha256", encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        pass
+    if record and record.get("size") == st.st_size and record.get("mtime_ns") == st.st_mtime_ns:
+        digest = record["sha256"]
+    else:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        if record and not expected_sha256 and record.get("sha256") != digest:
+            raise ValueError(f"{path} changed since it was verified (sha256 {digest[:12]}..., "
+                             f"expected {str(record.get('sha256'))[:12]}...)")
+    if expected_sha256 and digest != expected_sha256:
+        raise ValueError(f"{path} has sha256 {digest}, expected {expected_sha256}")
+    if not record or record.get("sha256") != digest or record.get("mtime_ns") != st.st_mtime_ns:
+        try:
+            _write_model_record(path, digest)
+        except OSError:
+            pass  # Read-only location: verify again next time
+    return digest
+
+
+def download_model(dest: str, expected_sha256: Optional[str] = None, timeout: float = 30.0) -> str:
+    """Download the landmarker model atomically into dest (verified before it replaces anything)"""
+    import urllib.request
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    tmp = f"{dest}.{os.getpid()}.part"
+    sha = hashlib.sha256()
+    print("Downloading hand landmarker model...")
+    try:
+        with urllib.request.urlopen(MODEL_URL, timeout=timeout) as response, open(tmp, "wb") as f:
+            for chunk in iter(lambda: response.read(1 << 16), b""):
+                sha.update(chunk)
+                f.write(chunk)
+        if expected_sha256 and sha.hexdigest() != expected_sha256:
+            raise ValueError(f"downloaded model has sha256 {sha.hexdigest()}, expected {expected_sha256}")
+        os.replace(tmp, dest)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    _write_model_record(dest, sha.hexdigest())
+    print(f"Model downloaded successfully to {dest}")
+    return dest
+
+
+def resolve_model_path(path: Optional[str] = None, cache_dir: Optional[str] = None,
+                       sha256: Optional[str] = None, allow_download: Optional[bool] = None) -> str:
+    """Locate a verified hand landmarker model, downloading it only as a last resort
+
+    Looks at an explicit path, then the cache directory, then legacy copies
+    next to the script or in the working directory (copied into the cache so
+    one file serves every working directory). Arguments default to the
+    values given to configure_model(). Raises FileNotFoundError when the
+    model is missing and downloading is disabled, ValueError on a checksum
+    mismatch.
+    """
+    path = path or _model_settings["path"]
+    sha256 = sha256 or _model_settings["sha256"]
+    if allow_download is None:
+        allow_download = _model_settings["allow_download"]
+    if path:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model file not found: {path}")
+        verify_model_file(path, sha256)
+        return path
+
+    cache_dir = cache_dir or _model_settings["cache_dir"] or default_model_cache_dir()
+    cached = os.path.join(cache_dir, MODEL_FILENAME)
+    if os.path.exists(cached):
+        try:
+            verify_model_file(cached, sha256)
+            return cached
+        except ValueError as e:
+            print(f"⚠️ Discarding cached model: {e}")
+            for stale in (cached, cached + ".sha256"):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+    for legacy in (os.path.join(os.path.dirname(os.path.abspath(__file__)), MODEL_FILENAME),
+                   os.path.abspath(MODEL_FILENAME)):
+        if os.path.exists(legacy):
+            digest = verify_model_file(legacy, sha256)
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp = f"{cached}.{os.getpid()}.part"
+                shutil.copyfile(legacy, tmp)
+                os.replace(tmp, cached)
+                _write_model_record(cached, digest)
+                return cached
+            except OSError:
+                return legacy
+
+    if not allow_download:
+        raise FileNotFoundError(f"{MODEL_FILENAME} not found in {cache_dir} and downloading is disabled; "
+                                f"copy the model there or pass --model PATH")
+    return download_model(cached, sha256)
+
+
+class StartupTimer:
+    """Wall-clock phases from process start to the first recognized frame
+
+    Phases may overlap (they run on different threads); each is reported
+    with its start offset from process start and its duration.
+    """
+
+    def __init__(self, origin: float = _PROCESS_START):
+        self.origin = origin
+        self.phases = []  # (name, start offset s, duration s)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, end: float):
+        with self._lock:
+            self.phases.append((name, start - self.origin, end - start))
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def mark(self, name: str):
+        """Record a milestone (zero-length phase) at the current time"""
+        now = time.perf_counter()
+        self.record(name, now, now)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.origin
+
+    def report(self):
+        print("⏱️ Startup:")
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p[1])
+        for name, offset, duration in phases:
+            took = f"{duration*1000:8.1f} ms" if duration else " " * 11
+            print(f"   {name:<22} {took}  (at {offset:.2f}s)")
+
+
+class HandTracker:
+    """MediaPipe hand tracking wrapper using tasks API"""
     
-    ACTIONS:
-        SPACE = Closed fist (hold 1.8s)
-        SPEAK = Open palm, all 5 fingers (hold 1.8s)
-        DELETE = Peace sign / V (hold 1.2s) - deletes last word
+    def __init__(self, static_image_mode: bool = False, max_num_hands: int = 2,
+                 min_detection_confidence: float = 0.3, min_tracking_confidence: float = 0.3,
+                 roi_mode: bool = False, roi_padding: float = 0.6, roi_target_size: int = 256,
+                 roi_min_confidence: float = 0.6, roi_refresh_interval: int = 30,
+                 motion_gate: bool = False, motion_threshold: float = 2.0, max_skip: int = 5,
+                 extrapolate: bool = True, model_path: Optional[str] = None):
+        """roi_mode runs the landmarker on a padded crop around the last known
+        hands (downscaled to at most roi_target_size pixels), falling back to
+        full-frame detection when the track is lost, confidence drops below
+        roi_min_confidence, or every roi_refresh_interval frames to pick up
+        new hands.
+
+        motion_gate skips the landmarker on frames that barely differ from the
+        last inferred one (mean absolute difference of a 64x36 grayscale
+        thumbnail below motion_threshold), for at most max_skip frames in a
+        row. Skipped frames reuse the last landmarks, or extrapolate them at
+        constant velocity when extrapolate is set.
+
+        static_image_mode treats every frame independently (IMAGE-mode
+        landmarker, no tracking state or timestamps), so one tracker can be
+        shared between unrelated streams.
+
+        model_path defaults to resolve_model_path() (verified cache copy).
+        """
+        if model_path is None:
+            model_path = resolve_model_path()
+        
+        # Create hand landmarker
+        import mediapipe as mp
+        from mediapipe.tasks import python
+        from mediapipe.tasks.python import vision
+        self._mp = mp
+        
+        base_options = python.BaseOptions(model_asset_path=model_path)
+        options = vision.HandLandmarkerOptions(
+            base_options=base_options,
+            running_mode=vision.RunningMode.IMAGE if static_image_mode else vision.RunningMode.VIDEO,
+            num_hands=max_num_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+        self.static_image_mode = static_image_mode
+        self.roi_landmarker = None
+        if roi_mode:
+            # Crops move with the hand, so they go through an IMAGE-mode instance:
+            # the VIDEO-mode tracker assumes a fixed camera frame
+            roi_options = vision.HandLandmarkerOptions(
+                base_options=base_options,
+                running_mode=vision.RunningMode.IMAGE,
+                num_hands=max_num_hands,
+                min_hand_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence
+            )
+            self.roi_landmarker = vision.HandLandmarker.create_from_options(roi_options)
+        self.roi_padding = roi_padding
+        self.roi_target_size = roi_target_size
+        self.roi_min_confidence = roi_min_confidence
+        self.roi_refresh_interval = roi_refresh_interval
+        self.roi = None  # (x0, y0, w, h) of the current crop, None = full frame
+        self.roi_hits = 0
+        self.roi_fallbacks = 0
+        self._frames_since_full = 0
+        self.frames_processed = 0
+        self.motion_gate = motion_gate
+        self.motion_threshold = motion_threshold
+        self.max_skip = max_skip
+        self.extrapolate = extrapolate
+        self.frames_skipped = 0
+        self._consecutive_skips = 0
+        self._motion_ref = None  # Thumbnail of the last inferred frame
+        self._last_inferred = None  # Landmarks from the last two inferences
+        self._prev_inferred = None
+        self._inference_gap = 1
+        self._inference_times = deque(maxlen=120)
+        self.results = None
+        self._last_frame_shape = None
+        self._timestamp_ms = 0
+        self.landmark_buffer = LandmarkBuffer(max_num_hands)
+        self.preprocessor = FramePreprocessor()
+        self.roi_preprocessor = FramePreprocessor()
+        self.profiler = None  # Optional StageProfiler
+
+    def process(self, frame, return_pixel_landmarks: bool = False, timestamp_ms: Optional[int] = None):
+        """Process BGR frame and return landmarks
+
+        timestamp_ms is the frame's capture time; when omitted, frames are
+        assumed to arrive at ~30fps. Timestamps must increase monotonically.
+        """
+        self._last_frame_shape = frame.shape
+        self.frames_processed += 1
+        if timestamp_ms is None:
+            self._timestamp_ms += 33  # Approximate 30fps
+        else:
+            self._timestamp_ms = int(timestamp_ms)
+        
+        if self.motion_gate:
+            with profile_stage(self.profiler, "motion"):
+                skip = self._should_skip(frame)
+            if skip:
+                self._reuse_landmarks(frame.shape)
+                if return_pixel_landmarks:
+                    return self.get_hands_landmarks()
+                return self.results
+        
+        if not (self.roi_landmarker and self.roi and self._detect_roi(frame)):
+            self._detect_full(frame)
+        if self.roi_landmarker:
+            self._update_roi(frame.shape)
+        if self.motion_gate:
+            self._remember_inference()
+        
+        if return_pixel_landmarks:
+            return self.get_hands_landmarks()
+        return self.results
+
+    def _mp_image(self, image_rgb: np.ndarray):
+        return self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=image_rgb)
+
+    def warm_up(self, frame_shape: Tuple[int, int, int] = (540, 960, 3)):
+        """Run the landmarker(s) once on a blank frame, then forget it
+
+        The first inference pays for graph and delegate setup; doing it
+        during startup keeps that off the first camera frame.
+        """
+        blank = np.zeros(frame_shape, dtype=np.uint8)
+        self._detect_full(blank)
+        if self.roi_landmarker:
+            self.roi_landmarker.detect(self._mp_image(self.roi_preprocessor.to_rgb(blank[:64, :64])))
+        self.results = None
+        self.landmark_buffer.fill(None, frame_shape)
+        self.roi = None
+
+    def _detect_full(self, frame):
+        """Full-frame detection through the main landmarker"""
+        with profile_stage(self.profiler, "preprocess"):
+            image_rgb = self.preprocessor.to_rgb(frame)
+            mp_image = self._mp_image(image_rgb)
+        
+        with profile_stage(self.profiler, "inference"):
+            if self.static_image_mode:
+                self.results = self.landmarker.detect(mp_image)
+            else:
+                self.results = self.landmarker.detect_for_video(mp_image, self._timestamp_ms)
+        with profile_stage(self.profiler, "landmarks"):
+            self.landmark_buffer.fill(self.results.hand_landmarks if self.results else None, frame.shape)
+        self._frames_since_full = 0
+
+    def _detect_roi(self, frame) -> bool:
+        """Detect on the crop around the last known hands; False if the track was lost"""
+        if self._frames_since_full >= self.roi_refresh_interval:
+            return False
+        x0, y0, rw, rh = self.roi
+        with profile_stage(self.profiler, "preprocess"):
+            crop = frame[y0:y0 + rh, x0:x0 + rw]
+            scale = self.roi_target_size / max(rw, rh)
+            if scale < 1.0:
+                crop = self.roi_preprocessor.resize(crop, (max(1, int(rw * scale)), max(1, int(rh * scale))))
+            image_rgb = self.roi_preprocessor.to_rgb(crop)
+            mp_image = self._mp_image(image_rgb)
+        
+        with profile_stage(self.profiler, "inference"):
+            results = self.roi_landmarker.detect(mp_image)
+        if not results.hand_landmarks or min(
+                h[0].score for h in results.handedness) < self.roi_min_confidence:
+            self.roi_fallbacks += 1
+            return False
+        
+        self.results = results
+        with profile_stage(self.profiler, "landmarks"):
+            self.landmark_buffer.fill(results.hand_landmarks, frame.shape, self.roi)
+        self.roi_hits += 1
+        self._frames_since_full += 1
+        return True
+
+    def _update_roi(self, frame_shape):
+        """Padded square crop around all tracked hands, or None to use the full frame"""
+        pixels = self.get_pixel_array()
+        if len(pixels) == 0:
+            self.roi = None
+            return
+        h, w = frame_shape[:2]
+        (min_x, min_y), (max_x, max_y) = pixels.min(axis=(0, 1)), pixels.max(axis=(0, 1))
+        side = max(max_x - min_x, max_y - min_y) * (1.0 + 2.0 * self.roi_padding)
+        # Quantize to 16px steps so the crop buffers are rarely reallocated
+        side = max(16.0 * np.ceil(side / 16.0), 64.0)
+        cx, cy = (min_x + max_x) / 2.0, (min_y + max_y) / 2.0
+        x0 = int(max(0, cx - side / 2.0))
+        y0 = int(max(0, cy - side / 2.0))
+        x1 = int(min(w, cx + side / 2.0))
+        y1 = int(min(h, cy + side / 2.0))
+        if x1 - x0 < 16 or y1 - y0 < 16 or (x1 - x0) * (y1 - y0) > 0.8 * w * h:
+            self.roi = None
+        else:
+            self.roi = (x0, y0, x1 - x0, y1 - y0)
+
+    def _should_skip(self, frame) -> bool:
+        """Cheap motion check against the last inferred frame"""
+        thumb = cv2.cvtColor(cv2.resize(frame, (64, 36), interpolation=cv2.INTER_AREA),
+                             cv2.COLOR_BGR2GRAY)
+        if (self._motion_ref is not None and self._consecutive_skips < self.max_skip
+                and float(cv2.absdiff(thumb, self._motion_ref).mean()) < self.motion_threshold):
+            return True
+        self._motion_ref = thumb
+        return False
+
+    def _reuse_landmarks(self, frame_shape):
+        """Fill the buffer for a skipped frame from the last inferences"""
+        self._consecutive_skips += 1
+        self.frames_skipped += 1
+        last, prev = self._last_inferred, self._prev_inferred
+        if (self.extrapolate and last is not None and prev is not None
+                and len(last) == len(prev) and len(last) > 0):
+            velocity = (last - prev) / self._inference_gap
+            self.landmark_buffer.set(last + velocity * self._consecutive_skips, frame_shape)
+
+    def _remember_inference(self):
+        self._prev_inferred = self._last_inferred
+        self._last_inferred = self.get_landmark_array().copy()
+        self._inference_gap = self._consecutive_skips + 1
+        self._consecutive_skips = 0
+        self._inference_times.append(time.perf_counter())
+
+    def inference_stats(self) -> dict:
+        """Skip ratio and effective landmarker invocations per second (recent window)"""
+        times = self._inference_times
+        rate = (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 and times[-1] > times[0] else 0.0
+        total = self.frames_processed
+        return {
+            "frames": total,
+            "skipped": self.frames_skipped,
+            "skip_ratio": round(self.frames_skipped / total, 3) if total else 0.0,
+            "inference_rate": round(rate, 1),
+        }
+
+    def roi_stats(self) -> dict:
+        total = self.frames_processed
+        return {
+            "roi_frames": self.roi_hits,
+            "roi_fallbacks": self.roi_fallbacks,
+            "roi_ratio": round(self.roi_hits / total, 3) if total else 0.0,
+            "roi": self.roi,
+        }
+
+    def get_landmark_array(self) -> np.ndarray:
+        """Return normalized landmarks as a (hands, 21, 3) float32 view (valid until next process)"""
+        return self.landmark_buffer.array()
+
+    def get_pixel_array(self) -> np.ndarray:
+        """Return pixel landmarks as a (hands, 21, 2) float32 view (valid until next process)"""
+        return self.landmark_buffer.pixel_array()
+
+    def get_handedness(self) -> List[Tuple[Optional[str], float]]:
+        """(label, score) per hand in get_landmark_array order, e.g. ("Right", 0.97)"""
+        n = self.landmark_buffer.num_hands
+        if not self.results or not self.results.handedness:
+            return [(None, 0.0)] * n
+        return [(h[0].category_name, h[0].score) for h in self.results.handedness[:n]]
+
+    def get_hands_landmarks(self) -> Optional[List[List[Tuple[int, int, int]]]]:
+        """Return landmarks as list of (id, x, y) tuples (compatibility shim over the arrays)"""
+        return self.landmark_buffer.to_tuples()
+
+    def draw_landmarks(self, frame, landmarks: Optional[np.ndarray] = None):
+        """Draw hand landmarks on frame (defaults to the last processed hands)
+
+        landmarks is a (hands, 21, 3) array of normalized coordinates.
+        """
+        if landmarks is None:
+            landmarks = self.get_landmark_array()
+        draw_hand_landmarks(frame, landmarks)
+
+    def close(self):
+        """Cleanup resources"""
+        if self.landmarker:
+            self.landmarker.close()
+        if self.roi_landmarker:
+            self.roi_landmarker.close()
+
+
+class AudioCache:
+    """Size-bounded LRU cache of synthesized utterances on local disk
+
+    Entries are keyed by normalized text + voice + rate. Recency is the file
+    mtime, so the LRU order survives restarts. Renders are written to a
+    .tmp.wav file and only indexed once commit() has renamed them into place.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # filename -> size, least recently used first
+        files = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith(".tmp.wav"):
+                # Left by a render that never reached commit(): partial audio, not a phrase
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+            elif name.endswith(".wav"):
+                st = os.stat(path)
+                files.append((st.st_mtime, name, st.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+        self.total_bytes = sum(self._entries.values())
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str, voice: Optional[str], rate: int) -> str:
+        normalized = ' '.join(text.lower().split())
+        return hashlib.sha1(f"{voice}|{rate}|{normalized}".encode("utf-8")).hexdigest() + ".wav"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached file path and mark it recently used, or None"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        path = os.path.join(self.directory, key)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.total_bytes -= self._entries.pop(key, 0)
+            return None
+        return path
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def temp_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".tmp.wav")
+
+    def commit(self, key: str, temp_path: str) -> bool:
+        """Move a freshly synthesized file into the cache and evict down to max_bytes"""
+        if not os.path.exists(temp_path) or os.path.getsize(temp_path) == 0:
+            return False
+        path = os.path.join(self.directory, key)
+        os.replace(temp_path, path)
+        with self._lock:
+            self.total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = os.path.getsize(path)
+            self.total_bytes += self._entries[key]
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, size = self._entries.popitem(last=False)
+                self.total_bytes -= size
+                try:
+                    os.remove(os.path.join(self.directory, old_key))
+                except OSError:
+                    pass
+        return True
+
+
+def play_audio_file(path: str):
+    """Play an audio file with the platform's player; returns a Popen, True, or False if unsupported"""
+    if sys.platform.startswith("win"):
+        import winsound
+        winsound.PlaySound(path, winsound.SND_FILENAME)
+        return True
+    import subprocess
+    players = (["afplay"],) if sys.platform == "darwin" else (["aplay", "-q"], ["paplay"], ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"])
+    for player in players:
+        if shutil.which(player[0]):
+            return subprocess.Popen(player + [path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return False
+
+
+class TextToSpeechEngine:
+    """Non-blocking text-to-speech engine using pyttsx3
+
+    A single long-lived worker thread owns one initialized engine (voice
+    resolved once) and speaks utterances from a bounded queue. When the queue
+    is busy, `policy` decides what happens to a new utterance:
+        "queue"     - wait its turn (the oldest pending one is dropped if full)
+        "coalesce"  - merge with pending utterances into one
+        "interrupt" - stop current speech and replace anything pending
+
+    Only the worker touches the engine: an interrupt is a flag the worker
+    acts on at the next word (pyttsx3's started-word callback) or while
+    waiting for cached playback.
+
+    With an AudioCache, short phrases are rendered to disk once (after their
+    first live utterance, or ahead of time via prewarm) and played back
+    from the cache afterwards.
+    """
+
+    POLICIES = ("queue", "coalesce", "interrupt")
+
+    def __init__(self, policy: str = "queue", max_queue: int = 8, rate: int = 140,
+                 volume: float = 1.0, preferred_voices: Tuple[str, ...] = ("zira", "hazel"),
+                 cache: Optional[AudioCache] = None, cache_max_chars: int = 40):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown TTS policy {policy!r}; expected one of {self.POLICIES}")
+        self.policy = policy
+        self.rate = rate
+        self.volume = volume
+        self.preferred_voices = preferred_voices
+        self.cache = cache
+        self.cache_max_chars = cache_max_chars
+        self.voice_id = None
+        self.is_speaking = False
+        self.speech_queue = deque(maxlen=max_queue)  # (text, enqueue time)
+        self._fill_queue = deque()  # phrases to render into the cache when idle
+        self._cond = threading.Condition()
+        self._engine = None
+        self._thread = None
+        self._running = False
+        self._ready = threading.Event()
+        self._interrupt = threading.Event()  # Set by speak(), acted on by the worker
+        self.queue_latency = deque(maxlen=50)
+        self.synthesis_time = deque(maxlen=50)
+        self.spoken_count = 0
+        self.cached_count = 0
+        self.dropped_count = 0
+        self.coalesced_count = 0
+        self.interrupted_count = 0
+
+    def start(self):
+        """Start the worker and initialize the engine (idempotent)"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._worker, name="tts", daemon=True)
+            self._thread.start()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the engine is initialized"""
+        return self._ready.wait(timeout)
+
+    def speak(self, text: str):
+        """Queue text for speech without blocking the caller"""
+        text = ' '.join(text.split())
+        if not text:
+            return
+        self.start()
+        now = time.perf_counter()
+        with self._cond:
+            if self.policy == "interrupt":
+                if self.speech_queue or self.is_speaking:
+                    self.interrupted_count += 1
+                self.speech_queue.clear()
+                if self.is_speaking:
+                    self._interrupt.set()
+            elif self.policy == "coalesce" and self.speech_queue:
+                pending_text, enqueued = self.speech_queue.pop()
+                text = f"{pending_text} {text}"
+                now = enqueued
+                self.coalesced_count += 1
+            if len(self.speech_queue) == self.speech_queue.maxlen:
+                dropped, _ = self.speech_queue[0]
+                self.dropped_count += 1
+                print(f"⚠️ Speech queue full, dropping: {dropped}")
+            self.speech_queue.append((text, now))
+            self._cond.notify()
+
+    def prewarm(self, phrases):
+        """Render phrases into the audio cache in the background, while idle"""
+        if self.cache is None:
+            return
+        self.start()
+        with self._cond:
+            self._fill_queue.extend(' '.join(p.split()) for p in phrases if p.strip())
+            self._cond.notify()
+
+    def _on_word(self, name, location, length):
+        """started-word callback, run by the engine on the worker thread"""
+        if self._interrupt.is_set():
+            self._engine.stop()
+
+    def _init_engine(self):
+        import pyttsx3
+        engine = pyttsx3.init()
+        # Try to find a better voice (prefer female voices as they're clearer)
+        for voice in engine.getProperty('voices'):
+            if any(name in voice.name.lower() for name in self.preferred_voices):
+                engine.setProperty('voice', voice.id)
+                break
+        engine.setProperty('rate', self.rate)  # Slightly slower for clarity
+        engine.setProperty('volume', self.volume)
+        self.voice_id = engine.getProperty('voice')
+        engine.connect('started-word', self._on_word)
+        return engine
+
+    def _cacheable(self, text: str) -> bool:
+        return self.cache is not None and len(text) <= self.cache_max_chars
+
+    def _play_cached(self, text: str) -> bool:
+        """Play text from the audio cache; False on a miss or without a usable player"""
+        if not self._cacheable(text):
+            return False
+        path = self.cache.get(AudioCache.key(text, self.voice_id, self.rate))
+        if path is None:
+            return False
+        player = play_audio_file(path)
+        if player is False:
+            return False
+        if player is not True:
+            while player.poll() is None:
+                if self._interrupt.wait(0.05):
+                    player.terminate()
+                    player.wait()
+        return True
+
+    def _fill_cache(self, text: str):
+        """Render text to the cache with pyttsx3's save-to-file path"""
+        key = AudioCache.key(text, self.voice_id, self.rate)
+        if self._engine is None or key in self.cache:
+            return
+        temp_path = self.cache.temp_path(key)
+        try:
+            self._engine.save_to_file(text, temp_path)
+            self._engine.runAndWait()
+            self.cache.commit(key, temp_path)
+        except Exception as e:
+            print(f"Speech cache error: {e}")
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _worker(self):
+        """Own the engine for the lifetime of the process and drain the queue"""
+        try:
+            self._engine = self._init_engine()
+        except Exception as e:
+            print(f"Speech error: {e}")
+        finally:
+            self._ready.set()
+
+        while True:
+            with self._cond:
+                while self._running and not self.speech_queue and not self._fill_queue:
+                    self._cond.wait()
+                if not self._running:
+                    break
+                if not self.speech_queue:
+                    # Idle: render the next phrase into the cache
+                    text = self._fill_queue.popleft()
+                    fill_only = True
+                else:
+                    text, enqueued = self.speech_queue.popleft()
+                    self.is_speaking = True
+                    # A pending interrupt was aimed at the previous utterance
+                    self._interrupt.clear()
+                    fill_only = False
+            if fill_only:
+                self._fill_cache(text)
+                continue
+
+            started = time.perf_counter()
+            self.queue_latency.append(started - enqueued)
+            try:
+                if self._play_cached(text):
+                    self.cached_count += 1
+                else:
+                    if self._engine is None:
+                        raise RuntimeError("TTS engine unavailable")
+                    self._engine.say(text)
+                    self._engine.runAndWait()
+                    if self._cacheable(text):
+                        with self._cond:
+                            self._fill_queue.append(text)
+                self.spoken_count += 1
+            except Exception as e:
+                print(f"Speech error: {e}")
+            finally:
+                self.synthesis_time.append(time.perf_counter() - started)
+                self.is_speaking = False
+
+    def stats(self) -> dict:
+        """Queue latency and synthesis time (ms, recent utterances) plus policy counters"""
+        def mean_ms(values):
+            return round(1000.0 * sum(values) / len(values), 1) if values else None
+        return {
+            "spoken": self.spoken_count,
+            "from_cache": self.cached_count,
+            "pending": len(self.speech_queue),
+            "dropped": self.dropped_count,
+            "coalesced": self.coalesced_count,
+            "interrupted": self.interrupted_count,
+            "queue_latency_ms": mean_ms(self.queue_latency),
+            "synthesis_ms": mean_ms(self.synthesis_time),
+        }
+
+    def close(self, timeout: float = 2.0):
+        """Stop the worker; utterances still pending are discarded"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def as_landmark_array(hand) -> np.ndarray:
+    """Coerce a hand to a (21, 2+) coordinate array
+
+    Accepts a landmark array (normalized or pixel coordinates) or the legacy
+    list of (id, x, y) tuples.
+    """
+    if isinstance(hand, np.ndarray):
+        return hand
+    return np.asarray(hand, dtype=np.float32)[:, 1:]
+
+
+def get_finger_states_batch(hands: np.ndarray) -> np.ndarray:
+    """Return a (hands, 5) bool array of finger states for a (hands, 21, 2+) array"""
+    x = hands[:, :, 0]
+    y = hands[:, :, 1]
+    states = np.empty((hands.shape[0], 5), dtype=bool)
+    # Thumb: tip farther from the wrist horizontally than the joint below it
+    wrist_x = x[:, 0]
+    states[:, 0] = np.abs(x[:, 4] - wrist_x) > np.abs(x[:, 3] - wrist_x)
+    # Other fingers: tip above the PIP joint
+    states[:, 1:] = y[:, FINGER_TIPS[1:]] < y[:, FINGER_PIPS[1:]]
+    return states
+
+
+def finger_margins_batch(hands: np.ndarray, aspect: float = 1.0) -> np.ndarray:
+    """(hands, 5) signed distances from each finger-state threshold, in palm units
+
+    Positive means extended: margins > 0 equals get_finger_states_batch().
+    Dividing by the palm size makes one hysteresis band fit every hand size
+    and camera distance. Normalized landmarks divide x by the frame width and
+    y by its height, so pass aspect = width / height to measure both in the
+    same units (1.0 for pixel coordinates); otherwise the palm length, and
+    with it the band, changes as the hand rotates.
+    """
+    x = hands[:, :, 0] * np.float32(aspect)
+    y = hands[:, :, 1]
+    margins = np.empty((hands.shape[0], 5), dtype=np.float32)
+    wrist_x = x[:, 0]
+    margins[:, 0] = np.abs(x[:, 4] - wrist_x) - np.abs(x[:, 3] - wrist_x)
+    margins[:, 1:] = y[:, FINGER_PIPS[1:]] - y[:, FINGER_TIPS[1:]]
+    palm = np.hypot(x[:, 9] - wrist_x, y[:, 9] - y[:, 0])
+    return margins / np.maximum(palm, 1e-6)[:, None]
+
+
+def get_finger_states(hand):
+    """Return finger states: [thumb, index, middle, ring, pinky]"""
+    hand = as_landmark_array(hand)
+    return get_finger_states_batch(hand[np.newaxis])[0].tolist()
+
+
+DEFAULT_GESTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gestures.json")
+
+# Bit weight of each finger in a finger-state mask (thumb = bit 0 ... pinky = bit 4)
+FINGER_BITS = 1 << np.arange(5)
+FINGER_NAMES = ("thumb", "index", "middle", "ring", "pinky")
+
+
+def finger_mask_batch(states: np.ndarray) -> np.ndarray:
+    """Pack (hands, 5) bool finger states into (hands,) int masks in 0..31"""
+    return states.astype(np.int64) @ FINGER_BITS
+
+
+class GestureTable:
+    """Gesture vocabulary compiled into a 32-slot lookup table indexed by finger mask
+
+    Two-handed gestures compile into a second 32x32 table indexed by the
+    (left, right) finger masks. Each gesture has a longest (hold) and
+    shortest (min_hold) hold time for SignLanguageProcessor's commit policy.
+    """
+
+    TYPES = ("letter", "word", "action")
+
+    def __init__(self, labels: List[Optional[str]], holds: dict, conflicts: List[str],
+                 path: Optional[str] = None, mtime: Optional[float] = None,
+                 pair_labels: Optional[np.ndarray] = None, min_holds: Optional[dict] = None,
+                 entries: Optional[List[Tuple[str, str, str]]] = None):
+        self.labels = labels
+        self.label_array = np.array(labels, dtype=object)
+        # (32, 5): whether flipping a finger changes the gesture (False for "x" fingers)
+        masks = np.arange(32)
+        self.sensitive = self.label_array[masks[:, None] ^ FINGER_BITS] != self.label_array[masks][:, None]
+        self.pair_labels = pair_labels if pair_labels is not None else np.full((32, 32), None, dtype=object)
+        self.has_pairs = any(label is not None for label in self.pair_labels.flat)
+        self.holds = holds
+        self.min_holds = min_holds or {}
+        self.conflicts = conflicts
+        self.path = path
+        self.mtime = mtime
+        # (pattern, label, type) in file order, for help text
+        self.entries = entries or []
+
+    @staticmethod
+    def _expand(pattern: str) -> List[int]:
+        """All masks matching a 5-character pattern of 0/1/x"""
+        if len(pattern) != 5 or any(c not in "01xX*" for c in pattern):
+            raise ValueError(f"Invalid finger pattern {pattern!r}: expected 5 of 0/1/x")
+        masks = [0]
+        for bit, c in enumerate(pattern):
+            if c == "1":
+                masks = [m | (1 << bit) for m in masks]
+            elif c != "0":
+                masks = masks + [m | (1 << bit) for m in masks]
+        return masks
+
+    @classmethod
+    def from_dict(cls, spec: dict, path: Optional[str] = None,
+                  mtime: Optional[float] = None) -> "GestureTable":
+        default_hold = {"letter": 1.2, "word": 1.5, "action": 1.8}
+        default_hold.update(spec.get("default_hold", {}))
+        default_min_hold = {"letter": 0.3, "word": 0.4, "action": 0.6}
+        default_min_hold.update(spec.get("default_min_hold", {}))
+        labels = [None] * 32
+        holds = {}
+        min_holds = {}
+        owners = [None] * 32
+        conflicts = []
+        entries = []
+
+        def add_holds(entry: dict, label: str, kind: str):
+            for key, times, defaults in (("hold", holds, default_hold), ("min_hold", min_holds, default_min_hold)):
+                hold = float(entry.get(key, defaults[kind]))
+                if times.get(label, hold) != hold:
+                    conflicts.append(f"{label} has conflicting {key} times; keeping {times[label]}s")
+                times.setdefault(label, hold)
+
+        for entry in spec.get("gestures", []):
+            kind = entry.get("type", "letter")
+            if kind not in cls.TYPES:
+                raise ValueError(f"Unknown gesture type {kind!r} in {entry}")
+            value = str(entry["value"]).upper()
+            label = f"WORD:{value}" if kind == "word" else value
+            pattern = entry["pattern"]
+
+            for mask in cls._expand(pattern):
+                if labels[mask] is None:
+                    labels[mask] = label
+                    owners[mask] = pattern
+                elif labels[mask] != label:
+                    conflicts.append(f"{pattern} -> {label} overlaps {owners[mask]} -> {labels[mask]}; "
+                                     f"keeping {labels[mask]}")
+
+            add_holds(entry, label, kind)
+            entries.append((pattern, label, kind))
+
+        pair_labels = np.full((32, 32), None, dtype=object)
+        for entry in spec.get("two_handed", []):
+            kind = entry.get("type", "word")
+            if kind not in cls.TYPES:
+                raise ValueError(f"Unknown gesture type {kind!r} in {entry}")
+            value = str(entry["value"]).upper()
+            label = f"WORD:{value}" if kind == "word" else value
+            pattern = f"{entry['left']}+{entry['right']}"
+            overlapped = set()  # Report each earlier gesture once per entry
+            for left in cls._expand(entry["left"]):
+                for right in cls._expand(entry["right"]):
+                    kept = pair_labels[left, right]
+                    if kept is None:
+                        pair_labels[left, right] = label
+                    elif kept != label and kept not in overlapped:
+                        overlapped.add(kept)
+                        conflicts.append(f"{pattern} -> {label} overlaps {kept}; keeping {kept}")
+
+            add_holds(entry, label, kind)
+            entries.append((pattern, label, kind))
+
+        return cls(labels, holds, conflicts, path, mtime, pair_labels, min_holds, entries)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_GESTURES_PATH) -> "GestureTable":
+        """Load and compile a JSON vocabulary file, reporting conflicting patterns"""
+        mtime = os.path.getmtime(path)
+        with open(path, encoding="utf-8") as f:
+            table = cls.from_dict(json.load(f), path, mtime)
+        for conflict in table.conflicts:
+            print(f"⚠️ Gesture conflict ({os.path.basename(path)}): {conflict}")
+        return table
+
+    def lookup(self, mask: int) -> Optional[str]:
+        return self.labels[mask]
+
+    def lookup_pair(self, left_mask: int, right_mask: int) -> Optional[str]:
+        return self.pair_labels[left_mask, right_mask]
+
+    def hold_time(self, label: str) -> Optional[float]:
+        return self.holds.get(label)
+
+    def min_hold_time(self, label: str) -> Optional[float]:
+        return self.min_holds.get(label)
+
+    def help_lines(self) -> List[str]:
+        """Console help for the vocabulary, grouped by type, in file order
+
+        Each gesture shows its min_hold-hold range: it commits as soon as the
+        recognizer is sure, but never before min_hold and always by hold.
+        """
+        lines = []
+        for kind in self.TYPES:
+            entries = [(pattern, label) for pattern, label, k in self.entries if k == kind]
+            if not entries:
+                continue
+            lines.append(f"  {kind.upper()}S:")
+            for pattern, label in entries:
+                lines.append(f"    - {describe_pattern(pattern)} = {label.replace('WORD:', '')} "
+                             f"(hold {self.min_hold_time(label):g}-{self.hold_time(label):g}s)"
+                             + (f": {ACTION_HELP[label]}" if label in ACTION_HELP else ""))
+        return lines
+
+    def changed_on_disk(self) -> bool:
+        if not self.path:
+            return False
+        try:
+            return os.path.getmtime(self.path) != self.mtime
+        except OSError:
+            return False
+
+
+# What each built-in action does, for the console help
+ACTION_HELP = {
+    "SPACE": "add a space",
+    "SPEAK": "speak the text",
+    "DELETE": "delete the last word",
+    "ACCEPT": "take the first word completion (with --lexicon)",
+}
+
+
+def describe_pattern(pattern: str) -> str:
+    """Readable finger pattern: "01100" -> "index+middle up", "left+right" for two hands"""
+    if "+" in pattern:
+        left, right = pattern.split("+")
+        return f"left {describe_pattern(left)}, right {describe_pattern(right)}"
+    if pattern == "00000":
+        return "fist"
+    if pattern == "11111":
+        return "open palm"
+    up = "+".join(name for name, c in zip(FINGER_NAMES, pattern) if c == "1") or "none"
+    either = "+".join(name for name, c in zip(FINGER_NAMES, pattern) if c not in "01")
+    return f"{up} up" + (f" ({either} either way)" if either else "")
+
+
+_gesture_table: Optional[GestureTable] = None
+
+
+def get_gesture_table() -> GestureTable:
+    """Return the active gesture table, loading the default vocabulary on first use"""
+    global _gesture_table
+    if _gesture_table is None:
+        _gesture_table = GestureTable.load()
+    return _gesture_table
+
+
+def load_gesture_table(path: str = DEFAULT_GESTURES_PATH) -> GestureTable:
+    """Compile a vocabulary file and make it the active table
+
+    The swap is a single reference assignment, so it is safe to call while
+    other threads are recognizing. On error the previous table stays active.
+    """
+    global _gesture_table
+    _gesture_table = GestureTable.load(path)
+    return _gesture_table
+
+
+def reload_gesture_table_if_changed() -> bool:
+    """Reload the active vocabulary if its file was modified; returns True on reload"""
+    table = get_gesture_table()
+    if not table.changed_on_disk():
+        return False
+    try:
+        load_gesture_table(table.path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Gesture reload failed, keeping previous vocabulary: {e}")
+        table.mtime = os.path.getmtime(table.path)
+        return False
+    print(f"🔄 Gesture vocabulary reloaded from {table.path}")
+    return True
+
+
+def recognize_asl_letter(hand, table: Optional[GestureTable] = None):
+    """Recognize ASL letter and common words from hand landmarks
+
+    Uses the learned classifier when one is loaded (load_classifier) and no
+    explicit rule table is passed. The classifier is trained on normalized
+    (x, y, z) landmarks, so 2-D input (legacy (id, x, y) tuples, pixel
+    arrays) always goes through the rule table.
+    """
+    if hand is None or len(hand) == 0:
+        return None
+    hand = as_landmark_array(hand)
+    if table is None and _classifier is not None and hand.shape[-1] >= 3:
+        return _classifier.predict_one(hand)
+
+    states = get_finger_states_batch(hand[np.newaxis])
+    table = table or get_gesture_table()
+    return table.lookup(int(finger_mask_batch(states)[0]))
+
+
+def normalize_hands(hands: np.ndarray) -> np.ndarray:
+    """(n, 21, 3) landmarks -> (n, 63) position- and scale-invariant feature vectors
+
+    Coordinates are taken relative to the wrist and divided by the
+    wrist-to-middle-knuckle length (in x/y), so the features don't depend
+    on where the hand is in the frame or how far it is from the camera.
+    """
+    hands = np.asarray(hands, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    relative = hands - hands[:, :1]
+    scale = np.maximum(np.sqrt(np.einsum("ij,ij->i", relative[:, 9, :2], relative[:, 9, :2])), 1e-6)
+    return (relative / scale[:, None, None]).reshape(len(hands), -1)
+
+
+class LandmarkClassifier:
+    """Learned gesture classifier over normalized 21-point landmarks (NumPy only)
+
+    kind is one of:
+        "centroid" - nearest class mean
+        "knn"      - majority of the k nearest training samples (precomputed
+                     sample matrix and norms, one matrix product per query)
+        "linear"   - softmax regression on standardized features
+    Frames that look like none of the trained gestures are rejected (None):
+    too far from the predicted class mean for the distance-based kinds, or
+    below min_confidence for "linear". Labels use the gestures.json naming
+    ("A", "SPACE", "WORD:HELLO", ...).
+    """
+
+    KINDS = ("centroid", "knn", "linear")
+
+    def __init__(self, kind: str, labels: List[str], arrays: dict, k: int = 5,
+                 min_confidence: float = 0.6):
+        if kind not in self.KINDS:
+            raise ValueError(f"unknown classifier kind '{kind}' (expected one of {', '.join(self.KINDS)})")
+        self.kind = kind
+        self.labels = list(labels)
+        self._label_array = np.array(self.labels + [None], dtype=object)  # Index -1 = rejected
+        self.arrays = arrays
+        self.k = k
+        self.min_confidence = min_confidence
+
+    @classmethod
+    def train(cls, hands: np.ndarray, labels, kind: str = "centroid", k: int = 5,
+              max_per_class: int = 500, reject_margin: float = 1.5, epochs: int = 300,
+              learning_rate: float = 0.5, l2: float = 1e-4, min_confidence: float = 0.6,
+              seed: int = 0) -> "LandmarkClassifier":
+        """Fit on (n, 21, 3) landmarks with one label per row"""
+        features = normalize_hands(hands)
+        label_names = sorted(set(labels))
+        y = np.searchsorted(label_names, np.asarray(labels))
+        num_classes = len(label_names)
+        rng = np.random.default_rng(seed)
+
+        # Cap samples per class so long takes of one gesture don't dominate
+        keep = np.concatenate([
+            rng.permutation(np.flatnonzero(y == c))[:max_per_class] for c in range(num_classes)])
+        features, y = features[keep], y[keep]
+
+        centroids = np.stack([features[y == c].mean(axis=0) for c in range(num_classes)])
+        own_distance = np.linalg.norm(features - centroids[y], axis=1)
+        radius = np.array([np.quantile(own_distance[y == c], 0.99) for c in range(num_classes)])
+        arrays = {"centroids": centroids.astype(np.float32),
+                  "centroid_norms": np.einsum("ij,ij->i", centroids, centroids).astype(np.float32),
+                  "radius": (radius * reject_margin).astype(np.float32)}
+
+        if kind == "knn":
+            arrays["points"] = features.astype(np.float32)
+            arrays["point_norms"] = np.einsum("ij,ij->i", features, features).astype(np.float32)
+            arrays["point_labels"] = y.astype(np.int32)
+        elif kind == "linear":
+            mean, std = features.mean(axis=0), features.std(axis=0) + 1e-6
+            x = np.hstack([(features - mean) / std, np.ones((len(features), 1), dtype=np.float32)])
+            onehot = np.eye(num_classes, dtype=np.float32)[y]
+            weights = np.zeros((x.shape[1], num_classes), dtype=np.float32)
+            velocity = np.zeros_like(weights)
+            for _ in range(epochs):
+                logits = x @ weights
+                logits -= logits.max(axis=1, keepdims=True)
+                probs = np.exp(logits)
+                probs /= probs.sum(axis=1, keepdims=True)
+                gradient = x.T @ (probs - onehot) / len(x) + l2 * weights
+                velocity = 0.9 * velocity - learning_rate * gradient
+                weights += velocity
+            arrays.update(mean=mean.astype(np.float32), std=std.astype(np.float32), weights=weights)
+        return cls(kind, label_names, arrays, k=k, min_confidence=min_confidence)
+
+    def predict_indices(self, features: np.ndarray) -> np.ndarray:
+        """Class index per (n, 63) feature row, -1 where rejected"""
+        a = self.arrays
+        if self.kind == "linear":
+            logits = ((features - a["mean"]) / a["std"]) @ a["weights"][:-1] + a["weights"][-1]
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            best = probs.argmax(axis=1)
+            confidence = probs[np.arange(len(best)), best] / probs.sum(axis=1)
+            return np.where(confidence >= self.min_confidence, best, -1)
+
+        # Squared distances via |f|^2 - 2 f.c + |c|^2: one matrix product per query batch
+        feature_norms = np.einsum("ij,ij->i", features, features)[:, None]
+        centroid_d2 = feature_norms - 2.0 * (features @ a["centroids"].T) + a["centroid_norms"]
+        if self.kind == "centroid":
+            best = centroid_d2.argmin(axis=1)
+        else:
+            d2 = feature_norms - 2.0 * (features @ a["points"].T) + a["point_norms"]
+            k = min(self.k, d2.shape[1])
+            nearest = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            votes = a["point_labels"][nearest]
+            counts = np.zeros((len(features), len(self.labels)), dtype=np.int32)
+            np.add.at(counts, (np.repeat(np.arange(len(features)), k), votes.ravel()), 1)
+            best = counts.argmax(axis=1)
+        distance = np.sqrt(np.maximum(centroid_d2[np.arange(len(best)), best], 0.0))
+        return np.where(distance <= a["radius"][best], best, -1)
+
+    def predict(self, hands: np.ndarray) -> np.ndarray:
+        """Batched prediction: (n, 21, 3) landmarks -> object array of labels (None = rejected)"""
+        if len(hands) == 0:
+            return np.empty(0, dtype=object)
+        return self._label_array[self.predict_indices(normalize_hands(hands))]
+
+    def predict_one(self, hand) -> Optional[str]:
+        hand = as_landmark_array(hand)
+        if hand.shape != (NUM_LANDMARKS, 3):
+            raise ValueError(f"classifier needs ({NUM_LANDMARKS}, 3) landmarks, got shape {hand.shape}")
+        return self._label_array[self.predict_indices(normalize_hands(hand))[0]]
+
+    def save(self, path: str):
+        np.savez(path, kind=self.kind, labels=np.array(self.labels), k=self.k,
+                 min_confidence=self.min_confidence, **self.arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "LandmarkClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files
+                      if name not in ("kind", "labels", "k", "min_confidence")}
+            return cls(str(data["kind"]), [str(l) for l in data["labels"]], arrays,
+                       k=int(data["k"]), min_confidence=float(data["min_confidence"]))
+
+
+_classifier: Optional[LandmarkClassifier] = None
+
+
+def get_classifier() -> Optional[LandmarkClassifier]:
+    """The active learned classifier, or None when the rule table is used"""
+    return _classifier
+
+
+def load_classifier(path: Optional[str]) -> Optional[LandmarkClassifier]:
+    """Make the classifier saved at path the recognizer (None restores the rule table)"""
+    global _classifier
+    _classifier = LandmarkClassifier.load(path) if path else None
+    return _classifier
+
+
+def recognize_asl_letters(hands: np.ndarray, table: Optional[GestureTable] = None) -> np.ndarray:
+    """Batched recognize_asl_letter over (n, 21, 3) hands -> object array of labels"""
+    if table is None and _classifier is not None:
+        return _classifier.predict(hands)
+    table = table or get_gesture_table()
+    if len(hands) == 0:
+        return np.empty(0, dtype=object)
+    masks = finger_mask_batch(get_finger_states_batch(np.asarray(hands, dtype=np.float32)))
+    return table.label_array[masks]
+
+
+def recognize_hands(hands: np.ndarray, table: Optional[GestureTable] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Labels and finger masks of all (n, 21, 3) hands of a frame in one batched pass
+
+    Labels come from the learned classifier when one is loaded and no rule
+    table is passed; the masks feed recognize_two_handed either way.
+    """
+    hands = np.asarray(hands, dtype=np.float32)
+    if len(hands) == 0:
+        return np.empty(0, dtype=object), np.empty(0, dtype=np.int64)
+    masks = finger_mask_batch(get_finger_states_batch(hands))
+    if table is None and _classifier is not None:
+        return _classifier.predict(hands), masks
+    return (table or get_gesture_table()).label_array[masks], masks
+
+
+def recognize_two_handed(masks: np.ndarray, sides: np.ndarray,
+                         table: Optional[GestureTable] = None) -> Optional[str]:
+    """Two-handed gesture made by a frame's hands (finger masks), or None
+
+    sides is -1 (left), +1 (right) or 0 (unknown) per hand, e.g. from
+    HandTracks; the first left and first right hand form the pair.
+    """
+    table = table or get_gesture_table()
+    if not table.has_pairs or len(masks) < 2:
+        return None
+    sides = np.sign(sides).tolist()
+    if -1 not in sides or 1 not in sides:
+        return None
+    return table.lookup_pair(int(masks[sides.index(-1)]), int(masks[sides.index(1)]))
+
+
+def label_for_recording(spec: str) -> Tuple[str, str]:
+    """Split a training spec into (label, path)
+
+    "LABEL=path" is explicit; otherwise the label is the file name without
+    a trailing take number, with a WORD- prefix for words: "B_3.lmrec" -> "B",
+    "WORD-HELLO-2.lmrec" -> "WORD:HELLO".
+    """
+    if "=" in spec:
+        label, path = spec.split("=", 1)
+        return label, path
+    stem = re.sub(r"[_-]\d+$", "", os.path.splitext(os.path.basename(spec))[0]).upper()
+    return re.sub(r"^WORD[_-]", "WORD:", stem), spec
+
+
+def load_training_data(specs: List[str], trim_s: float = 0.5) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """First-hand landmarks, labels and time position (0..1 within its take) from labeled recordings
+
+    Each recording is one take of one gesture; trim_s seconds at both ends
+    (moving into and out of the pose) are skipped.
+    """
+    hands, labels, positions = [], [], []
+    for spec in specs:
+        label, path = label_for_recording(spec)
+        recording = LandmarkRecording(path)
+        try:
+            if not len(recording):
+                continue
+            t = recording.timestamps_ms.astype(np.int64)
+            usable = ((recording.hands > 0) & (t >= t[0] + trim_s * 1000)
+                      & (t <= t[-1] - trim_s * 1000))
+            index = np.flatnonzero(usable)
+            hands.append(np.array(recording.landmarks[index, 0]))
+            labels.extend([label] * len(index))
+            positions.append(index / max(len(recording) - 1, 1))
+        finally:
+            recording.close()
+    if not labels:
+        raise ValueError("no usable frames in the training recordings")
+    return np.concatenate(hands), np.array(labels), np.concatenate(positions)
+
+
+def train_classifier(specs: List[str], output: str, kind: str = "centroid", k: int = 5,
+                     holdout: float = 0.2, trim_s: float = 0.5) -> dict:
+    """Train a LandmarkClassifier on labeled recordings, evaluate it and save it to output
+
+    The last `holdout` fraction of every take is held out for the reported
+    accuracy (a time split, so near-duplicate neighbouring frames don't leak
+    into the test set); the saved model is then refit on all frames.
+    """
+    hands, labels, positions = load_training_data(specs, trim_s)
+    test = positions > 1.0 - holdout
+    report = {"kind": kind, "classes": sorted(set(labels.tolist())), "frames": int(len(labels))}
+    if test.any() and (~test).any():
+        model = LandmarkClassifier.train(hands[~test], labels[~test], kind=kind, k=k)
+        predicted = model.predict(hands[test])
+        correct = predicted == labels[test]
+        report["holdout_frames"] = int(test.sum())
+        report["accuracy"] = round(float(correct.mean()), 4)
+        report["rejected"] = round(float(np.mean([p is None for p in predicted])), 4)
+        report["per_class_accuracy"] = {
+            label: round(float(correct[labels[test] == label].mean()), 4)
+            for label in report["classes"] if (labels[test] == label).any()}
+
+    model = LandmarkClassifier.train(hands, labels, kind=kind, k=k)
+    model.save(output)
+    sample = hands[:256]
+    single = _time_stage(lambda: model.predict_one(sample[0]), 500, 50)
+    batch_start = time.perf_counter()
+    model.predict(hands)
+    batch_s = time.perf_counter() - batch_start
+    report["predict_one_p50_us"] = single["p50_us"]
+    report["batch_frames_per_s"] = round(len(hands) / batch_s, 1) if batch_s > 0 else None
+    report["output"] = output
+    return report
+
+
+TRAJECTORY_POINTS = 32  # Every word window/template is resampled to this many steps
+TRAJECTORY_DIMS = 12    # Wrist (x, y) + five fingertips (x, y)
+
+
+def trajectory_rows(hands: np.ndarray) -> np.ndarray:
+    """(n, 21, 3) landmarks -> (n, 13) raw rows: wrist (x, y), palm size, 5 fingertips (x, y)
+
+    Fingertips are wrist-relative in palm units; the wrist stays in frame
+    units until a window is built (see trajectory_window).
+    """
+    hands = np.asarray(hands, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    relative = hands[:, :, :2] - hands[:, :1, :2]
+    palm = np.maximum(np.linalg.norm(relative[:, 9], axis=1), 1e-6)
+    tips = relative[:, FINGER_TIPS] / palm[:, None, None]
+    return np.hstack([hands[:, 0, :2], palm[:, None], tips.reshape(len(hands), -1)])
+
+
+def trajectory_window(times: np.ndarray, rows: np.ndarray, points: int = TRAJECTORY_POINTS) -> np.ndarray:
+    """Resample raw rows to `points` evenly timed steps -> (points, 12) sequence
+
+    The wrist path is centred on its mean and measured in (median) palm
+    units, so the sequence doesn't depend on where in the frame or how far
+    from the camera the sign was made.
+    """
+    position = np.interp(np.linspace(times[0], times[-1], points), times, np.arange(len(times)))
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, len(times) - 1)
+    weight = (position - lower)[:, None]
+    resampled = rows[lower] * (1.0 - weight) + rows[upper] * weight
+    wrist = resampled[:, :2]
+    wrist = (wrist - wrist.mean(axis=0)) / max(float(np.median(rows[:, 2])), 1e-6)
+    return np.hstack([wrist, resampled[:, 3:]]).astype(np.float32)
+
+
+def keogh_envelope(sequences: np.ndarray, band: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Upper/lower envelopes of (n, L, D) sequences within +-band steps"""
+    padded = np.pad(sequences, ((0, 0), (band, band), (0, 0)), mode="edge")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * band + 1, axis=1)
+    return windows.max(axis=-1), windows.min(axis=-1)
+
+
+def lb_keogh(query: np.ndarray, upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """LB_Keogh lower bounds (squared) of banded DTW between query (L, D) and n envelopes (n, L, D)"""
+    above = np.maximum(query - upper, 0.0)
+    below = np.maximum(lower - query, 0.0)
+    return np.einsum("nld,nld->n", above, above) + np.einsum("nld,nld->n", below, below)
+
+
+def dtw_batch(query: np.ndarray, templates: np.ndarray, band: int) -> np.ndarray:
+    """Banded DTW (sum of squared distances) between query (L, D) and each of (m, L, D) templates
+
+    The dynamic programme runs once over the band while every step is one
+    vector operation across all m templates.
+    """
+    m, length = len(templates), len(query)
+    diff = query[None, :, None, :] - templates[:, None, :, :]
+    cost = np.einsum("mijd,mijd->mij", diff, diff)
+    acc = np.full((m, length + 1, length + 1), np.inf)
+    acc[:, 0, 0] = 0.0
+    for i in range(1, length + 1):
+        for j in range(max(1, i - band), min(length, i + band) + 1):
+            acc[:, i, j] = cost[:, i - 1, j - 1] + np.minimum(
+                np.minimum(acc[:, i - 1, j], acc[:, i, j - 1]), acc[:, i - 1, j - 1])
+    return acc[:, length, length]
+
+
+class WordTemplateLibrary:
+    """Word-sign trajectory templates with a two-level LB_Keogh index
+
+    Templates are bucketed by duration (each bucket needs its own query
+    window). Within a bucket they are clustered into groups whose envelope
+    is the union of the members' envelopes; one lower bound per group prunes
+    whole groups, member bounds prune templates, and full DTW runs only on
+    the few candidates whose bound still beats both the best match so far
+    and their own acceptance threshold - so a window that resembles no
+    word usually costs no DTW at all.
+    """
+
+    def __init__(self, labels: List[str], durations: np.ndarray, sequences: np.ndarray,
+                 thresholds: np.ndarray, band: int = 4, bucket_s: float = 0.1, batch: int = 8):
+        self.labels = list(labels)
+        self.durations = np.asarray(durations, dtype=np.float32)
+        self.sequences = np.asarray(sequences, dtype=np.float32)
+        self.thresholds = np.asarray(thresholds, dtype=np.float32)  # Max accepted DTW (squared)
+        self.band = band
+        self.batch = batch
+        self.upper, self.lower = keogh_envelope(self.sequences, band)
+        self.buckets = {}  # duration (s) -> (group upper, group lower, group members)
+        keys = np.round(np.maximum(np.round(self.durations.astype(np.float64) / bucket_s), 1) * bucket_s, 3)
+        for duration in np.unique(keys):
+            members = np.flatnonzero(keys == duration)
+            self.buckets[float(duration)] = self._build_groups(members)
+        self.dtw_computed = 0
+        self.lb_computed = 0
+        self.queries = 0
+
+    def _build_groups(self, members: np.ndarray):
+        """Greedy clustering of a bucket into ~sqrt(n) groups around far-apart seeds"""
+        count = max(1, int(np.sqrt(len(members))))
+        flat = self.sequences[members].reshape(len(members), -1)
+        seeds = [0]
+        distance = np.linalg.norm(flat - flat[0], axis=1)
+        while len(seeds) < count:
+            seeds.append(int(distance.argmax()))
+            distance = np.minimum(distance, np.linalg.norm(flat - flat[seeds[-1]], axis=1))
+        assignment = np.stack([np.linalg.norm(flat - flat[s], axis=1) for s in seeds]).argmin(axis=0)
+        groups = [members[assignment == g] for g in range(len(seeds)) if (assignment == g).any()]
+        group_upper = np.stack([self.upper[g].max(axis=0) for g in groups])
+        group_lower = np.stack([self.lower[g].min(axis=0) for g in groups])
+        return group_upper, group_lower, groups
+
+    def search(self, query: np.ndarray, duration: float) -> Tuple[Optional[int], float]:
+        """Best template index (within its threshold) and its DTW cost for a query of one bucket"""
+        group_upper, group_lower, groups = self.buckets[duration]
+        self.queries += 1
+        best, best_cost = None, np.inf
+        group_bounds = lb_keogh(query, group_upper, group_lower)
+        self.lb_computed += len(groups)
+        for g in np.argsort(group_bounds):
+            members = groups[g]
+            if group_bounds[g] >= min(best_cost, self.thresholds[members].max()):
+                continue  # No member can beat the best match or its own threshold
+            bounds = lb_keogh(query, self.upper[members], self.lower[members])
+            self.lb_computed += len(members)
+            candidates = np.flatnonzero((bounds < best_cost) & (bounds <= self.thresholds[members]))
+            candidates = candidates[np.argsort(bounds[candidates])]
+            for start in range(0, len(candidates), self.batch):
+                chunk = candidates[start:start + self.batch]
+                chunk = chunk[bounds[chunk] < best_cost]
+                if len(chunk) == 0:
+                    break
+                costs = dtw_batch(query, self.sequences[members[chunk]], self.band)
+                self.dtw_computed += len(chunk)
+                accepted = costs <= self.thresholds[members[chunk]]
+                if accepted.any():
+                    i = int(np.where(accepted, costs, np.inf).argmin())
+                    if costs[i] < best_cost:
+                        best, best_cost = int(members[chunk[i]]), float(costs[i])
+        return best, best_cost
+
+    def stats(self) -> dict:
+        total = self.queries * len(self.labels)
+        return {
+            "templates": len(self.labels),
+            "queries": self.queries,
+            "dtw_per_query": round(self.dtw_computed / self.queries, 2) if self.queries else 0.0,
+            "pruned_ratio": round(1.0 - self.dtw_computed / total, 3) if total else 0.0,
+        }
+
+    @classmethod
+    def build(cls, labels: List[str], takes: List[Tuple[np.ndarray, np.ndarray]], band: int = 4,
+              margin: float = 2.0, default_threshold: float = 1.0) -> "WordTemplateLibrary":
+        """Templates from recorded takes, each (timestamps_s, (n, 21, 3) landmarks)
+
+        A template accepts matches up to margin x the largest DTW cost to
+        the other takes of its word (default_threshold x sequence length for
+        words with a single take).
+        """
+        sequences = np.stack([trajectory_window(t, trajectory_rows(h)) for t, h in takes])
+        durations = np.array([t[-1] - t[0] for t, _ in takes], dtype=np.float32)
+        labels = list(labels)
+        thresholds = np.full(len(labels), default_threshold * TRAJECTORY_POINTS, dtype=np.float32)
+        for i, label in enumerate(labels):
+            others = [j for j, other in enumerate(labels) if other == label and j != i]
+            if others:
+                thresholds[i] = margin * dtw_batch(sequences[i], sequences[others], band).max()
+        return cls(labels, durations, sequences, thresholds, band=band)
+
+    def save(self, path: str):
+        np.savez(path, labels=np.array(self.labels), durations=self.durations,
+                 sequences=self.sequences, thresholds=self.thresholds, band=self.band)
+
+    @classmethod
+    def load(cls, path: str) -> "WordTemplateLibrary":
+        with np.load(path, allow_pickle=False) as data:
+            return cls([str(l) for l in data["labels"]], data["durations"], data["sequences"],
+                       data["thresholds"], band=int(data["band"]))
+
+
+class TrajectoryRecognizer:
+    """Rolling landmark trajectory matched against a WordTemplateLibrary
+
+    One per stream/session. Every `stride` frames the trailing window of
+    each template duration is resampled and searched; a match is reported
+    once and the buffer restarts, so one motion yields one word. Losing
+    the hand also restarts the buffer.
+    """
+
+    def __init__(self, library: WordTemplateLibrary, stride: int = 2):
+        self.library = library
+        self.stride = stride
+        self.max_duration = max(library.buckets) if library.buckets else 0.0
+        self._times = deque()
+        self._rows = deque()
+        self._since_check = 0
+        self.update_ms = deque(maxlen=300)
+
+    def reset(self):
+        self._times.clear()
+        self._rows.clear()
+        self._since_check = 0
+
+    def update(self, hand: Optional[np.ndarray], timestamp: float) -> Optional[str]:
+        """Add one frame (None = no hand); returns a matched word label or None"""
+        if hand is None or len(hand) == 0:
+            self.reset()
+            return None
+        start = time.perf_counter()
+        self._times.append(timestamp)
+        self._rows.append(trajectory_rows(hand)[0])
+        while timestamp - self._times[0] > self.max_duration + 0.1:
+            self._times.popleft()
+            self._rows.popleft()
+        self._since_check += 1
+        label = None
+        if self._since_check >= self.stride:
+            self._since_check = 0
+            label = self._match(timestamp)
+        self.update_ms.append((time.perf_counter() - start) * 1000.0)
+        return label
+
+    def _match(self, now: float) -> Optional[str]:
+        times = np.fromiter(self._times, dtype=np.float64, count=len(self._times))
+        if len(times) < 4:
+            return None
+        rows = np.array(self._rows)
+        best, best_cost = None, np.inf
+        for duration in self.library.buckets:
+            first = int(np.searchsorted(times, now - duration))
+            # The window must span (almost) the whole template duration
+            if first >= len(times) - 3 or now - times[max(first - 1, 0)] < duration * 0.9:
+                continue
+            query = trajectory_window(times[first:], rows[first:])
+            index, cost = self.library.search(query, duration)
+            if index is not None and cost < best_cost:
+                best, best_cost = index, cost
+        if best is None:
+            return None
+        self.reset()
+        return self.library.labels[best]
+
+
+_word_library: Optional[WordTemplateLibrary] = None
+
+
+def get_word_library() -> Optional[WordTemplateLibrary]:
+    """The active word template library, or None (static poses only)"""
+    return _word_library
+
+
+def load_word_library(path: Optional[str]) -> Optional[WordTemplateLibrary]:
+    """Make the templates saved at path active for processors created afterwards"""
+    global _word_library
+    _word_library = WordTemplateLibrary.load(path) if path else None
+    return _word_library
+
+
+def train_word_library(specs: List[str], output: str, band: int = 4) -> dict:
+    """Build a template library from recorded word takes (one sign per recording)
+
+    Labels follow label_for_recording(); a WORD: prefix is added when
+    missing. Frames without a hand at the start/end of a take are trimmed.
+    """
+    labels, takes = [], []
+    for spec in specs:
+        label, path = label_for_recording(spec)
+        recording = LandmarkRecording(path)
+        try:
+            present = np.flatnonzero(recording.hands > 0)
+            if len(present) < 4:
+                print(f"⚠️ {path}: too few frames with a hand, skipped")
+                continue
+            span = slice(present[0], present[-1] + 1)
+            if (recording.hands[span] == 0).any():
+                print(f"⚠️ {path}: hand lost mid-take, skipped")
+                continue
+            takes.append((recording.timestamps_ms[span] / 1000.0, np.array(recording.landmarks[span, 0])))
+            labels.append(label if label.startswith("WORD:") else f"WORD:{label}")
+        finally:
+            recording.close()
+    if not takes:
+        raise ValueError("no usable word takes")
+    library = WordTemplateLibrary.build(labels, takes, band=band)
+    library.save(output)
+    return {"templates": len(labels), "words": sorted(set(labels)),
+            "buckets_s": sorted(library.buckets), "output": output}
+
+
+LEXICON_MAGIC = b"STVLEX\x00\x01"
+# magic, version, completions per node, nodes, words, word bytes
+LEXICON_HEADER = struct.Struct("<8sHHIII")
+
+
+def read_word_list(path: str) -> List[str]:
+    """Words of a lexicon source file, most frequent first
+
+    One word per line, optionally followed by a count ("the 23135851162");
+    when every line has a count the words are sorted by it, otherwise the
+    line order is the frequency rank. Words are lowercased, and words with
+    anything but the letters a-z are skipped (they can't be fingerspelled).
+    """
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            word = parts[0].lower()
+            if not (word.isascii() and word.isalpha()):
+                continue
+            try:
+                count = float(parts[1]) if len(parts) > 1 else None
+            except ValueError:
+                count = None
+            entries.append((word, count))
+    if entries and all(count is not None for _, count in entries):
+        entries.sort(key=lambda entry: -entry[1])
+    return [word for word, _ in entries]
+
+
+class Lexicon:
+    """Memory-mapped word trie with each node's most frequent completions cached
+
+    Words are stored in frequency-rank order. Nodes are laid out breadth-first,
+    so a node's children are contiguous and sorted by letter, and every node
+    keeps the ranks of the top_k most frequent words below it. Extending a
+    prefix by one letter is therefore a search among at most 26 children and
+    one row read, however large the lexicon; opening a file maps it without
+    parsing anything.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            raw = f.read(LEXICON_HEADER.size)
+        if len(raw) < LEXICON_HEADER.size or raw[:8] != LEXICON_MAGIC:
+            raise ValueError(f"{path} is not a lexicon")
+        _, self.version, self.top_k, nodes, words, word_bytes = LEXICON_HEADER.unpack(raw)
+        import mmap
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = LEXICON_HEADER.size
+        sections = []
+        for dtype, count in (("<i4", nodes), ("<i4", nodes * self.top_k), ("<i4", words + 1),
+                             ("u1", nodes), ("u1", nodes)):
+            sections.append(np.frombuffer(self._map, dtype=dtype, count=count, offset=offset))
+            offset += sections[-1].nbytes
+        self.first_child, top, self.word_offsets, self.child_count, self.labels = sections
+        self.top = top.reshape(nodes, self.top_k)  # Ranks of the most frequent words below, -1 padded
+        # Letters and words are read straight from the map: cheaper than NumPy for a few bytes
+        self._labels_at = offset - nodes
+        self._words_at = offset
+
+    def __len__(self):
+        return len(self.word_offsets) - 1
+
+    @classmethod
+    def build(cls, words: List[str], path: str, top_k: int = 4) -> "Lexicon":
+        """Write a lexicon of words (most frequent first) to path and open it"""
+        root = ({}, [])  # Children by letter, ranks of the top_k most frequent words below
+        ranked = []
+        seen = set()
+        for word in words:
+            word = word.lower()
+            if word in seen or not (word.isascii() and word.isalpha()):
+                continue
+            seen.add(word)
+            rank = len(ranked)
+            ranked.append(word.encode("ascii"))
+            node = root
+            for letter in word:
+                node = node[0].setdefault(letter, ({}, []))
+                # Words arrive most frequent first, so the first top_k below a node are its best
+                if len(node[1]) < top_k:
+                    node[1].append(rank)
+
+        order, labels, first_child, child_count = [root], [0], [], []
+        index = 0
+        while index < len(order):
+            children = order[index][0]
+            first_child.append(len(order))
+            child_count.append(len(children))
+            for letter in sorted(children):
+                order.append(children[letter])
+                labels.append(ord(letter))
+            index += 1
+        top = np.full((len(order), top_k), -1, dtype="<i4")
+        for index, node in enumerate(order):
+            top[index, :len(node[1])] = node[1]
+        offsets = np.zeros(len(ranked) + 1, dtype="<i4")
+        offsets[1:] = np.cumsum([len(word) for word in ranked])
+
+        with open(path, "wb") as f:
+            f.write(LEXICON_HEADER.pack(LEXICON_MAGIC, 1, top_k, len(order), len(ranked), int(offsets[-1])))
+            for array in (np.array(first_child, dtype="<i4"), top, offsets,
+                          np.array(child_count, dtype=np.uint8), np.array(labels, dtype=np.uint8)):
+                f.write(array.tobytes())
+            f.write(b"".join(ranked))
+        return cls(path)
+
+    def step(self, node: int, letter: str) -> int:
+        """Child of node along letter (lowercase), or -1"""
+        if node < 0:
+            return -1
+        start = self._labels_at + int(self.first_child[node])
+        index = self._map.find(letter.encode(), start, start + int(self.child_count[node]))
+        return index - self._labels_at if index >= 0 else -1
+
+    def walk(self, prefix: str, node: int = 0) -> int:
+        """Node reached from node along prefix, or -1 when no word continues it"""
+        for letter in prefix:
+            node = self.step(node, letter)
+            if node < 0:
+                break
+        return node
+
+    def word(self, rank: int) -> str:
+        start, end = self.word_offsets[rank:rank + 2].tolist()
+        return self._map[self._words_at + start:self._words_at + end].decode("ascii")
+
+    def completions(self, node: int) -> List[str]:
+        """Most frequent words below node, most frequent first"""
+        if node < 0:
+            return []
+        return [self.word(rank) for rank in self.top[node].tolist() if rank >= 0]
+
+    def complete(self, prefix: str) -> List[str]:
+        return self.completions(self.walk(prefix.lower()))
+
+    def close(self):
+        # The arrays borrow the map's buffer and must be gone before it can close
+        self.first_child = self.top = self.word_offsets = self.child_count = self.labels = None
+        self._map.close()
+
+
+_lexicon: Optional[Lexicon] = None
+
+
+def get_lexicon() -> Optional[Lexicon]:
+    """The active completion lexicon, or None (no word completion)"""
+    return _lexicon
+
+
+def load_lexicon(path: Optional[str]) -> Optional[Lexicon]:
+    """Make the lexicon at path active for processors created afterwards
+
+    The previous lexicon is closed once the new one has opened.
+    """
+    global _lexicon
+    previous, _lexicon = _lexicon, Lexicon(path) if path else None
+    if previous is not None:
+        previous.close()
+    return _lexicon
+
+
+def build_lexicon(source: str, output: str, top_k: int = 4) -> dict:
+    """Compile a word list (see read_word_list) into a lexicon file"""
+    start = time.perf_counter()
+    lexicon = Lexicon.build(read_word_list(source), output, top_k=top_k)
+    try:
+        return {"words": len(lexicon), "nodes": len(lexicon.first_child), "completions_per_node": lexicon.top_k,
+                "bytes": os.path.getsize(output), "build_s": round(time.perf_counter() - start, 2),
+                "output": output}
+    finally:
+        lexicon.close()
+
+
+class MajorityVote:
+    """Streaming weighted majority vote over a sliding window
+
+    Per-label weight sums are updated as entries enter and leave, so each
+    add() costs O(1) regardless of window size (the leader is only rescanned,
+    over distinct labels, when it loses weight). The window is bounded by
+    count (maxlen) and optionally by age (max_age seconds). With half_life
+    (in entries), older entries count exponentially less than recent ones.
+    """
+
+    def __init__(self, maxlen: int = 10, max_age: Optional[float] = None,
+                 half_life: Optional[float] = None):
+        self.maxlen = maxlen
+        self.max_age = max_age
+        self._decay = 0.5 ** (1.0 / half_life) if half_life else None
+        self._entries = deque()  # (label, scaled weight, timestamp)
+        self._weights = {}
+        self._counts = {}
+        self._scale = 1.0
+        self.leader = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, label: str, timestamp: float = 0.0, weight: float = 1.0):
+        if self._decay:
+            # Grow the weight of new entries instead of decaying all old ones
+            self._scale /= self._decay
+            if self._scale > 1e12:
+                self._rescale()
+        scaled = weight * self._scale
+        self._entries.append((label, scaled, timestamp))
+        self._weights[label] = self._weights.get(label, 0.0) + scaled
+        self._counts[label] = self._counts.get(label, 0) + 1
+
+        while len(self._entries) > self.maxlen:
+            self._remove_oldest()
+        if self.max_age is not None:
+            self.expire(timestamp)
+
+        if self.leader is None or self._weights[label] > self._weights.get(self.leader, 0.0):
+            self.leader = label
+
+    def expire(self, now: float):
+        """Drop entries older than max_age seconds"""
+        if self.max_age is None:
+            return
+        while self._entries and now - self._entries[0][2] > self.max_age:
+            self._remove_oldest()
+
+    def _remove_oldest(self):
+        label, scaled, _ = self._entries.popleft()
+        self._counts[label] -= 1
+        if self._counts[label] == 0:
+            del self._counts[label]
+            del self._weights[label]
+        else:
+            self._weights[label] -= scaled
+        if label == self.leader:
+            self.leader = max(self._weights, key=self._weights.get) if self._weights else None
+
+    def _rescale(self):
+        factor = 1.0 / self._scale
+        self._entries = deque((label, w * factor, ts) for label, w, ts in self._entries)
+        self._weights = {label: w * factor for label, w in self._weights.items()}
+        self._scale = 1.0
+
+    def share(self, label: str) -> float:
+        """Fraction of the window's total weight held by label"""
+        total = sum(self._weights.values())
+        return self._weights.get(label, 0.0) / total if total else 0.0
+
+    def clear(self):
+        self._entries.clear()
+        self._weights.clear()
+        self._counts.clear()
+        self._scale = 1.0
+        self.leader = None
+
+
+class HandTracks:
+    """Stable per-hand track IDs across frames
+
+    The landmarker returns hands in no fixed order, so "the first hand" can
+    jump between hands from one frame to the next. Each detected hand is
+    matched to the live track whose palm centre (moved on at its last
+    velocity) is nearest, with a penalty when the reported handedness
+    disagrees with the track's; unmatched hands open new tracks, and tracks
+    unseen for more than max_missed frames are dropped. A track's side is a
+    running average of the handedness scores, so a one-frame handedness
+    flip neither swaps tracks nor sides.
+    """
+
+    # Columns of the (tracks, 6) state array
+    X, Y, VX, VY, SIDE, MISSED = range(6)
+
+    def __init__(self, max_distance: float = 0.25, handedness_penalty: float = 0.15,
+                 max_missed: int = 5, side_smoothing: float = 0.3):
+        self.max_distance = max_distance  # Normalized image units
+        self.handedness_penalty = handedness_penalty
+        self.max_missed = max_missed
+        self.side_smoothing = side_smoothing
+        self.reset()
+
+    def reset(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.state = np.empty((0, 6), dtype=np.float32)
+        self.sides = np.empty(0, dtype=np.int64)  # -1/0/+1 per hand of the last update
+        self._next_id = 0
+
+    @staticmethod
+    def _side_scores(handedness, count: int) -> np.ndarray:
+        scores = np.zeros(count, dtype=np.float32)
+        for i, (label, score) in enumerate((handedness or [])[:count]):
+            scores[i] = score if label == "Right" else -score if label == "Left" else 0.0
+        return scores
+
+    def update(self, hands: np.ndarray, handedness: Optional[List[Tuple[Optional[str], float]]] = None) -> np.ndarray:
+        """Assign track IDs to one frame's (hands, 21, 2+) landmarks -> (hands,) int array"""
+        count = len(hands)
+        state = self.state
+        observed = self._side_scores(handedness, count)
+        rows = [-1] * count  # State row of each hand's track
+        if count:
+            centers = np.asarray(hands, dtype=np.float32)[:, PALM_POINTS, :2].sum(axis=1) / len(PALM_POINTS)
+        if count and len(state):
+            offset = (state[:, None, :2] + state[:, None, 2:4]) - centers[None]
+            cost = np.hypot(offset[..., 0], offset[..., 1])
+            cost += self.handedness_penalty * (state[:, None, self.SIDE] * observed[None] < 0)
+            # Greedy by increasing cost: optimal for the one or two hands in view
+            taken = set()
+            for flat in np.argsort(cost, axis=None).tolist():
+                track, hand = divmod(flat, count)
+                if cost[track, hand] > self.max_distance:
+                    break
+                if track not in taken and rows[hand] < 0:
+                    taken.add(track)
+                    rows[hand] = track
+
+        # Unmatched tracks coast at their last velocity; matched ones are overwritten below
+        state[:, :2] += state[:, 2:4]
+        state[:, self.MISSED] += 1
+        smoothing = self.side_smoothing
+        ids = [0] * count
+        new = []
+        for hand, row in enumerate(rows):
+            if row < 0:
+                new.append(hand)
+                continue
+            track = state[row]
+            track[2:4] = centers[hand] - (track[:2] - track[2:4])
+            track[:2] = centers[hand]
+            track[self.SIDE] += smoothing * (observed[hand] - track[self.SIDE])
+            track[self.MISSED] = 0
+            ids[hand] = int(self.ids[row])
+        expired = state[:, self.MISSED] > self.max_missed
+        if new or expired.any():
+            keep = ~expired
+            shifted = np.cumsum(keep) - 1  # Rows move up as tracks end
+            rows = [int(shifted[row]) if row >= 0 else -1 for row in rows]
+            born = np.zeros((len(new), 6), dtype=np.float32)
+            for i, hand in enumerate(new):
+                ids[hand] = self._next_id
+                self._next_id += 1
+                born[i, :2] = centers[hand]
+                born[i, self.SIDE] = observed[hand]
+                rows[hand] = int(keep.sum()) + i
+            self.state = np.concatenate([state[keep], born])
+            self.ids = np.concatenate([self.ids[keep], np.array([ids[h] for h in new], dtype=np.int64)])
+        self.sides = np.sign(self.state[rows, self.SIDE]).astype(np.int64)
+        return np.array(ids, dtype=np.int64)
+
+
+class LandmarkFilter:
+    """Per-track temporal filter for (hands, 21, 3) landmarks
+
+    kind is one of:
+      - "one-euro": One-Euro filter; the cutoff rises with speed, so a held
+        pose is smoothed hard while real movement passes with little lag
+      - "kalman": constant-velocity Kalman filter per coordinate
+      - "none": landmarks pass through
+    State is kept per hand track and every update is one vectorized pass
+    over all hands and landmarks; tracks that end are forgotten (retain()).
+    """
+
+    KINDS = ("none", "one-euro", "kalman")
+
+    def __init__(self, kind: str = "one-euro", min_cutoff: float = 1.0, beta: float = 20.0,
+                 d_cutoff: float = 1.0, process_noise: float = 1.0, measurement_noise: float = 1e-5):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown landmark filter {kind!r}: expected one of {', '.join(self.KINDS)}")
+        self.kind = kind
+        self.min_cutoff = min_cutoff        # Hz: smoothing of a still hand
+        self.beta = beta                    # Cutoff increase per unit/s of speed
+        self.d_cutoff = d_cutoff            # Hz: smoothing of the speed estimate
+        self.process_noise = process_noise  # Kalman: acceleration variance (units^2/s^4)
+        self.measurement_noise = measurement_noise  # Kalman: landmark variance (units^2)
+        self._tracks = {}  # Track ID -> (timestamp, (k, 21, 3) state)
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        return 1.0 / (1.0 + 1.0 / (2.0 * np.pi * cutoff * dt))
+
+    def apply(self, hands: np.ndarray, track_ids: List[int], timestamp: float) -> np.ndarray:
+        """Filtered copy of one frame's hands (new tracks start at their raw landmarks)"""
+        if self.kind == "none" or len(hands) == 0:
+            return hands
+        known = [i for i, track in enumerate(track_ids) if track in self._tracks]
+        if len(known) < len(hands):
+            if self.kind == "kalman":
+                state = np.zeros((len(hands), 5, NUM_LANDMARKS, 3), dtype=np.float32)
+                state[:, 0] = hands  # position, velocity, P00, P01, P11
+                state[:, 2] = self.measurement_noise
+            else:
+                state = np.stack([hands, np.zeros_like(hands)], axis=1)  # position, speed
+        if known:
+            dt = np.array([max(timestamp - self._tracks[track_ids[i]][0], 1e-3) for i in known],
+                          dtype=np.float32)[:, None, None]
+            previous = np.stack([self._tracks[track_ids[i]][1] for i in known])
+            step = self._kalman if self.kind == "kalman" else self._one_euro
+            if len(known) == len(hands):
+                state = step(previous, hands, dt)  # Steady state: every hand already tracked
+            else:
+                state[known] = step(previous, hands[known], dt)
+        for i, track in enumerate(track_ids):
+            self._tracks[track] = (timestamp, state[i])
+        return state[:, 0]
+
+    def _one_euro(self, previous: np.ndarray, x: np.ndarray, dt: np.ndarray) -> np.ndarray:
+        speed = (x - previous[:, 0]) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        speed = previous[:, 1] + a_d * (speed - previous[:, 1])
+        a = self._alpha(self.min_cutoff + self.beta * np.abs(speed), dt)
+        position = previous[:, 0] + a * (x - previous[:, 0])
+        return np.stack([position, speed], axis=1)
+
+    def _kalman(self, previous: np.ndarray, z: np.ndarray, dt: np.ndarray) -> np.ndarray:
+        p, v, p00, p01, p11 = (previous[:, k] for k in range(5))
+        q = self.process_noise
+        # Predict (constant velocity, white-noise acceleration)
+        p = p + v * dt
+        p00 = p00 + dt * (2.0 * p01 + dt * p11) + q * dt ** 3 / 3.0
+        p01 = p01 + dt * p11 + q * dt ** 2 / 2.0
+        p11 = p11 + q * dt
+        # Update with the measured landmark
+        gain0 = p00 / (p00 + self.measurement_noise)
+        gain1 = p01 / (p00 + self.measurement_noise)
+        residual = z - p
+        p = p + gain0 * residual
+        v = v + gain1 * residual
+        p11 = p11 - gain1 * p01
+        p01 = (1.0 - gain0) * p01
+        p00 = (1.0 - gain0) * p00
+        return np.stack([p, v, p00, p01, p11], axis=1)
+
+    def retain(self, track_ids):
+        """Forget the state of tracks that are no longer alive"""
+        alive = set(track_ids)
+        for track in [t for t in self._tracks if t not in alive]:
+            del self._tracks[track]
+
+    def reset(self):
+        self._tracks.clear()
+
+
+class SignLanguageProcessor:
+    """Process sign language and build text with word support
+
+    Each tracked hand has its own vote window; the gesture being held is
+    the two-handed gesture when both hands agree on one, else the smoothed
+    gesture of the primary (longest-tracked) hand.
+    """
+
+    COMMIT_POLICIES = ("evidence", "hold")
+    # Chance that a frame shows the held gesture when it is meant (vs. passing through)
+    FRAME_MATCH_INTENDED = 0.9
+    FRAME_MATCH_TRANSIENT = 0.5
+
+    def __init__(self, gesture_table: Optional[GestureTable] = None, clock=time.time,
+                 window: int = 10, window_seconds: Optional[float] = None,
+                 recency_half_life: Optional[float] = None, min_votes: int = 5,
+                 landmark_filter: str = "one-euro", filter_options: Optional[dict] = None,
+                 hysteresis: float = 0.1, commit_policy: str = "evidence",
+                 commit_error: float = 0.01, evidence_margin: float = 0.25):
+        """landmark_filter smooths each tracked hand's landmarks before
+        recognition (LandmarkFilter kind, tuned by filter_options); a finger
+        then only changes state once it is hysteresis palm units past its
+        threshold, so jitter near the threshold can't restart a hold.
+
+        commit_policy "evidence" commits a gesture once a sequential
+        probability ratio test over its frames accepts it at error rate
+        commit_error, but not before its min_hold time; frames count fully
+        when every deciding finger is evidence_margin palm units clear of
+        its threshold. Any gesture commits at its hold time, which is all
+        the "hold" policy uses.
+        """
+        if commit_policy not in self.COMMIT_POLICIES:
+            raise ValueError(f"Unknown commit policy {commit_policy!r}: "
+                             f"expected one of {', '.join(self.COMMIT_POLICIES)}")
+        # None follows the active (reloadable) vocabulary for per-gesture hold times
+        self.gesture_table = gesture_table
+        # Time source in seconds; inject e.g. recorded timestamps for offline runs
+        self.clock = clock
+        self.accumulated_text = ""
+        self.current_letter = None
+        self.letter_hold_time = 0
+        self.letter_confirmed = False
+        self.commit_policy = commit_policy
+        self.evidence = 0.0  # Log-likelihood ratio for the gesture being held
+        self.evidence_threshold = math.log((1.0 - commit_error) / commit_error)
+        self.match_evidence = math.log(self.FRAME_MATCH_INTENDED / self.FRAME_MATCH_TRANSIENT)
+        self.miss_evidence = math.log((1.0 - self.FRAME_MATCH_INTENDED) / (1.0 - self.FRAME_MATCH_TRANSIENT))
+        self.evidence_margin = evidence_margin
+        self.commits = 0
+        self.commit_seconds = 0.0  # Total hold time of all commits
+        self._vote_options = (window, window_seconds, recency_half_life)
+        self.hand_histories = {}  # Track ID -> that hand's MajorityVote
+        # Two-handed gesture per frame with both hands in view ("" = none)
+        self.pair_history = MajorityVote(window, window_seconds, recency_half_life)
+        self.tracks = HandTracks()
+        self.detected = None  # This frame's gesture: two-handed, else the primary hand's
+        self.hand_ids = []  # Track ID of each hand of the last process_frame()
+        self.landmark_filter = LandmarkFilter(landmark_filter, **(filter_options or {}))
+        self.hysteresis = hysteresis
+        self.frame_aspect = 1.0  # Width / height of the frames the landmarks are normalized to
+        self._finger_masks = {}   # Track ID -> last finger mask
+        self._hand_letters = {}   # Track ID -> last per-frame letter
+        self.finger_flips = 0     # Finger state changes (all tracked hands)
+        self.letter_flips = 0     # Per-frame letter changes (all tracked hands)
+        self.hand_seconds = 0.0   # Time with at least one hand tracked
+        self._last_frame_time = None
+        self.min_votes = min_votes
+        self.hold_duration = 1.2
+        self.space_hold_duration = 1.8
+        self.speak_hold_duration = 1.8
+        self.word_hold_duration = 1.5
+        # Shortest holds for the evidence policy, unless the vocabulary sets min_hold
+        self.min_hold_duration = 0.3
+        self.word_min_hold_duration = 0.4
+        self.action_min_hold_duration = 0.6
+        # Motion word signs, matched on landmark trajectories when a template library is loaded
+        library = get_word_library()
+        self.trajectory = TrajectoryRecognizer(library) if library else None
+        # Completions of the word being fingerspelled, when a lexicon is loaded
+        self.lexicon = get_lexicon()
+        self._prefix = ""
+        self._prefix_node = 0
+        self._completions = []
+        self.last_gesture = None  # Label of the most recent commit
+        
+        # Word mappings for common ASL signs (expanded)
+        self.word_mappings = {
+            "WORD:YES": "yes",
+            "WORD:NO": "no",
+            "WORD:HELLO": "hello",
+            "WORD:LOVE": "love",
+            "WORD:THANKYOU": "thank you",
+            "WORD:PLEASE": "please",
+            "WORD:SORRY": "sorry",
+            "WORD:HELP": "help",
+            "WORD:STOP": "stop",
+            "WORD:GOOD": "good",
+            "WORD:BAD": "bad",
+            "WORD:FRIEND": "friend",
+            "WORD:FOOD": "food",
+            "WORD:WATER": "water",
+            "WORD:WHERE": "where",
+            "WORD:WHO": "who",
+            "WORD:WHAT": "what",
+            "WORD:WHEN": "when",
+            "WORD:WHY": "why",
+            "WORD:HOW": "how",
+            "WORD:MOM": "mom",
+            "WORD:DAD": "dad",
+            "WORD:FAMILY": "family",
+            "WORD:SCHOOL": "school",
+            "WORD:HOME": "home",
+            "WORD:WORK": "work",
+            "WORD:PLAY": "play",
+            "WORD:MORE": "more",
+            "WORD:FINISH": "finish",
+            "WORD:THANK": "thank",
+            "WORD:PLEASE": "please",
+            "WORD:EXCUSE": "excuse",
+            "WORD:DEAF": "deaf",
+            "WORD:HEARING": "hearing",
+            "WORD:TEACHER": "teacher",
+            "WORD:STUDENT": "student"
+        }
+        
+    def process_detection(self, letter, timestamp: Optional[float] = None, weight: float = 1.0,
+                          hand: Optional[np.ndarray] = None):
+        """Process detected letter or word of a single hand
+
+        timestamp (seconds) overrides the clock, e.g. for recorded video.
+        weight scales this frame's vote, e.g. by recognition confidence.
+        hand is the frame's (21, 3) landmarks (None = no hand), feeding the
+        trajectory matcher for motion word signs.
+        """
+        self.detected = letter
+        return self.process_hands([letter], [0], timestamp=timestamp, weights=[weight], primary_hand=hand)
+
+    def process_frame(self, hands: np.ndarray, handedness: Optional[List[Tuple[Optional[str], float]]] = None,
+                      timestamp: Optional[float] = None, recognized: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                      weights: Optional[List[float]] = None, frame_shape: Optional[Tuple[int, ...]] = None):
+        """Process all hands of one frame: (hands, 21, 3) landmarks and their handedness
+
+        Hands get stable track IDs (HandTracks), are filtered per track
+        (landmark_filter) and recognized in one batched pass with finger-state
+        hysteresis, and a left/right pair is looked up in the two-handed
+        vocabulary. recognized (recognize_hands() output) skips filtering and
+        hysteresis; see stateless_recognition. Frames whose deciding fingers
+        are close to their thresholds add less commit evidence. frame_shape
+        (the image's height, width) sets frame_aspect for this and later frames.
+        """
+        current_time = self.clock() if timestamp is None else timestamp
+        if frame_shape is not None and frame_shape[0] and frame_shape[1]:
+            self.frame_aspect = frame_shape[1] / frame_shape[0]
+        hands = np.asarray(hands, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+        track_ids = self.tracks.update(hands, handedness)
+        self.hand_ids = track_ids.tolist()
+        alive = self.tracks.ids.tolist()
+        self.landmark_filter.retain(alive)
+        scores = None
+        if recognized is None:
+            hands = self.landmark_filter.apply(hands, self.hand_ids, current_time)
+            margins = finger_margins_batch(hands, self.frame_aspect)
+            recognized = self._recognize(hands, margins)
+            scores = self._clarity(margins, recognized[1])
+        elif len(hands):
+            # Batched masks (stateless recognition) equal margins > 0; the
+            # margins still weight each frame's commit evidence
+            scores = self._clarity(finger_margins_batch(hands, self.frame_aspect), recognized[1])
+        letters, masks = recognized
+        self._count_flips(letters, masks, current_time, alive)
+        pair = recognize_two_handed(masks, self.tracks.sides, self.gesture_table)
+        primary = int(track_ids.argmin()) if len(hands) else None
+        self.detected = pair or (letters[primary] if primary is not None else None)
+        return self.process_hands(list(letters), self.hand_ids, pair=pair, timestamp=current_time,
+                                  weights=weights, scores=scores,
+                                  primary_hand=hands[primary] if primary is not None else None)
+
+    @property
+    def stateless_recognition(self) -> bool:
+        """True when frames can be recognized independently (no filter or hysteresis),
+        e.g. all at once by recognize_hands() for a replay"""
+        return self.landmark_filter.kind == "none" and self.hysteresis <= 0
+
+    def _recognize(self, hands: np.ndarray, margins: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """recognize_hands() with per-track finger-state hysteresis (margins: finger_margins_batch())"""
+        if len(hands) == 0:
+            return np.empty(0, dtype=object), np.empty(0, dtype=np.int64)
+        states = margins > 0
+        if self.hysteresis > 0:
+            known = [i for i, track in enumerate(self.hand_ids) if track in self._finger_masks]
+            if known:
+                previous = (np.array([self._finger_masks[self.hand_ids[i]] for i in known])[:, None]
+                            & FINGER_BITS) != 0
+                # An extended finger stays extended until clearly bent, and vice versa
+                states[known] = np.where(previous, margins[known] > -self.hysteresis,
+                                         margins[known] > self.hysteresis)
+        masks = finger_mask_batch(states)
+        if self.gesture_table is None and _classifier is not None:
+            return _classifier.predict(hands), masks
+        return (self.gesture_table or get_gesture_table()).label_array[masks], masks
+
+    def _clarity(self, margins: np.ndarray, masks: np.ndarray) -> Optional[List[float]]:
+        """Per-hand evidence weight in 0..1: how far the fingers that decide the
+        gesture are from their thresholds (None with a learned classifier)"""
+        if len(masks) == 0 or (self.gesture_table is None and _classifier is not None):
+            return None
+        sensitive = (self.gesture_table or get_gesture_table()).sensitive[masks]
+        clearance = np.where(sensitive, np.abs(margins), np.inf).min(axis=1)
+        return np.minimum(clearance / self.evidence_margin, 1.0).tolist()
+
+    def _count_flips(self, letters, masks, current_time: float, alive: List[int]):
+        """Per-frame finger-state and letter changes and time with hands in view, for flip_stats()"""
+        for i, track in enumerate(self.hand_ids):
+            mask = int(masks[i])
+            previous = self._finger_masks.get(track)
+            if previous is not None:
+                self.finger_flips += bin(previous ^ mask).count("1")
+                self.letter_flips += self._hand_letters[track] != letters[i]
+            self._finger_masks[track] = mask
+            self._hand_letters[track] = letters[i]
+        for states in (self._finger_masks, self._hand_letters):
+            for track in [t for t in states if t not in alive]:
+                del states[track]
+        if self.hand_ids and self._last_frame_time is not None:
+            self.hand_seconds += min(max(current_time - self._last_frame_time, 0.0), 0.5)
+        self._last_frame_time = current_time if self.hand_ids else None
+
+    def flip_stats(self) -> dict:
+        """Finger-state and per-frame letter changes per second of tracked hands"""
+        seconds = self.hand_seconds
+        return {
+            "finger_flips": self.finger_flips,
+            "letter_flips": self.letter_flips,
+            "hand_seconds": round(seconds, 3),
+            "finger_flips_per_s": round(self.finger_flips / seconds, 3) if seconds else 0.0,
+            "letter_flips_per_s": round(self.letter_flips / seconds, 3) if seconds else 0.0,
+        }
+
+    def process_hands(self, letters: List[Optional[str]], track_ids: List[int], pair: Optional[str] = None,
+                      timestamp: Optional[float] = None, weights: Optional[List[float]] = None,
+                      scores: Optional[List[float]] = None, primary_hand: Optional[np.ndarray] = None):
+        """Vote each hand's letter into its own track's window, then advance the hold
+
+        The primary hand is the one with the lowest (oldest) track ID, so a
+        second hand entering the frame never takes over. primary_hand is its
+        landmarks, for the trajectory matcher. scores (0..1 per hand, default
+        weights) scale how much this frame counts as commit evidence.
+        """
+        current_time = self.clock() if timestamp is None else timestamp
+
+        if self.trajectory is not None:
+            word = self.trajectory.update(primary_hand, current_time)
+            if word:
+                return self.commit_word(word)
+
+        # Forget hands that left (tracks coasting through a missed detection keep their votes)
+        alive = set(track_ids) | set(self.tracks.ids.tolist())
+        for track in [t for t in self.hand_histories if t not in alive]:
+            del self.hand_histories[track]
+        voted = False
+        for i, (track, letter) in enumerate(zip(track_ids, letters)):
+            if letter:
+                history = self.hand_histories.get(track)
+                if history is None:
+                    history = self.hand_histories[track] = MajorityVote(*self._vote_options)
+                history.add(letter, current_time, weights[i] if weights else 1.0)
+                voted = True
+        if len(track_ids) >= 2:
+            self.pair_history.add(pair or "", current_time)
+        elif len(self.pair_history):
+            self.pair_history.clear()
+        if not voted and not pair:
+            return None
+
+        scores = scores or weights
+        if self.pair_history.leader and len(self.pair_history) >= self.min_votes:
+            candidate = self.pair_history.leader
+            observed, score = pair, min(scores) if scores else 1.0
+        else:
+            history = self.hand_histories.get(min(track_ids)) if track_ids else None
+            if history is None or len(history) < self.min_votes:
+                return None
+            candidate = history.leader
+            primary = track_ids.index(min(track_ids))
+            observed, score = letters[primary], scores[primary] if scores else 1.0
+        return self._advance_hold(candidate, current_time, observed, score)
+
+    def _advance_hold(self, candidate: str, current_time: float, observed: Optional[str] = None,
+                      score: float = 1.0):
+        """Hold/commit state machine for the smoothed gesture
+
+        observed is this frame's own gesture: it adds score-weighted evidence
+        for the candidate when it agrees and takes evidence away when it
+        doesn't (SPRT with the rejection bound folded to zero, so a glitch
+        costs progress instead of restarting the hold).
+        """
+        if candidate != self.current_letter:
+            self.current_letter = candidate
+            self.letter_hold_time = current_time
+            self.letter_confirmed = False
+            self.evidence = 0.0
+        
+        if not self.letter_confirmed:
+            if observed == candidate:
+                self.evidence += self.match_evidence * score
+            else:
+                self.evidence = max(self.evidence + self.miss_evidence, 0.0)
+            if self.get_hold_progress(current_time) < 1.0:
+                return None
+            if self.current_letter == "ACCEPT" and not self.completions():
+                self.letter_confirmed = True  # Nothing to complete: not a commit, no action
+                return None
+            self.commits += 1
+            self.commit_seconds += current_time - self.letter_hold_time
+            
+            if self.current_letter == "SPACE":
+                if self.accumulated_text and not self.accumulated_text.endswith(" "):
+                    self.accumulated_text += " "
+                self.letter_confirmed = True
+                return "SPACE_ADDED"
+            
+            elif self.current_letter == "SPEAK":
+                self.letter_confirmed = True
+                return "SPEAK_NOW"
+            
+            elif self.current_letter == "DELETE":
+                if self.accumulated_text:
+                    # Delete last word or character
+                    if self.accumulated_text.endswith(" "):
+                        self.accumulated_text = self.accumulated_text[:-1]
+                    else:
+                        parts = self.accumulated_text.rsplit(' ', 1)
+                        if len(parts) > 1:
+                            self.accumulated_text = parts[0] + " "
+                        else:
+                            self.accumulated_text = ""
+                self.letter_confirmed = True
+                return "DELETED"
+
+            elif self.current_letter == "ACCEPT":
+                self.letter_confirmed = True
+                return self.accept_completion()
+            
+            # Handle word gestures
+            elif self.current_letter.startswith("WORD:"):
+                self.accumulated_text += self.word_text(self.current_letter) + " "
+                self.letter_confirmed = True
+                self.last_gesture = self.current_letter
+                return "WORD_ADDED"
+            
+            else:
+                self.accumulated_text += self.current_letter
+                self.letter_confirmed = True
+                self.last_gesture = self.current_letter
+                return "LETTER_ADDED"
+
+        return None
+
+    def word_text(self, label: str) -> str:
+        return self.word_mappings.get(label, label.replace("WORD:", "").lower())
+
+    def commit_word(self, label: str) -> str:
+        """Append a word recognized from motion; the static pose being held is discarded"""
+        self.accumulated_text += self.word_text(label) + " "
+        self.current_letter = None
+        self.letter_confirmed = False
+        self.clear_votes()
+        self.last_gesture = label
+        return "WORD_ADDED"
+    
+    def completions(self) -> List[str]:
+        """Lexicon words completing the word being spelled, most frequent first
+
+        Incremental: a newly committed letter moves the cached trie node one
+        step; only deletions and new words walk again from the root.
+        """
+        if self.lexicon is None:
+            return []
+        prefix = self.accumulated_text.rsplit(" ", 1)[-1].lower()
+        if prefix != self._prefix:
+            if prefix and prefix[:-1] == self._prefix:
+                node = self.lexicon.step(self._prefix_node, prefix[-1])
+            else:
+                node = self.lexicon.walk(prefix)
+            self._prefix, self._prefix_node = prefix, node
+            self._completions = self.lexicon.completions(node) if prefix else []
+        return self._completions
+
+    def accept_completion(self, index: int = 0) -> Optional[str]:
+        """Replace the word being spelled by its index-th completion -> "WORD_ADDED", or None"""
+        completions = self.completions()
+        if index >= len(completions):
+            return None
+        word = completions[index]
+        self.accumulated_text = self.accumulated_text[:len(self.accumulated_text) - len(self._prefix)] + word + " "
+        self.last_gesture = f"WORD:{word.upper()}"
+        return "WORD_ADDED"
+
+    def get_current_letter(self):
+        if self.current_letter and self.current_letter.startswith("WORD:"):
+            word = self.word_mappings.get(self.current_letter, self.current_letter.replace("WORD:", ""))
+            return word.upper()
+        return self.current_letter if self.current_letter else ""
+    
+    def get_hold_progress(self, timestamp: Optional[float] = None):
+        """Commit progress in 0..1: accumulated evidence (held at least min_hold), or time toward hold"""
+        if not self.current_letter or self.letter_confirmed:
+            return 0
+        current_time = self.clock() if timestamp is None else timestamp
+        hold_time = current_time - self.letter_hold_time
+        progress = hold_time / self.hold_threshold(self.current_letter)
+        if self.commit_policy == "evidence":
+            shortest = self.min_hold_threshold(self.current_letter)
+            confident = min(self.evidence / self.evidence_threshold,
+                            hold_time / shortest if shortest > 0 else 1.0)
+            progress = max(progress, confident)
+        return min(progress, 1.0)
+
+    def hold_threshold(self, letter: str) -> float:
+        """Seconds a gesture must be held: per-gesture value from the vocabulary, else category default"""
+        table = self.gesture_table or get_gesture_table()
+        hold = table.hold_time(letter)
+        if hold is not None:
+            return hold
+        if letter == "SPACE":
+            return self.space_hold_duration
+        if letter == "SPEAK":
+            return self.speak_hold_duration
+        if letter.startswith("WORD:"):
+            return self.word_hold_duration
+        return self.hold_duration
+
+    def min_hold_threshold(self, letter: str) -> float:
+        """Shortest hold before evidence can commit a gesture: vocabulary min_hold, else category default"""
+        table = self.gesture_table or get_gesture_table()
+        hold = table.min_hold_time(letter)
+        if hold is not None:
+            return hold
+        if letter in ("SPACE", "SPEAK", "DELETE", "ACCEPT"):
+            return self.action_min_hold_duration
+        if letter.startswith("WORD:"):
+            return self.word_min_hold_duration
+        return self.min_hold_duration
+
+    def commit_stats(self) -> dict:
+        """Number of commits and their mean hold time (the letter-rate bottleneck)"""
+        return {
+            "commits": self.commits,
+            "mean_hold_s": round(self.commit_seconds / self.commits, 3) if self.commits else 0.0,
+        }
+    
+    def clear_votes(self):
+        self.hand_histories.clear()
+        self.pair_history.clear()
+
+    def clear(self):
+        self.accumulated_text = ""
+        self.current_letter = None
+        self.letter_confirmed = False
+        self.clear_votes()
+
+
+class LatestFrameQueue:
+    """Bounded queue that drops the oldest item when full (latest-frame semantics)"""
+
+    def __init__(self, maxsize: int = 1, on_drop=None):
+        self.maxsize = max(1, maxsize)
+        self.on_drop = on_drop  # Called with each discarded item, e.g. to recycle its buffer
+        self._items = deque()
+        self._cond = threading.Condition()
+        self.dropped = 0
+        self.total = 0
+
+    def put(self, item):
+        """Add item, discarding the stalest entry if the queue is full"""
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                stale = self._items.popleft()
+                self.dropped += 1
+                if self.on_drop:
+                    self.on_drop(stale)
+            self._items.append(item)
+            self.total += 1
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None):
+        """Return the oldest queued item, or None on timeout"""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    def wake(self):
+        """Release any thread blocked in get()"""
+        with self._cond:
+            self._cond.notify_all()
+
+
+class RecognitionPipeline:
+    """Capture -> inference -> render pipeline connected by latest-frame queues
+
+    Capture and inference run in worker threads; rendering (imshow/waitKey)
+    stays on the calling thread because most GUI backends require it.
+    """
+
+    def __init__(self, cap, tracker, processor, action_bus, queue_size: int = 1):
+        self.cap = cap
+        # Each mirrored frame keeps its buffer until the render stage calls
+        # release_frame() or a queue drops it
+        self.frame_buffers = FramePreprocessor()
+        self.tracker = tracker
+        self.processor = processor
+        self.action_bus = action_bus
+        self.capture_queue = LatestFrameQueue(queue_size, on_drop=self.frame_buffers.release)
+        self.render_queue = LatestFrameQueue(queue_size, on_drop=lambda result: self.frame_buffers.release(result[0]))
+        # Guards processor state shared between inference and UI ('c' key)
+        self.processor_lock = threading.Lock()
+        self.running = threading.Event()
+        self.captured_count = 0
+        self.inferred_count = 0
+        self.hand_detect_count = 0
+        self.profiler = None  # Optional StageProfiler
+        self.recorder = None  # Optional LandmarkRecorder
+        self._threads = []
+
+    def start(self):
+        self.running.set()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="inference", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self.running.clear()
+        self.capture_queue.wake()
+        self.render_queue.wake()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def _capture_loop(self):
+        raw = None
+        while self.running.is_set():
+            with profile_stage(self.profiler, "capture"):
+                success, raw = self.cap.read(raw)  # Decode into the same buffer each time
+            if not success:
+                print("Failed to read frame")
+                self.running.clear()
+                break
+            self.captured_count += 1
+            self.capture_queue.put(self.frame_buffers.checkout_mirror(raw))  # Mirror for natural interaction
+        self.render_queue.wake()
+
+    def _inference_loop(self):
+        while self.running.is_set():
+            img = self.capture_queue.get(timeout=0.1)
+            if img is None:
+                continue
+
+            self.tracker.process(img)
+            # Copy: the tracker reuses its landmark buffer on the next frame
+            landmarks = self.tracker.get_landmark_array().copy()
+            handedness = self.tracker.get_handedness()
+            hand_detected = len(landmarks) > 0
+            if self.recorder:
+                # Wall-clock ms: the same clock the processor's holds are measured on
+                self.recorder.append(int(time.time() * 1000), landmarks, handedness, img.shape)
+
+            if hand_detected:
+                self.hand_detect_count += 1
+
+            # Tracks, landmark filter, batched recognition of all hands, votes and holds
+            with self.processor_lock, profile_stage(self.profiler, "recognize"):
+                action = self.processor.process_frame(landmarks, handedness, frame_shape=img.shape)
+                dispatch_action(action, self.processor, self.action_bus, self.processor.detected)
+                snapshot = (self.processor.accumulated_text,
+                            self.processor.get_current_letter(),
+                            self.processor.get_hold_progress(),
+                            self.processor.completions())
+
+            self.inferred_count += 1
+            self.render_queue.put((img, landmarks, hand_detected) + snapshot)
+
+    def next_result(self, timeout: float = 0.1):
+        """Block until the newest inference result is available
+
+        The result's frame belongs to the caller until release_frame().
+        """
+        return self.render_queue.get(timeout=timeout)
+
+    def release_frame(self, img: np.ndarray):
+        """Hand a rendered frame's buffer back to the capture stage"""
+        self.frame_buffers.release(img)
+
+    def clear_text(self):
+        with self.processor_lock:
+            self.processor.clear()
+
+    def accept_completion(self) -> Optional[str]:
+        """Take the first word completion; nothing happens when there is none"""
+        with self.processor_lock:
+            action = self.processor.accept_completion()
+            if action:
+                dispatch_action(action, self.processor, self.action_bus)
+        return action
+
+    def stats(self) -> dict:
+        return {
+            "captured": self.captured_count,
+            "inferred": self.inferred_count,
+            "capture_queue_depth": self.capture_queue.depth(),
+            "capture_dropped": self.capture_queue.dropped,
+            "render_queue_depth": self.render_queue.depth(),
+            "render_dropped": self.render_queue.dropped,
+        }
+
+
+class ActionEvent:
+    """An action from SignLanguageProcessor, with the text it applies to"""
+
+    __slots__ = ("action", "text", "gesture", "timestamp")
+
+    def __init__(self, action: str, text: str, gesture: Optional[str] = None,
+                 timestamp: Optional[float] = None):
+        self.action = action
+        self.text = text
+        self.gesture = gesture
+        self.timestamp = time.perf_counter() if timestamp is None else timestamp
+
+    def to_dict(self) -> dict:
+        return {"action": self.action, "text": self.text, "gesture": self.gesture}
+
+
+class ActionSink:
+    """A subscriber running on its own thread with a bounded event queue
+
+    The callback receives each ActionEvent. Latency (publish -> handled) and
+    handling time are tracked per sink so a slow sink shows up in its own
+    stats instead of stalling recognition.
+    """
+
+    def __init__(self, name: str, callback, actions: Optional[Tuple[str, ...]] = None,
+                 max_queue: int = 64):
+        self.name = name
+        self.callback = callback
+        self.actions = set(actions) if actions else None
+        self.events = queue.Queue(maxsize=max_queue)
+        self.latency = deque(maxlen=100)
+        self.handling_time = deque(maxlen=100)
+        self.handled_count = 0
+        self.dropped_count = 0
+        self._thread = threading.Thread(target=self._worker, name=f"sink-{name}", daemon=True)
+        self._thread.start()
+
+    def offer(self, event: ActionEvent):
+        """Enqueue without blocking; events are dropped (and counted) if the sink is backed up"""
+        if self.actions is not None and event.action not in self.actions:
+            return
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.dropped_count += 1
+
+    def _worker(self):
+        while True:
+            event = self.events.get()
+            if event is None:
+                break
+            started = time.perf_counter()
+            try:
+                self.callback(event)
+            except Exception as e:
+                print(f"⚠️ Action sink '{self.name}' failed: {e}")
+            finished = time.perf_counter()
+            self.handling_time.append(finished - started)
+            self.latency.append(finished - event.timestamp)
+            self.handled_count += 1
+
+    def stats(self) -> dict:
+        def max_ms(values):
+            return round(1000.0 * max(values), 2) if values else None
+
+        def mean_ms(values):
+            return round(1000.0 * sum(values) / len(values), 2) if values else None
+        return {
+            "handled": self.handled_count,
+            "dropped": self.dropped_count,
+            "pending": self.events.qsize(),
+            "latency_ms": mean_ms(self.latency),
+            "max_latency_ms": max_ms(self.latency),
+            "handling_ms": mean_ms(self.handling_time),
+        }
+
+    def close(self, timeout: float = 1.0):
+        try:
+            self.events.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        closer = getattr(self.callback, "close", None)
+        if closer:
+            closer()
+
+
+class ActionBus:
+    """Fan out ActionEvents to subscribed sinks without blocking the frame loop"""
+
+    def __init__(self):
+        self.sinks = []
+
+    def subscribe(self, name: str, callback, actions: Optional[Tuple[str, ...]] = None,
+                  max_queue: int = 64) -> ActionSink:
+        sink = ActionSink(name, callback, actions, max_queue)
+        self.sinks.append(sink)
+        return sink
+
+    def publish(self, event: ActionEvent):
+        for sink in self.sinks:
+            sink.offer(event)
+
+    def stats(self) -> dict:
+        return {sink.name: sink.stats() for sink in self.sinks}
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def console_sink(event: ActionEvent):
+    """Log committed actions to the console"""
+    if event.action == "SPEAK_NOW":
+        print(f"🔊 Speaking: {event.text}")
+    elif event.action == "WORD_ADDED":
+        print(f"✓ Word added: '{event.text}'")
+    else:
+        print(f"✓ {event.action}: '{event.text}'")
+
+
+class TranscriptSink:
+    """Append every action event as a JSON line to a transcript file"""
+
+    def __init__(self, path: str):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def __call__(self, event: ActionEvent):
+        record = event.to_dict()
+        record["time"] = time.time()
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def create_action_bus(tts_engine, transcript: Optional[str] = None) -> ActionBus:
+    """Default subscribers: speech on SPEAK_NOW, console log, optional transcript file"""
+    bus = ActionBus()
+    bus.subscribe("tts", lambda event: tts_engine.speak(event.text), actions=("SPEAK_NOW",))
+    bus.subscribe("console", console_sink)
+    if transcript:
+        bus.subscribe("transcript", TranscriptSink(transcript))
+    return bus
+
+
+def dispatch_action(action, processor, bus: ActionBus, gesture: Optional[str] = None):
+    """Publish an action returned by SignLanguageProcessor.process_detection
+
+    Never blocks: sinks run on their own threads. On SPEAK_NOW the text is
+    captured into the event and the processor is cleared immediately.
+    """
+    if not action:
+        return
+    if action in ("LETTER_ADDED", "WORD_ADDED"):
+        gesture = processor.last_gesture  # A motion word differs from the pose in view
+    if action == "SPEAK_NOW":
+        text_to_speak = processor.accumulated_text.strip()
+        if not text_to_speak:
+            return
+        processor.clear()
+        bus.publish(ActionEvent(action, text_to_speak, gesture))
+    else:
+        bus.publish(ActionEvent(action, processor.accumulated_text, gesture))
+
+
+class TextSprites:
+    """Cache of pre-rendered text patches
+
+    Text is rasterized with putText only the first time a given string/style
+    is seen; afterwards drawing it is a masked copy of a small patch, or an
+    alpha blend when putText anti-aliases (OpenCV 5 does even for LINE_8).
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._sprites = OrderedDict()
+        self.rendered = 0
+
+    def _render(self, key):
+        text, scale, color, thickness = key
+        (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+        pad = thickness + 1
+        mask = np.zeros((th + baseline + 2 * pad, tw + 2 * pad), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, pad + th), cv2.FONT_HERSHEY_SIMPLEX, scale, 255, thickness)
+        patch = np.empty(mask.shape + (3,), dtype=np.uint8)
+        patch[:] = color
+        if np.isin(mask, (0, 255)).all():
+            weights = None
+        else:
+            alpha = mask.astype(np.float32) / 255
+            weights = (alpha, 1 - alpha)
+        self.rendered += 1
+        return mask, patch, weights, pad, pad + th
+
+    def draw(self, img, text: str, org: Tuple[int, int], scale: float,
+             color: Tuple[int, int, int], thickness: int):
+        """Same result as cv2.putText(img, text, org, FONT_HERSHEY_SIMPLEX, scale, color, thickness)"""
+        key = (text, scale, color, thickness)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._sprites[key] = self._render(key)
+            if len(self._sprites) > self.max_entries:
+                self._sprites.popitem(last=False)
+        else:
+            self._sprites.move_to_end(key)
+        mask, patch, weights, left, top = sprite
+
+        # Clip the sprite rectangle to the image
+        h, w = img.shape[:2]
+        x0, y0 = org[0] - left, org[1] - top
+        sx0, sy0 = max(0, -x0), max(0, -y0)
+        x1, y1 = min(w, x0 + mask.shape[1]), min(h, y0 + mask.shape[0])
+        x0, y0 = max(0, x0), max(0, y0)
+        if x1 <= x0 or y1 <= y0:
+            return
+        sx1, sy1 = sx0 + (x1 - x0), sy0 + (y1 - y0)
+        region = img[y0:y1, x0:x1]
+        if weights is None:
+            cv2.copyTo(patch[sy0:sy1, sx0:sx1], mask[sy0:sy1, sx0:sx1], region)
+        else:
+            cv2.blendLinear(patch[sy0:sy1, sx0:sx1], region, weights[0][sy0:sy1, sx0:sx1],
+                            weights[1][sy0:sy1, sx0:sx1], dst=region)
+
+
+class HUDRenderer:
+    """Status overlay, text, hold progress and statistics, drawn at minimal cost
+
+    Only the overlay rectangle is darkened (in place, no full-frame copy or
+    blend), and text goes through TextSprites so it is rasterized only when
+    its value changes.
+    """
+
+    def __init__(self):
+        self.sprites = TextSprites()
+
+    def render(self, img, hand_detected: bool, accumulated_text: str, current_letter: str,
+               progress: float, fps: float, frame_count: int, detection_rate: int,
+               extra_lines: Optional[List[str]] = None, completions: Optional[List[str]] = None):
+        h, w = img.shape[:2]
+        text = self.sprites.draw
+
+        # Semi-transparent overlay: 50% black over (10, 10)-(w-10, 180) only
+        panel = img[10:181, 10:w-9]
+        cv2.convertScaleAbs(panel, dst=panel, alpha=0.5)
+
+        # Hand detection status
+        if hand_detected:
+            status_text = "✓ HAND DETECTED"
+            status_color = (0, 255, 0)
+        else:
+            status_text = "✗ NO HAND"
+            status_color = (0, 0, 255)
+        cv2.circle(img, (w-50, 40), 15, status_color, -1)
+        text(img, status_text, (w-200, 45), 0.6, status_color, 2)
+
+        # Display accumulated text
+        text_display = accumulated_text if accumulated_text else "[Empty]"
+        text(img, f"Text: {text_display}", (20, 40), 0.7, (255, 255, 255), 2)
+
+        # Display current letter being held
+        if current_letter:
+            color = (0, 255, 0) if progress >= 1.0 else (0, 255, 255)
+            text(img, f"Detecting: {current_letter}", (20, 80), 0.8, color, 2)
+
+            # Progress bar
+            bar_width = int(300 * progress)
+            cv2.rectangle(img, (20, 100), (320, 120), (50, 50, 50), -1)
+            cv2.rectangle(img, (20, 100), (20 + bar_width, 120), color, -1)
+            text(img, f"{int(progress*100)}%", (330, 115), 0.5, (255, 255, 255), 1)
+
+            # Status text
+            if progress >= 1.0:
+                text(img, "✓ CONFIRMED", (20, 145), 0.6, (0, 255, 0), 2)
+            else:
+                text(img, "⏳ HOLD...", (20, 145), 0.6, (0, 255, 255), 2)
+
+        # Word completions of the lexicon; the first is taken by ACCEPT or Tab
+        if completions:
+            text(img, "Complete (Tab): " + " | ".join(completions), (20, 172), 0.55, (255, 200, 0), 1)
+
+        # Extra diagnostic lines (e.g. pipeline queue stats), stacked above the FPS line
+        for i, line in enumerate(extra_lines or []):
+            text(img, line, (20, h-90-25*i), 0.5, (200, 200, 0), 1)
+
+        # FPS counter
+        text(img, f"FPS: {int(fps)}", (20, h-60), 0.6, (0, 255, 0), 2)
+
+        # Statistics (changes every frame, so not worth caching)
+        cv2.putText(img, f"Frames: {frame_count} | Detection: {detection_rate}%", (20, h-30),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+
+        # Instructions
+        text(img, "Press 'q' to quit | 'c' to clear", (20, h-5), 0.5, (150, 150, 150), 1)
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp')
+
+
+def iter_source_frames(source: str, fps: float = 30.0):
+    """Yield (frame_index, timestamp_ms, frame) from a video file or image directory
+
+    Video frames use the container's timestamps; image directories are read
+    in sorted filename order and timestamped at the given frame rate.
+    Timestamps are forced to increase strictly, as MediaPipe requires.
+    """
+    last_ms = -1
+    if os.path.isdir(source):
+        names = sorted(n for n in os.listdir(source) if n.lower().endswith(IMAGE_EXTENSIONS))
+        for index, name in enumerate(names):
+            frame = cv2.imread(os.path.join(source, name))
+            if frame is None:
+                print(f"⚠️ Skipping unreadable image: {name}")
+                continue
+            timestamp_ms = max(int(index * 1000 / fps), last_ms + 1)
+            last_ms = timestamp_ms
+            yield index, timestamp_ms, frame
+        return
+
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video source: {source}")
+    video_fps = cap.get(cv2.CAP_PROP_FPS) or fps
+    index = 0
+    try:
+        while True:
+            success, frame = cap.read()
+            if not success:
+                break
+            timestamp_ms = int(cap.get(cv2.CAP_PROP_POS_MSEC))
+            if timestamp_ms <= 0 and index > 0:
+                # Some backends don't report positions; derive from frame rate
+                timestamp_ms = int(index * 1000 / video_fps)
+            timestamp_ms = max(timestamp_ms, last_ms + 1)
+            last_ms = timestamp_ms
+            yield index, timestamp_ms, frame
+            index += 1
+    finally:
+        cap.release()
+
+
+def process_source_batch(source: str, out, fps: float = 30.0, mirror: bool = False,
+                         max_num_hands: int = 2, processor_options: Optional[dict] = None,
+                         tracker_options: Optional[dict] = None, record_path: Optional[str] = None) -> dict:
+    """Run recognition over one recorded source, writing JSON Lines records to out
+
+    With record_path, the landmarks are also saved as a LandmarkRecorder
+    file for inference-free replays. Returns the summary record for the source.
+    """
+    # Fresh tracker/processor per source so tracking state and timestamps
+    # never leak between sessions
+    tracker = HandTracker(max_num_hands=max_num_hands, **(tracker_options or {}))
+    processor = SignLanguageProcessor(**(processor_options or {}))
+    recorder = LandmarkRecorder(record_path, max_num_hands) if record_path else None
+    frame_count = 0
+    hand_detect_count = 0
+    start = time.perf_counter()
+
+    try:
+        for index, timestamp_ms, frame in iter_source_frames(source, fps):
+            if mirror:
+                frame = cv2.flip(frame, 1)
+            tracker.process(frame, timestamp_ms=timestamp_ms)
+            landmarks = tracker.get_landmark_array()
+            handedness = tracker.get_handedness()
+            if recorder:
+                recorder.append(timestamp_ms, landmarks, handedness, frame.shape)
+            if len(landmarks) > 0:
+                hand_detect_count += 1
+
+            record = _offline_frame_record(source, index, timestamp_ms, landmarks, handedness, processor,
+                                           frame_shape=frame.shape)
+            frame_count += 1
+            out.write(json.dumps(record) + "\n")
+    finally:
+        tracker.close()
+        if recorder:
+            recorder.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "type": "summary",
+        "source": source,
+        "frames": frame_count,
+        "hands_detected": hand_detect_count,
+        "text": processor.accumulated_text,
+        "flips": processor.flip_stats(),
+        "commits": processor.commit_stats(),
+        "elapsed_s": round(elapsed, 3),
+        "fps": round(frame_count / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+    out.write(json.dumps(summary) + "\n")
+    return summary
+
+
+def run_batch(sources: List[str], output: Optional[str] = None, fps: float = 30.0,
+              mirror: bool = False, processor_options: Optional[dict] = None,
+              tracker_options: Optional[dict] = None, record: Optional[str] = None,
+              max_num_hands: int = 2):
+    """Headless recognition over recorded videos/image folders as fast as possible
+
+    Writes per-frame and per-source summary records as JSON Lines to output
+    (stdout when None). No window or webcam is needed. With record, landmarks
+    are saved for replay: to that file for one source, else one
+    <source name>.lmrec per source in that directory.
+    """
+    if record and len(sources) > 1:
+        os.makedirs(record, exist_ok=True)
+    out = open(output, "w", encoding="utf-8") if output else sys.stdout
+    total_frames = 0
+    start = time.perf_counter()
+    try:
+        for source in sources:
+            try:
+                record_path = record
+                if record and len(sources) > 1:
+                    name = os.path.basename(os.path.normpath(source))
+                    record_path = os.path.join(record, os.path.splitext(name)[0] + ".lmrec")
+                summary = process_source_batch(source, out, fps=fps, mirror=mirror,
+                                               max_num_hands=max_num_hands,
+                                               processor_options=processor_options,
+                                               tracker_options=tracker_options,
+                                               record_path=record_path)
+            except IOError as e:
+                print(f"❌ {e}", file=sys.stderr)
+                continue
+            total_frames += summary["frames"]
+            print(f"✓ {source}: {summary['frames']} frames @ {summary['fps']} fps "
+                  f"-> '{summary['text']}'", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    fps_total = total_frames / elapsed if elapsed > 0 else 0.0
+    print(f"📊 {len(sources)} sources, {total_frames} frames in {elapsed:.1f}s ({fps_total:.1f} fps)",
+          file=sys.stderr)
+
+
+RECORDING_MAGIC = b"LMREC\x00\x00\x01"
+# magic, version, max hands, landmarks per hand, reserved, frame width, frame height, created (unix ms)
+RECORDING_HEADER = struct.Struct("<8sHHHHIIQ")
+HANDEDNESS_LABELS = (None, "Left", "Right")
+
+
+def recording_dtype(max_hands: int) -> np.dtype:
+    """Fixed-size per-frame record, so a recording can be memory-mapped as one array"""
+    return np.dtype([
+        ("timestamp_ms", "<i8"),
+        ("hands", "u1"),
+        ("handedness", "u1", (max_hands,)),  # Index into HANDEDNESS_LABELS
+        ("scores", "<f4", (max_hands,)),
+        ("landmarks", "<f4", (max_hands, NUM_LANDMARKS, 3)),
+    ])
+
+
+class LandmarkRecorder:
+    """Append-only binary log of what HandTracker saw
+
+    One fixed-size record per frame (timestamp, handedness, normalized
+    landmarks) after a small header. Records are buffered and flushed every
+    flush_interval seconds. Appending to an existing file continues it, and
+    a torn record left by a crash is cut off first.
+    """
+
+    def __init__(self, path: str, max_hands: int = 2, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.frames = 0
+        exists = os.path.exists(path) and os.path.getsize(path) >= RECORDING_HEADER.size
+        if exists:
+            with open(path, "rb") as f:
+                header = RECORDING_HEADER.unpack(f.read(RECORDING_HEADER.size))
+            if header[0] != RECORDING_MAGIC:
+                raise ValueError(f"{path} is not a landmark recording")
+            max_hands = header[2]
+        self.max_hands = max_hands
+        self.dtype = recording_dtype(max_hands)
+        self._record = np.zeros(1, dtype=self.dtype)
+        self._file = open(path, "r+b" if exists else "wb")
+        if exists:
+            records = (os.path.getsize(path) - RECORDING_HEADER.size) // self.dtype.itemsize
+            self._file.truncate(RECORDING_HEADER.size + records * self.dtype.itemsize)
+            self._file.seek(0, os.SEEK_END)
+        self._header_written = exists
+        self._last_flush = time.perf_counter()
+
+    def append(self, timestamp_ms: int, landmarks: np.ndarray,
+               handedness: Optional[List[Tuple[Optional[str], float]]] = None,
+               frame_shape: Optional[Tuple[int, ...]] = None):
+        """Record one frame's (hands, 21, 3) landmarks; extra hands beyond max_hands are dropped"""
+        if not self._header_written:
+            h, w = frame_shape[:2] if frame_shape is not None else (0, 0)
+            self._file.write(RECORDING_HEADER.pack(RECORDING_MAGIC, 1, self.max_hands, NUM_LANDMARKS,
+                                                   0, w, h, int(time.time() * 1000)))
+            self._header_written = True
+        record = self._record[0]
+        n = min(len(landmarks), self.max_hands)
+        record["timestamp_ms"] = timestamp_ms
+        record["hands"] = n
+        record["landmarks"][:n] = landmarks[:n]
+        record["landmarks"][n:] = 0.0
+        record["handedness"][:] = 0
+        record["scores"][:] = 0.0
+        for i, (label, score) in enumerate((handedness or [])[:n]):
+            record["handedness"][i] = HANDEDNESS_LABELS.index(label) if label in HANDEDNESS_LABELS else 0
+            record["scores"][i] = score
+        self._file.write(self._record.tobytes())
+        self.frames += 1
+        now = time.perf_counter()
+        if now - self._last_flush >= self.flush_interval:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self):
+        self._file.close()
+
+
+class LandmarkRecording:
+    """Memory-mapped, zero-copy read access to a LandmarkRecorder file
+
+    The columns (timestamps_ms, hands, handedness, scores, landmarks) are
+    views into the mapped file, so even hours of frames open instantly and
+    can be processed with whole-array operations.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            raw = f.read(RECORDING_HEADER.size)
+        if len(raw) < RECORDING_HEADER.size or raw[:8] != RECORDING_MAGIC:
+            raise ValueError(f"{path} is not a landmark recording")
+        _, self.version, self.max_hands, _, _, width, height, self.created_ms = RECORDING_HEADER.unpack(raw)
+        self.frame_shape = (height, width)
+        self.dtype = recording_dtype(self.max_hands)
+        # A torn trailing record (crash during capture) is ignored
+        count = (os.path.getsize(path) - RECORDING_HEADER.size) // self.dtype.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=self.dtype, mode="r",
+                                     offset=RECORDING_HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+        self.timestamps_ms = self.records["timestamp_ms"]
+        self.hands = self.records["hands"]
+        self.handedness_codes = self.records["handedness"]
+        self.scores = self.records["scores"]
+        self.landmarks = self.records["landmarks"]
+
+    def __len__(self):
+        return len(self.records)
+
+    def frame(self, index: int) -> np.ndarray:
+        """(hands, 21, 3) landmarks of one frame, like HandTracker.get_landmark_array()"""
+        return self.landmarks[index, :self.hands[index]]
+
+    def handedness(self, index: int) -> List[Tuple[Optional[str], float]]:
+        return [(HANDEDNESS_LABELS[code], float(score)) for code, score in
+                zip(self.handedness_codes[index, :self.hands[index]], self.scores[index, :self.hands[index]])]
+
+    def duration_s(self) -> float:
+        return (int(self.timestamps_ms[-1]) - int(self.timestamps_ms[0])) / 1000.0 if len(self) else 0.0
+
+    def close(self):
+        """Drop this recording's references to the mapping
+
+        The file is unmapped once the last view is gone, so arrays returned
+        by frame() stay valid after close().
+        """
+        self.timestamps_ms = self.hands = self.handedness_codes = self.scores = self.landmarks = None
+        self.records = None
+
+
+def _offline_frame_record(source: str, index: int, timestamp_ms: int, landmarks: np.ndarray,
+                          handedness, processor, recognized: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                          frame_shape: Optional[Tuple[int, ...]] = None) -> dict:
+    """Advance processor by one frame on its own timestamp and build the JSON Lines record"""
+    action = processor.process_frame(landmarks, handedness, timestamp=timestamp_ms / 1000.0,
+                                     recognized=recognized, frame_shape=frame_shape)
+    if action == "SPEAK_NOW":
+        # No audio offline: record the utterance and reset like the live loop
+        spoken = processor.accumulated_text.strip()
+        processor.clear()
+    else:
+        spoken = None
+    record = {
+        "type": "frame",
+        "source": source,
+        "frame": index,
+        "timestamp_ms": timestamp_ms,
+        "hands": int(len(landmarks)),
+        "gesture": processor.detected,
+        "current": processor.get_current_letter() or None,
+        "action": action,
+        "text": processor.accumulated_text,
+    }
+    if len(landmarks) > 1:
+        record["tracks"] = processor.hand_ids
+    if spoken is not None:
+        record["spoken"] = spoken
+    if action == "WORD_ADDED":
+        record["word"] = processor.last_gesture
+    return record
+
+
+def replay_recording(path: str, out, realtime: bool = False, speed: float = 1.0,
+                     processor_options: Optional[dict] = None) -> dict:
+    """Run recognition over a landmark recording without camera or model
+
+    Without a landmark filter or hysteresis, gestures for all hands of all
+    frames are computed in one vectorized pass; the processor then steps
+    through them on the recorded timestamps, as fast as possible or
+    (realtime) paced like the original session at speed x.
+    Writes the same JSON Lines records as --batch and returns the summary.
+    """
+    recording = LandmarkRecording(path)
+    processor = SignLanguageProcessor(**(processor_options or {}))
+    start = time.perf_counter()
+    try:
+        # Without a landmark filter or hysteresis, frames don't depend on each other
+        batched = processor.stateless_recognition
+        gestures = np.full((len(recording), recording.max_hands), None, dtype=object)
+        masks = np.zeros((len(recording), recording.max_hands), dtype=np.int64)
+        present = np.arange(recording.max_hands) < recording.hands[:, None]
+        if batched and present.any():
+            gestures[present], masks[present] = recognize_hands(recording.landmarks[present])
+
+        timestamps = recording.timestamps_ms.tolist()
+        hands = recording.hands.tolist()
+        for index, timestamp_ms in enumerate(timestamps):
+            if realtime:
+                due = start + (timestamp_ms - timestamps[0]) / 1000.0 / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            count = hands[index]
+            record = _offline_frame_record(path, index, timestamp_ms, recording.frame(index),
+                                           recording.handedness(index), processor,
+                                           (gestures[index, :count], masks[index, :count]) if batched else None,
+                                           frame_shape=recording.frame_shape)
+            out.write(json.dumps(record) + "\n")
+        frames = len(recording)
+        recorded_s = recording.duration_s()
+    finally:
+        recording.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "type": "summary",
+        "source": path,
+        "frames": frames,
+        "hands_detected": int(sum(1 for n in hands if n)),
+        "text": processor.accumulated_text,
+        "flips": processor.flip_stats(),
+        "commits": processor.commit_stats(),
+        "recorded_s": round(recorded_s, 3),
+        "elapsed_s": round(elapsed, 3),
+        "fps": round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+    out.write(json.dumps(summary) + "\n")
+    return summary
+
+
+def run_replay(paths: List[str], output: Optional[str] = None, realtime: bool = False,
+               speed: float = 1.0, processor_options: Optional[dict] = None):
+    """Replay landmark recordings through recognition, like run_batch but without inference"""
+    out = open(output, "w", encoding="utf-8") if output else sys.stdout
+    total_frames = 0
+    total_recorded = 0.0
+    start = time.perf_counter()
+    try:
+        for path in paths:
+            try:
+                summary = replay_recording(path, out, realtime=realtime, speed=speed,
+                                           processor_options=processor_options)
+            except (OSError, ValueError) as e:
+                print(f"❌ {path}: {e}", file=sys.stderr)
+                continue
+            total_frames += summary["frames"]
+            total_recorded += summary["recorded_s"]
+            print(f"✓ {path}: {summary['frames']} frames ({summary['recorded_s']:.1f}s recorded) "
+                  f"@ {summary['fps']} fps -> '{summary['text']}'", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"📊 {len(paths)} recordings, {total_frames} frames / {total_recorded:.1f}s of sessions "
+          f"replayed in {elapsed:.2f}s", file=sys.stderr)
+
+
+def make_synthetic_hands(count: int, seed: int = 0) -> np.ndarray:
+    """Deterministic (count, 21, 3) normalized hands covering all 32 finger patterns"""
+    rng = np.random.default_rng(seed)
+    hands = np.zeros((count, NUM_LANDMARKS, 3), dtype=np.float32)
+    base_x = np.array([0.42, 0.46, 0.50, 0.54, 0.58])
+    for n in range(count):
+        pattern = n % 32
+        hand = hands[n]
+        hand[0] = (0.50, 0.85, 0.0)
+        for finger in range(5):
+            up = bool(pattern & (1 << finger))
+            joints = range(1 + 4 * finger, 5 + 4 * finger)
+            for k, idx in enumerate(joints):
+                if finger == 0:
+                    # Thumb extends sideways when up, folds back towards the palm when down
+                    offset = 0.04 * (k + 1) if up else 0.04 * (2 - abs(k - 1.5))
+                    hand[idx] = (base_x[0] - offset, 0.75, -0.01 * k)
+                else:
+                    y = 0.70 - 0.05 * k if up else 0.70 - 0.05 * min(k, 1) + 0.03 * max(k - 1, 0)
+                    hand[idx] = (base_x[finger], y, -0.01 * k)
+        hand += rng.normal(0.0, 0.003, hand.shape).astype(np.float32)
+    return hands
+
+
+def _time_stage(fn, iterations: int, warmup: int) -> dict:
+    """Time fn() per call and summarize as p50/p99 latency and ops/s"""
+    for _ in range(warmup):
+        fn()
+    samples = np.empty(iterations, dtype=np.float64)
+    clock = time.perf_counter_ns
+    for i in range(iterations):
+        t0 = clock()
+        fn()
+        samples[i] = clock() - t0
+    samples /= 1000.0  # ns -> us
+    mean_us = float(samples.mean())
+    return {
+        "iterations": iterations,
+        "p50_us": round(float(np.percentile(samples, 50)), 3),
+        "p99_us": round(float(np.percentile(samples, 99)), 3),
+        "mean_us": round(mean_us, 3),
+        "ops_per_s": round(1e6 / mean_us, 1) if mean_us > 0 else None,
+        "alloc_bytes": _allocations_per_call(fn),
+    }
+
+
+def _allocations_per_call(fn, calls: int = 20) -> Optional[int]:
+    """Median peak bytes allocated by one fn() call (tracemalloc, run separately from timing)"""
+    import tracemalloc
+    if tracemalloc.is_tracing():
+        return None
+    tracemalloc.start()
+    try:
+        peaks = []
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            fn()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return int(np.median(peaks))
+
+
+def run_benchmarks(iterations: int = 500, warmup: int = 50, seed: int = 0,
+                   fixtures: Optional[str] = None, width: int = 960, height: int = 540,
+                   include_inference: bool = True) -> dict:
+    """Benchmark each pipeline stage offline against synthetic frames and landmark fixtures"""
+    import tempfile
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    hands = np.load(fixtures).astype(np.float32) if fixtures else make_synthetic_hands(256, seed)
+    # Stand-ins for MediaPipe NormalizedLandmark objects
+    mp_hands = [[types.SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in hand]
+                for hand in hands.tolist()]
+    gestures = [recognize_asl_letter(hand, get_gesture_table()) for hand in hands]
+    stages = {}
+
+    def cycle(items):
+        state = {"i": 0}
+
+        def nxt():
+            item = items[state["i"] % len(items)]
+            state["i"] += 1
+            return item
+        return nxt
+
+    stages["preprocess"] = _time_stage(lambda: preprocess_frame(frame), iterations, warmup)
+    frame_buffers = FramePreprocessor()
+    stages["preprocess_buffered"] = _time_stage(
+        lambda: frame_buffers.to_rgb(frame_buffers.mirror(frame)), iterations, warmup)
+
+    if include_inference:
+        try:
+            tracker = HandTracker(max_num_hands=1)
+        except Exception as e:
+            stages["inference"] = {"skipped": f"landmarker unavailable: {e}"}
+        else:
+            image_rgb = preprocess_frame(frame)
+            mp_image = tracker._mp_image(image_rgb)
+            ts = {"ms": 0}
+
+            def infer():
+                ts["ms"] += 33
+                tracker.landmarker.detect_for_video(mp_image, ts["ms"])
+            stages["inference"] = _time_stage(infer, max(iterations // 10, 10), min(warmup, 5))
+            tracker.close()
+
+    buffer = LandmarkBuffer(max_num_hands=1)
+    next_mp_hand = cycle(mp_hands)
+
+    def landmarks_stage():
+        buffer.fill([next_mp_hand()], frame.shape)
+        buffer.to_tuples()
+    stages["get_hands_landmarks"] = _time_stage(landmarks_stage, iterations, warmup)
+
+    next_hand = cycle(list(hands))
+    stages["recognize_asl_letter"] = _time_stage(
+        lambda: recognize_asl_letter(next_hand(), get_gesture_table()), iterations, warmup)
+
+    # Learned classifiers, trained on the fixtures labelled by the rule table
+    labelled = [i for i, g in enumerate(gestures) if g is not None]
+    if labelled:
+        for kind in LandmarkClassifier.KINDS:
+            model = LandmarkClassifier.train(hands[labelled], [gestures[i] for i in labelled], kind=kind)
+            stages[f"classify_{kind}"] = _time_stage(
+                lambda model=model: model.predict_one(next_hand()), iterations, warmup)
+
+    # Word templates: the fixtures, moved along a few synthetic wrist paths, make up the library
+    steps = np.linspace(0.0, 1.0, 30)[:, None]
+    paths = [np.hstack([0.1 * np.cos(2 * np.pi * f * steps + p), 0.1 * np.sin(2 * np.pi * f * steps + p)])
+             for f in (0.5, 1.0, 1.5) for p in (0.0, 2.0, 4.0)]
+    takes = [(steps[:, 0] * (0.6 + 0.1 * (i % 9)), hands[i % len(hands)] + np.pad(path, ((0, 0), (0, 1)))[:, None])
+             for i, path in enumerate(paths * 30)]
+    library = WordTemplateLibrary.build([f"WORD:W{i % 90}" for i in range(len(takes))], takes)
+    trajectory = TrajectoryRecognizer(library)
+    next_motion = cycle(np.concatenate([h for _, h in takes[:20]]))
+    motion_clock = {"t": 0.0}
+
+    def trajectory_stage():
+        motion_clock["t"] += 1 / 30
+        trajectory.update(next_motion(), motion_clock["t"])
+    stages["trajectory_update"] = _time_stage(trajectory_stage, iterations, warmup)
+
+    # Word completion per committed letter, over a random 100k-word lexicon
+    rng = np.random.default_rng(seed)
+    alphabet = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    words = ["".join(rng.choice(alphabet, int(n))) for n in rng.integers(2, 12, 100_000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        lexicon = Lexicon.build(words, os.path.join(tmp, "bench.lex"))
+        spelled = cycle([(word[:i - 1], word[i - 1]) for word in words[:200] for i in range(1, len(word) + 1)])
+        nodes = {}
+
+        def keystroke_stage():
+            prefix, letter = spelled()
+            node = lexicon.step(nodes.get(prefix, 0), letter)
+            nodes[prefix + letter] = node
+            lexicon.completions(node)
+        stages["lexicon_keystroke"] = _time_stage(keystroke_stage, iterations, warmup)
+        lexicon.close()
+
+    processor = SignLanguageProcessor()
+    next_gesture = cycle(gestures)
+    clock = {"t": 0.0}
+
+    def detection_stage():
+        clock["t"] += 1 / 30
+        processor.process_detection(next_gesture(), timestamp=clock["t"])
+    stages["process_detection"] = _time_stage(detection_stage, iterations, warmup)
+
+    # Whole-frame recognition (tracks, batched letters, two-handed lookup) with one vs two hands
+    for count in (1, 2):
+        frame_processor = SignLanguageProcessor()
+        sides = [("Left", 0.9), ("Right", 0.9)][:count]
+        offsets = np.array([[-0.25, 0.0, 0.0], [0.25, 0.0, 0.0]], dtype=np.float32)[:count, None]
+        next_frame = cycle([hands[i:i + count] * 0.5 + 0.25 + offsets for i in range(len(hands) - 1)])
+        frame_clock = {"t": 0.0}
+
+        def frame_stage(processor=frame_processor, sides=sides, next_frame=next_frame, clock=frame_clock):
+            clock["t"] += 1 / 30
+            processor.process_frame(next_frame(), sides, timestamp=clock["t"])
+        stages[f"process_frame_{count}_hand{'s' if count > 1 else ''}"] = _time_stage(frame_stage, iterations, warmup)
+
+    # Per-track landmark smoothing of two hands on its own
+    for kind in ("one-euro", "kalman"):
+        landmark_filter = LandmarkFilter(kind)
+        next_pair = cycle([hands[i:i + 2] for i in range(len(hands) - 1)])
+        filter_clock = {"t": 0.0}
+
+        def filter_stage(landmark_filter=landmark_filter, next_pair=next_pair, clock=filter_clock):
+            clock["t"] += 1 / 30
+            landmark_filter.apply(next_pair(), [0, 1], clock["t"])
+        stages[f"filter_{kind.replace('-', '_')}"] = _time_stage(filter_stage, iterations, warmup)
+
+    canvas = frame.copy()
+    hud = HUDRenderer()
+    next_hand_batch = cycle([hands[i:i + 1] for i in range(len(hands))])
+    stages["draw_landmarks"] = _time_stage(
+        lambda: draw_hand_landmarks(canvas, next_hand_batch()), iterations, warmup)
+
+    stages["hud"] = _time_stage(
+        lambda: hud.render(canvas, True, "HELLO WORLD", "A", 0.5, 30.0, 1000, 95),
+        iterations, warmup)
+
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "platform": sys.platform,
+            "frame_size": [width, height],
+            "iterations": iterations,
+            "seed": seed,
+            "fixtures": fixtures or "synthetic",
+        },
+        "stages": stages,
+    }
+
+
+def compare_benchmarks(current: dict, baseline: dict, threshold: float = 0.10) -> List[str]:
+    """Print a p50/p99 comparison against a baseline; return stages that regressed past threshold"""
+    regressions = []
+    print(f"{'stage':<22}{'p50 base':>12}{'p50 now':>12}{'change':>10}{'p99 now':>12}")
+    for name, now in current["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if "p50_us" not in now or not base or "p50_us" not in base:
+            print(f"{name:<22}{'-':>12}{now.get('p50_us', '-'):>12}{'n/a':>10}{now.get('p99_us', '-'):>12}")
+            continue
+        change = (now["p50_us"] - base["p50_us"]) / base["p50_us"] if base["p50_us"] else 0.0
+        flag = " ⚠️" if change > threshold else ""
+        print(f"{name:<22}{base['p50_us']:>12.1f}{now['p50_us']:>12.1f}{change:>+10.1%}{now['p99_us']:>12.1f}{flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+class TrackerPool:
+    """Bounded pool of IMAGE-mode HandTrackers shared by all server sessions
+
+    Trackers are stateless between frames (static_image_mode), so any free
+    instance can serve any session; callers block until one is free.
+    """
+
+    def __init__(self, size: int = 2, max_num_hands: int = 2):
+        self.size = size
+        self._free = queue.Queue()
+        for _ in range(size):
+            self._free.put(HandTracker(static_image_mode=True, max_num_hands=max_num_hands))
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_ms = deque(maxlen=1000)
+
+    @contextlib.contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """Borrow a tracker; raises queue.Empty if none frees up within timeout"""
+        start = time.perf_counter()
+        try:
+            tracker = self._free.get(timeout=timeout)
+        except queue.Empty:
+            self.timeouts += 1
+            raise
+        self.wait_ms.append((time.perf_counter() - start) * 1000.0)
+        self.acquired += 1
+        try:
+            yield tracker
+        finally:
+            self._free.put(tracker)
+
+    def stats(self) -> dict:
+        waits = sorted(self.wait_ms)
+        return {
+            "size": self.size,
+            "busy": self.size - self._free.qsize(),
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "wait_p50_ms": round(waits[len(waits) // 2], 3) if waits else None,
+            "wait_max_ms": round(waits[-1], 3) if waits else None,
+        }
+
+    def close(self):
+        for _ in range(self.size):
+            self._free.get().close()
+
+
+class RecognitionSession:
+    """Recognition state of one server client (one kiosk / camera)
+
+    Each session has its own SignLanguageProcessor and clock. Frames may
+    carry the client's capture timestamp_ms; otherwise the server's receive
+    time (relative to session start) is used. Timestamps are forced to be
+    increasing so holds never run backwards.
+    """
+
+    def __init__(self, session_id: str, processor_options: Optional[dict] = None):
+        self.session_id = session_id
+        self.processor = SignLanguageProcessor(**(processor_options or {}))
+        self.lock = threading.Lock()  # Frames of one session are handled in order
+        self.started = time.perf_counter()
+        self.last_seen = self.started
+        self.frames = 0
+        self._last_ms = -1
+
+    def handle(self, landmarks: np.ndarray, timestamp_ms: Optional[int] = None,
+               handedness: Optional[List[Tuple[Optional[str], float]]] = None,
+               frame_shape: Optional[Tuple[int, ...]] = None) -> dict:
+        """Feed one frame's (hands, 21, 3) landmarks (and their handedness and
+        image shape) and return the resulting event"""
+        with self.lock:
+            now = time.perf_counter()
+            self.last_seen = now
+            if timestamp_ms is None:
+                timestamp_ms = int((now - self.started) * 1000)
+            timestamp_ms = max(int(timestamp_ms), self._last_ms + 1)
+            self._last_ms = timestamp_ms
+
+            timestamp = timestamp_ms / 1000.0
+            processor = self.processor
+            action = processor.process_frame(landmarks, handedness, timestamp=timestamp, frame_shape=frame_shape)
+            event = {
+                "type": "frame",
+                "session": self.session_id,
+                "frame": self.frames,
+                "timestamp_ms": timestamp_ms,
+                "hands": int(len(landmarks)),
+                "tracks": processor.hand_ids,
+                "gesture": processor.detected,
+                "current": processor.get_current_letter() or None,
+                "progress": round(processor.get_hold_progress(timestamp), 3),
+                "action": action,
+                "text": processor.accumulated_text,
+            }
+            if action == "SPEAK_NOW":
+                # Speech happens on the client: hand it the utterance and reset
+                event["spoken"] = processor.accumulated_text.strip()
+                processor.clear()
+            elif action == "WORD_ADDED":
+                event["word"] = processor.last_gesture
+            if processor.lexicon is not None:
+                event["completions"] = processor.completions()
+            self.frames += 1
+            return event
+
+
+class RequestError(Exception):
+    """Client error reported as a JSON error body with an HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class RecognitionServer:
+    """Local HTTP/WebSocket recognition service for several clients
+
+    Clients send JPEG frames (run through a shared TrackerPool) or
+    pre-computed landmark arrays (no inference needed) and receive one
+    gesture/commit event per frame:
+
+        POST   /sessions                      -> {"session": id}
+        POST   /sessions/<id>/frame           JPEG body, ?timestamp_ms=
+        POST   /sessions/<id>/landmarks       JSON {"landmarks", "handedness", "timestamp_ms"} or
+                                              raw float32 (hands, 21, 3) bytes
+        DELETE /sessions/<id>
+        GET    /stats
+        GET    /ws[?session=id]               WebSocket: binary messages are JPEG frames,
+                                              text messages are landmark JSON; every
+                                              message is answered with its event
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, pool_size: int = 2,
+                 max_sessions: int = 64, session_timeout: float = 300.0,
+                 acquire_timeout: float = 5.0, max_body_bytes: int = 8 * 1024 * 1024,
+                 processor_options: Optional[dict] = None, pool: Optional[TrackerPool] = None,
+                 max_num_hands: int = 2):
+        self.pool_size = pool_size
+        self.max_num_hands = max_num_hands
+        self._pool = pool
+        self._pool_lock = threading.Lock()
+        self.max_sessions = max_sessions
+        self.session_timeout = session_timeout
+        self.acquire_timeout = acquire_timeout
+        self.max_body_bytes = max_body_bytes
+        self.processor_options = processor_options
+        self.sessions = {}
+        self._sessions_lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.latency_ms = deque(maxlen=1000)
+        import http.server
+        self.httpd = http.server.ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.httpd.server_address[:2]
+
+    @property
+    def pool(self) -> TrackerPool:
+        # Created on the first JPEG frame: landmark-only clients never load the model
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = TrackerPool(self.pool_size, max_num_hands=self.max_num_hands)
+            return self._pool
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._pool is not None:
+            self._pool.close()
+
+    # --- Sessions ---------------------------------------------------------
+
+    def create_session(self, session_id: Optional[str] = None) -> RecognitionSession:
+        now = time.perf_counter()
+        with self._sessions_lock:
+            for sid in [sid for sid, s in self.sessions.items()
+                        if now - s.last_seen > self.session_timeout]:
+                del self.sessions[sid]
+            if session_id in self.sessions:
+                return self.sessions[session_id]
+            if len(self.sessions) >= self.max_sessions:
+                raise RequestError(503, "too many sessions")
+            session_id = session_id or os.urandom(8).hex()
+            session = self.sessions[session_id] = RecognitionSession(session_id, self.processor_options)
+            return session
+
+    def get_session(self, session_id: str) -> RecognitionSession:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise RequestError(404, f"unknown session '{session_id}'")
+        return session
+
+    def delete_session(self, session_id: str) -> dict:
+        with self._sessions_lock:
+            session = self.sessions.pop(session_id, None)
+        if session is None:
+            raise RequestError(404, f"unknown session '{session_id}'")
+        return {"session": session_id, "frames": session.frames,
+                "text": session.processor.accumulated_text}
+
+    # --- Frame handling ---------------------------------------------------
+
+    def landmarks_from_jpeg(self, data: bytes) -> Tuple[np.ndarray, List[Tuple[Optional[str], float]], Tuple[int, ...]]:
+        frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise RequestError(400, "body is not a decodable image")
+        try:
+            with self.pool.acquire(timeout=self.acquire_timeout) as tracker:
+                tracker.process(frame)
+                # Copy: the tracker goes back to the pool
+                return tracker.get_landmark_array().copy(), tracker.get_handedness(), frame.shape
+        except queue.Empty:
+            raise RequestError(503, "all trackers busy")
+
+    @staticmethod
+    def landmarks_from_payload(data, binary: bool) -> Tuple[np.ndarray, Optional[list], Optional[int], Optional[list]]:
+        """Parse raw float32 bytes or a JSON {"landmarks", "handedness", "timestamp_ms", "frame_shape"} body
+
+        handedness is optional, one "Left"/"Right" (or [label, score]) per hand;
+        so is frame_shape, the [height, width] the landmarks are normalized to.
+        """
+        timestamp_ms = None
+        handedness = None
+        frame_shape = None
+        try:
+            if binary:
+                landmarks = np.frombuffer(data, dtype=np.float32)
+            else:
+                payload = json.loads(data)
+                timestamp_ms = payload.get("timestamp_ms")
+                if payload.get("frame_shape") is not None:
+                    frame_shape = [int(v) for v in payload["frame_shape"][:2]]
+                landmarks = np.asarray(payload.get("landmarks", []), dtype=np.float32)
+                if payload.get("handedness") is not None:
+                    handedness = [(h, 1.0) if isinstance(h, str) else (str(h[0]), float(h[1]))
+                                  for h in payload["handedness"]]
+            landmarks = landmarks.reshape(-1, NUM_LANDMARKS, 3)
+        except (ValueError, TypeError, AttributeError, IndexError) as e:
+            raise RequestError(400, f"bad landmarks: {e}")
+        return landmarks, handedness, timestamp_ms, frame_shape
+
+    def handle_frame(self, session: RecognitionSession, kind: str, data: bytes,
+                     timestamp_ms: Optional[int] = None, binary: bool = False) -> dict:
+        start = time.perf_counter()
+        self.requests += 1
+        if kind == "frame":
+            landmarks, handedness, frame_shape = self.landmarks_from_jpeg(data)
+        else:
+            landmarks, handedness, payload_ms, frame_shape = self.landmarks_from_payload(data, binary)
+            timestamp_ms = payload_ms if payload_ms is not None else timestamp_ms
+        event = session.handle(landmarks, timestamp_ms, handedness, frame_shape)
+        self.latency_ms.append((time.perf_counter() - start) * 1000.0)
+        return event
+
+    def stats(self) -> dict:
+        latencies = sorted(self.latency_ms)
+        return {
+            "sessions": len(self.sessions),
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_p50_ms": round(latencies[len(latencies) // 2], 3) if latencies else None,
+            "latency_p99_ms": round(latencies[int(len(latencies) * 0.99)], 3) if latencies else None,
+            "pool": self._pool.stats() if self._pool is not None else None,
+        }
+
+    def _handler_class(self):
+        import http.server
+        server = self
+
+        class Handler(_RecognitionRequestHandler, http.server.BaseHTTPRequestHandler):
+            recognition = server
+        return Handler
+
+
+class _RecognitionRequestHandler:
+    """Request handling for RecognitionServer, mixed into http.server's
+    BaseHTTPRequestHandler by RecognitionServer._handler_class"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so clients reuse one connection
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+    recognition = None  # RecognitionServer, set by RecognitionServer._handler_class
+
+    def log_message(self, format, *args):
+        pass  # One line per frame would swamp the console
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> bytes:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise RequestError(400, "invalid Content-Length")
+        if length < 0:
+            raise RequestError(400, "invalid Content-Length")  # rfile.read(-1) would wait for EOF
+        if length > self.recognition.max_body_bytes:
+            raise RequestError(413, "body too large")
+        return self.rfile.read(length)
+
+    def _route(self, method: str):
+        url = urllib.parse.urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = urllib.parse.parse_qs(url.query)
+        server = self.recognition
+        try:
+            if method == "GET" and parts == ["stats"]:
+                return self._send_json(200, server.stats())
+            if method == "GET" and parts == ["ws"]:
+                return self._websocket(query.get("session", [None])[0])
+            if method == "POST" and parts == ["sessions"]:
+                self._read_body()
+                return self._send_json(201, {"session": server.create_session().session_id})
+            if len(parts) == 2 and parts[0] == "sessions" and method == "DELETE":
+                return self._send_json(200, server.delete_session(parts[1]))
+            if len(parts) == 3 and parts[0] == "sessions" and method == "POST" \
+                    and parts[2] in ("frame", "landmarks"):
+                body = self._read_body()
+                timestamp_ms = query.get("timestamp_ms", [None])[0]
+                binary = self.headers.get("Content-Type", "") == "application/octet-stream"
+                event = server.handle_frame(server.get_session(parts[1]), parts[2], body,
+                                            int(timestamp_ms) if timestamp_ms else None, binary)
+                return self._send_json(200, event)
+            raise RequestError(404, f"no route for {method} {url.path}")
+        except RequestError as e:
+            server.errors += 1
+            self._send_json(e.status, {"error": str(e)})
+        except ValueError as e:
+            server.errors += 1
+            self._send_json(400, {"error": str(e)})
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+    # --- Minimal RFC 6455 WebSocket (no extensions) --------------------------
+
+    def _websocket(self, session_id: Optional[str]):
+        key = self.headers.get("Sec-WebSocket-Key")
+        if self.headers.get("Upgrade", "").lower() != "websocket" or not key:
+            raise RequestError(400, "expected a WebSocket upgrade")
+        session = self.recognition.create_session(session_id)
+        import base64
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.close_connection = True
+        self._ws_send(json.dumps({"type": "session", "session": session.session_id}))
+
+        message, opcode = [], None
+        while True:
+            frame = self._ws_read_frame()
+            if frame is None:
+                return
+            fin, op, payload = frame
+            if op == 0x8:  # Close
+                self._ws_send(payload[:2], opcode=0x8)
+                return
+            if op == 0x9:  # Ping
+                self._ws_send(payload, opcode=0xA)
+                continue
+            if op == 0xA:
+                continue
+            if op != 0x0:
+                message, opcode = [], op
+            message.append(payload)
+            if not fin:
+                continue
+            data = b"".join(message)
+            try:
+                kind = "frame" if opcode == 0x2 else "landmarks"
+                event = self.recognition.handle_frame(session, kind, data)
+            except RequestError as e:
+                self.recognition.errors += 1
+                event = {"type": "error", "status": e.status, "error": str(e)}
+            self._ws_send(json.dumps(event))
+
+    def _ws_read_frame(self):
+        header = self.rfile.read(2)
+        if len(header) < 2:
+            return None
+        fin, opcode = header[0] & 0x80, header[0] & 0x0F
+        length = header[1] & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", self.rfile.read(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", self.rfile.read(8))[0]
+        if length > self.recognition.max_body_bytes:
+            return None
+        mask = self.rfile.read(4) if header[1] & 0x80 else None
+        payload = self.rfile.read(length)
+        if mask:
+            # Unmask with one vectorized XOR instead of a per-byte loop
+            data = np.frombuffer(payload, dtype=np.uint8)
+            payload = (data ^ np.resize(np.frombuffer(mask, dtype=np.uint8), length)).tobytes()
+        return bool(fin), opcode, payload
+
+    def _ws_send(self, data, opcode: int = 0x1):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        length = len(data)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 65536:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        self.wfile.write(header + data)
+        self.wfile.flush()
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8765, pool_size: int = 2,
+               processor_options: Optional[dict] = None, session_timeout: float = 300.0,
+               max_num_hands: int = 2):
+    """Serve recognition to local clients until interrupted"""
+    server = RecognitionServer(host, port, pool_size=pool_size, session_timeout=session_timeout,
+                               processor_options=processor_options, max_num_hands=max_num_hands)
+    host, port = server.address
+    print(f"🌐 Recognition server on http://{host}:{port} (WebSocket: ws://{host}:{port}/ws), "
+          f"{pool_size} landmarker sessions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats = server.stats()
+        server.close()
+        print(f"📊 {stats['requests']} frames from {stats['sessions']} sessions, "
+              f"p50 {stats['latency_p50_ms']} ms / p99 {stats['latency_p99_ms']} ms, "
+              f"{stats['errors']} errors")
+
+
+def _load_client(url: str, duration: float, fps: float, payloads: List[Tuple[str, bytes, str]],
+                 latencies: List[float], counts: dict, barrier: threading.Barrier):
+    """One load-generator client: own session, own keep-alive connection"""
+    # counts is this client's own dict, so no locking is needed
+    import http.client
+    parts = urllib.parse.urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    try:
+        conn.request("POST", "/sessions", body=b"")
+        response = conn.getresponse()
+        session_id = json.loads(response.read())["session"]
+        barrier.wait()
+        interval = 1.0 / fps if fps > 0 else 0.0
+        start = time.perf_counter()
+        next_send = start
+        index = 0
+        while time.perf_counter() - start < duration:
+            kind, body, content_type = payloads[index % len(payloads)]
+            sent = time.perf_counter()
+            conn.request("POST", f"/sessions/{session_id}/{kind}", body=body,
+                         headers={"Content-Type": content_type})
+            response = conn.getresponse()
+            response.read()
+            latencies.append((time.perf_counter() - sent) * 1000.0)
+            counts["ok" if response.status == 200 else "errors"] += 1
+            index += 1
+            if interval:
+                next_send += interval
+                time.sleep(max(0.0, next_send - time.perf_counter()))
+        conn.request("DELETE", f"/sessions/{session_id}")
+        conn.getresponse().read()
+    except (OSError, http.client.HTTPException, threading.BrokenBarrierError) as e:
+        counts["errors"] += 1
+        print(f"❌ Load client: {e}", file=sys.stderr)
+    finally:
+        conn.close()
+
+
+def run_load_test(url: str, clients: int = 4, duration: float = 10.0, fps: float = 30.0,
+                  source: Optional[str] = None, seed: int = 0) -> dict:
+    """Drive a running server with simulated kiosks and report throughput/latency
+
+    With source (video file or image directory) clients post JPEG frames, so
+    the landmarker pool is exercised; otherwise they post synthetic landmark
+    arrays, which measures the server and recognition overhead alone.
+    fps <= 0 sends as fast as the server answers.
+    """
+    if source:
+        payloads = [("frame", cv2.imencode(".jpg", frame)[1].tobytes(), "image/jpeg")
+                    for _, _, frame in itertools.islice(iter_source_frames(source), 300)]
+        if not payloads:
+            raise IOError(f"No frames in '{source}'")
+    else:
+        payloads = [("landmarks", hand[None].tobytes(), "application/octet-stream")
+                    for hand in make_synthetic_hands(256, seed)]
+
+    latencies = []  # list.append is atomic, shared by all client threads
+    client_counts = [{"ok": 0, "errors": 0} for _ in range(clients)]
+    barrier = threading.Barrier(clients + 1)
+    threads = [threading.Thread(target=_load_client, name=f"load-{i}", daemon=True,
+                                args=(url, duration, fps, payloads, latencies, counts, barrier))
+               for i, counts in enumerate(client_counts)]
+    for thread in threads:
+        thread.start()
+    try:
+        barrier.wait(timeout=30)
+    except threading.BrokenBarrierError:
+        pass
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    counts = {key: sum(c[key] for c in client_counts) for key in ("ok", "errors")}
 
-Usage:
-    1. Run the script
-    2. Allow webcam access
-    3. Make ASL signs in front of the camera
-    4. Hold gestures for required duration
-    5. Press 'q' to quit, 'c' to clear text
-"""
+    samples = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        "url": url,
+        "clients": clients,
+        "mode": "frame" if source else "landmarks",
+        "target_fps": fps,
+        "requests": counts["ok"],
+        "errors": counts["errors"],
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(counts["ok"] / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency_p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "latency_p90_ms": round(float(np.percentile(samples, 90)), 3),
+        "latency_p99_ms": round(float(np.percentile(samples, 99)), 3),
+        "latency_max_ms": round(float(samples.max()), 3),
+    }
 
-import cv2
-import time
-import numpy as np
-from collections import deque
-import mediapipe as mp
-from typing import List, Tuple, Optional
-import pyttsx3
-import threading
-import os
-import urllib.request
 
+class SharedFrameRing:
+    """Fixed ring of frame slots in shared memory, handed between processes by slot index
 
-class HandTracker:
-    """MediaPipe hand tracking wrapper using tasks API"""
-    
-    def __init__(self, static_image_mode: bool = False, max_num_hands: int = 2,
-                 min_detection_confidence: float = 0.3, min_tracking_confidence: float = 0.3):
-        # Download model file if not exists
-        model_path = 'hand_landmarker.task'
-        if not os.path.exists(model_path):
-            print("Downloading hand landmarker model...")
-            url = 'https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task'
-            urllib.request.urlretrieve(url, model_path)
-            print("Model downloaded successfully!")
-        
-        # Create hand landmarker
-        from mediapipe.tasks import python
-        from mediapipe.tasks.python import vision
-        
-        base_options = python.BaseOptions(model_asset_path=model_path)
-        options = vision.HandLandmarkerOptions(
-            base_options=base_options,
-            running_mode=vision.RunningMode.VIDEO,
-            num_hands=max_num_hands,
-            min_hand_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
-        )
-        self.landmarker = vision.HandLandmarker.create_from_options(options)
-        self.results = None
-        self._last_frame_shape = None
-        self._timestamp_ms = 0
+    Only small (slot, frame_index, timestamp_ms) tuples travel through the
+    queues; pixels are written and read in place, never pickled. The
+    producer takes a free slot, fills it and publishes it; the consumer
+    releases the slot once it no longer needs the pixels.
+    """
 
-    def process(self, frame, return_pixel_landmarks: bool = False):
-        """Process BGR frame and return landmarks"""
-        self._last_frame_shape = frame.shape
-        self._timestamp_ms += 33  # Approximate 30fps
-        
-        # Enhance image for better detection
-        enhanced = cv2.convertScaleAbs(frame, alpha=1.1, beta=10)
-        
-        image_rgb = cv2.cvtColor(enhanced, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
-        
-        self.results = self.landmarker.detect_for_video(mp_image, self._timestamp_ms)
-        
-        if return_pixel_landmarks:
-            return self.get_hands_landmarks()
-        return self.results
+    def __init__(self, shape, slots: int = 4, ctx=None, name: Optional[str] = None,
+                 free=None, ready=None):
+        self.shape = tuple(int(n) for n in shape)
+        self.slots = slots
+        create = name is None
+        import multiprocessing
+        from multiprocessing import shared_memory
+        self.shm = shared_memory.SharedMemory(name=name, create=create,
+                                              size=slots * int(np.prod(self.shape)))
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+        if create:
+            ctx = ctx or multiprocessing.get_context("spawn")
+            free, ready = ctx.Queue(), ctx.Queue()
+            for slot in range(slots):
+                free.put(slot)
+        self.free = free
+        self.ready = ready
+        self._owner = create
 
-    def get_hands_landmarks(self) -> Optional[List[List[Tuple[int, int, int]]]]:
-        """Return landmarks as list of (id, x, y) tuples"""
-        if not self.results or not self.results.hand_landmarks:
+    def __getstate__(self):
+        # Sent to the worker at spawn time: attach by name, share the queues
+        return self.shape, self.slots, self.shm.name, self.free, self.ready
+
+    def __setstate__(self, state):
+        shape, slots, name, free, ready = state
+        self.__init__(shape, slots, name=name, free=free, ready=ready)
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Take a free slot to write into; None if the consumer is still holding all of them"""
+        try:
+            return self.free.get(timeout=timeout) if timeout else self.free.get_nowait()
+        except queue.Empty:
             return None
-        all_hands = []
-        for hand_landmarks in self.results.hand_landmarks:
-            lm_list = []
-            for idx, lm in enumerate(hand_landmarks):
-                h, w, _ = self._last_frame_shape
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                lm_list.append((idx, cx, cy))
-            all_hands.append(lm_list)
-        return all_hands
-
-    def draw_landmarks(self, frame):
-        """Draw hand landmarks on frame"""
-        if not self.results or not self.results.hand_landmarks:
-            return
-        
-        # Define hand connections
-        HAND_CONNECTIONS = [
-            (0, 1), (1, 2), (2, 3), (3, 4),  # Thumb
-            (0, 5), (5, 6), (6, 7), (7, 8),  # Index
-            (0, 9), (9, 10), (10, 11), (11, 12),  # Middle
-            (0, 13), (13, 14), (14, 15), (15, 16),  # Ring
-            (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky
-            (5, 9), (9, 13), (13, 17)  # Palm
-        ]
-        
-        for hand_landmarks in self.results.hand_landmarks:
-            h, w, _ = frame.shape
-            # Draw connections
-            for connection in HAND_CONNECTIONS:
-                start_idx, end_idx = connection
-                start = hand_landmarks[start_idx]
-                end = hand_landmarks[end_idx]
-                start_point = (int(start.x * w), int(start.y * h))
-                end_point = (int(end.x * w), int(end.y * h))
-                cv2.line(frame, start_point, end_point, (0, 255, 0), 2)
-            
-            # Draw landmarks
-            for lm in hand_landmarks:
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                cv2.circle(frame, (cx, cy), 5, (255, 0, 0), -1)
 
-    def close(self):
-        """Cleanup resources"""
-        if self.landmarker:
-            self.landmarker.close()
+    def publish(self, slot: int, frame_index: int, timestamp_ms: int):
+        self.ready.put((slot, frame_index, timestamp_ms))
 
+    def reclaim(self) -> Optional[int]:
+        """Take back the oldest published slot the consumer hasn't picked up yet; None if there is none"""
+        try:
+            return self.ready.get_nowait()[0]
+        except queue.Empty:
+            return None
 
-class TextToSpeechEngine:
-    """Non-blocking text-to-speech engine using pyttsx3"""
-    
-    def __init__(self):
-        self.is_speaking = False
-        self.speech_queue = []
-        
-    def speak(self, text: str):
-        """Speak text in a separate thread to avoid blocking"""
-        if text.strip() and not self.is_speaking:
-            self.is_speaking = True
-            thread = threading.Thread(target=self._speak_thread, args=(text,))
-            thread.daemon = True
-            thread.start()
-    
-    def _speak_thread(self, text):
-        """Internal method to speak in thread"""
+    def finish(self):
+        """Tell the consumer the stream has ended"""
+        self.ready.put((-1, -1, -1))
+
+    def next(self, timeout: float = 0.1):
+        """(slot, frame_index, timestamp_ms) of the next filled slot, or None on timeout"""
         try:
-            # Create fresh engine instance each time to avoid issues
-            engine = pyttsx3.init()
-            
-            # Set voice properties for more natural speech
-            voices = engine.getProperty('voices')
-            # Try to find a better voice (prefer female voices as they're clearer)
-            for voice in voices:
-                if "zira" in voice.name.lower() or "hazel" in voice.name.lower():
-                    engine.setProperty('voice', voice.id)
-                    break
-            
-            engine.setProperty('rate', 140)  # Slightly slower for clarity
-            engine.setProperty('volume', 1.0)
-            
-            # Parse text to speak words naturally
-            words = text.split()
-            speech_text = ' '.join(words)
-            
-            engine.say(speech_text)
-            engine.runAndWait()
-            engine.stop()
-        except Exception as e:
-            print(f"Speech error: {e}")
-        finally:
-            self.is_speaking = False
+            return self.ready.get(timeout=timeout)
+        except queue.Empty:
+            return None
 
+    def release(self, slot: int):
+        self.free.put(slot)
 
-def get_finger_states(hand):
-    """Return finger states: [thumb, index, middle, ring, pinky]"""
-    coords = {lm[0]: (lm[1], lm[2]) for lm in hand}
-    tips = [4, 8, 12, 16, 20]
-    pips = [3, 6, 10, 14, 18]
-    results = []
-    
-    # Thumb
-    if 4 in coords and 3 in coords:
-        thumb_tip_x = coords[4][0]
-        thumb_pip_x = coords[3][0]
-        results.append(abs(thumb_tip_x - coords[0][0]) > abs(thumb_pip_x - coords[0][0]))
-    else:
-        results.append(False)
-    
-    # Other fingers
-    for i in range(1, 5):
-        tip_id, pip_id = tips[i], pips[i]
-        if tip_id in coords and pip_id in coords:
-            results.append(coords[tip_id][1] < coords[pip_id][1])
-        else:
-            results.append(False)
-    
-    return results
+    def close(self):
+        del self.frames  # Drop the view before closing the mapping
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
 
 
-def recognize_asl_letter(hand):
-    """Recognize ASL letter and common words from hand landmarks"""
-    if not hand:
-        return None
-    
-    fingers = get_finger_states(hand)
-    fingers_up = sum(fingers)
-    
-    # Special gestures (actions)
-    if fingers_up == 0:
-        return "SPACE"
-    if fingers_up == 5 and all(fingers):
-        return "SPEAK"
-    if fingers[1] and fingers[2] and not fingers[3] and not fingers[4]:
-        return "DELETE"
-
-    # ASL letter dictionary (key: tuple of finger states)
-    asl_letters = {
-        (True, False, False, False, False): "A",
-        (False, True, True, True, True): "B",
-        (False, True, False, False, False): "D",
-        (False, True, True, False, False): "F",
-        (False, True, True, True, False): "W",
-        (False, False, True, False, False): "M",
-        (False, False, False, True, False): "R",
-        (False, False, False, False, True): "I",
-        (True, True, False, False, False): "L",
-        (True, False, False, False, True): "Y",
-        (False, True, True, True, True): "E",
-        (True, True, True, False, False): "T",
-        (True, True, True, True, True): "U",
-        (False, True, False, True, False): "K",
-        (False, False, True, True, False): "N",
-        (True, False, True, False, False): "C",
-        (True, True, True, True, False): "S",
-        (False, True, False, False, True): "P",
-        (True, True, False, False, True): "Q",
-        (True, False, True, False, True): "Z",
-        (False, True, True, False, True): "X",
-        (True, False, False, True, False): "G",
-        (True, False, True, True, False): "H",
-        (True, True, False, True, False): "O",
-        (True, True, True, False, True): "J",
-    }
-    # Try to match a letter first
-    letter = asl_letters.get(tuple(fingers))
-    if letter:
-        return letter
-
-    # Only check for word gestures if not a letter
-    # Use more complex, multi-finger gestures for words to avoid overlap
-    if fingers[0] and not any(fingers[1:]):
-        # Thumbs up, but not A (A is also thumb only, so skip word)
-        pass
-    if fingers[4] and not any(fingers[:4]):
-        # Pinky only, but not I (I is also pinky only, so skip word)
+def parse_stream_source(source: str):
+    """Device index for digit strings ("0", "1"), else a file path/URL"""
+    return int(source) if source.isdigit() else source
+
+
+def _capture_stream(stream_id: int, cap, first_frame, ring: SharedFrameRing, live: bool,
+                    stop: threading.Event, counters: dict):
+    """Supervisor-side capture thread: decode straight into shared-memory slots
+
+    Live cameras drop frames when the worker is behind: with no free slot the
+    oldest frame still waiting in the ring is taken back and overwritten, so
+    the worker is never handed frames older than the ones it is skipping.
+    Files wait for a free slot so no frame is skipped.
+    """
+    h, w = ring.shape[:2]
+    start = time.perf_counter()
+    pending = first_frame
+    index = 0
+    last_ms = -1
+    try:
+        while not stop.is_set():
+            slot = ring.acquire(timeout=None if live else 0.1)
+            if slot is None and live:
+                slot = ring.reclaim()
+                if slot is not None:
+                    counters["dropped"] += 1  # Its frame is replaced by a newer one
+            if slot is None:
+                if live:
+                    cap.grab()  # Worker holds every slot: keep the camera's own buffer fresh
+                    counters["dropped"] += 1
+                continue
+            view = ring.frames[slot]
+            if pending is not None:
+                frame, pending = pending, None
+                ok = True
+            else:
+                ok, frame = cap.read(view)
+            if not ok:
+                ring.release(slot)
+                break
+            if frame is not view:
+                # Size changed mid-stream or the backend allocated its own buffer
+                if frame.shape == view.shape:
+                    np.copyto(view, frame)
+                else:
+                    cv2.resize(frame, (w, h), dst=view)
+            if live:
+                timestamp_ms = int((time.perf_counter() - start) * 1000)
+            else:
+                timestamp_ms = int(cap.get(cv2.CAP_PROP_POS_MSEC))
+            timestamp_ms = max(timestamp_ms, last_ms + 1)
+            last_ms = timestamp_ms
+            ring.publish(slot, index, timestamp_ms)
+            counters["captured"] += 1
+            index += 1
+    finally:
+        cap.release()
+        ring.finish()
+
+
+def _stream_worker(stream_id: int, source: str, ring: SharedFrameRing, events, mirror: bool,
+                   gestures_path: str, processor_options: Optional[dict],
+                   tracker_options: Optional[dict], classifier_path: Optional[str] = None,
+                   words_path: Optional[str] = None, lexicon_path: Optional[str] = None,
+                   max_num_hands: int = 2, stats_interval: float = 1.0):
+    """Worker process: own HandTracker + SignLanguageProcessor for one stream"""
+    import signal
+    cv2.setNumThreads(1)  # One core per stream; don't oversubscribe
+    # Ctrl+C is handled by the supervisor, which ends each stream cleanly
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    tracker = None
+    frames = 0
+    hand_detect_count = 0
+    latencies = deque(maxlen=300)
+    try:
+        load_gesture_table(gestures_path)
+        load_classifier(classifier_path)
+        load_word_library(words_path)
+        load_lexicon(lexicon_path)
+        tracker = HandTracker(max_num_hands=max_num_hands, **(tracker_options or {}))
+        processor = SignLanguageProcessor(**(processor_options or {}))
+        buffers = FramePreprocessor()
+        start = last_stats = time.perf_counter()
+        while True:
+            item = ring.next(timeout=0.5)
+            if item is None:
+                continue
+            slot, index, timestamp_ms = item
+            if slot < 0:
+                break
+            began = time.perf_counter()
+            frame = ring.frames[slot]
+            if mirror:
+                frame = buffers.mirror(frame)
+                ring.release(slot)  # The mirror is a private copy
+            tracker.process(frame, timestamp_ms=timestamp_ms)
+            if not mirror:
+                ring.release(slot)
+            landmarks = tracker.get_landmark_array()
+            if len(landmarks) > 0:
+                hand_detect_count += 1
+            action = processor.process_frame(landmarks, tracker.get_handedness(),
+                                             timestamp=timestamp_ms / 1000.0, frame_shape=frame.shape)
+            if action:
+                event = {"type": "action", "stream": stream_id, "source": source,
+                         "frame": index, "timestamp_ms": timestamp_ms, "action": action,
+                         "gesture": processor.detected, "text": processor.accumulated_text}
+                if action == "SPEAK_NOW":
+                    event["spoken"] = processor.accumulated_text.strip()
+                    processor.clear()
+                elif action == "WORD_ADDED":
+                    event["word"] = processor.last_gesture
+                events.put(event)
+            frames += 1
+            now = time.perf_counter()
+            latencies.append((now - began) * 1000.0)
+            if now - last_stats >= stats_interval:
+                last_stats = now
+                events.put({"type": "stats", "stream": stream_id, "frames": frames,
+                            "hands": hand_detect_count,
+                            "fps": round(frames / (now - start), 1),
+                            "latency_p50_ms": round(float(np.median(latencies)), 2)})
+        elapsed = time.perf_counter() - start
+        events.put({"type": "summary", "stream": stream_id, "source": source, "frames": frames,
+                    "hands": hand_detect_count, "text": processor.accumulated_text,
+                    "flips": processor.flip_stats(),
+                    "commits": processor.commit_stats(), "elapsed_s": round(elapsed, 3),
+                    "fps": round(frames / elapsed, 2) if elapsed > 0 else 0.0})
+    except Exception as e:
+        events.put({"type": "error", "stream": stream_id, "source": source, "error": repr(e)})
+    finally:
+        if tracker:
+            tracker.close()
+        ring.close()
+
+
+def run_multi_stream(sources: List[str], slots: int = 4, mirror_files: bool = False,
+                     output: Optional[str] = None, duration: Optional[float] = None,
+                     gestures_path: str = DEFAULT_GESTURES_PATH,
+                     processor_options: Optional[dict] = None,
+                     tracker_options: Optional[dict] = None, classifier_path: Optional[str] = None,
+                     words_path: Optional[str] = None, lexicon_path: Optional[str] = None,
+                     max_num_hands: int = 2, stats_interval: float = 5.0):
+    """Recognize several cameras/files at once, one worker process per source
+
+    The supervisor captures every source into its own SharedFrameRing; each
+    worker process runs its own tracker and processor, so streams scale
+    across cores instead of sharing one GIL. Committed actions and periodic
+    per-stream stats come back over one events queue and are printed (and
+    written as JSON Lines to output, if given).
+    """
+    import multiprocessing
+    try:
+        # Resolve (and if needed download) the model once here, not once per worker
+        tracker_options = dict(tracker_options or {}, model_path=resolve_model_path())
+    except (OSError, ValueError) as e:
+        print(f"❌ Hand landmarker model unavailable: {e}")
+        return []
+    ctx = multiprocessing.get_context("spawn")
+    events = ctx.Queue()
+    stop = threading.Event()
+    streams = []
+    for stream_id, source in enumerate(sources):
+        device = parse_stream_source(source)
+        cap = cv2.VideoCapture(device)
+        live = isinstance(device, int)
+        if live:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        ok, first_frame = cap.read() if cap.isOpened() else (False, None)
+        if not ok:
+            print(f"❌ Cannot open stream {stream_id}: {source}")
+            cap.release()
+            continue
+        ring = SharedFrameRing(first_frame.shape, slots, ctx)
+        counters = {"captured": 0, "dropped": 0}
+        process = ctx.Process(target=_stream_worker, name=f"stream-{stream_id}", daemon=True,
+                              args=(stream_id, source, ring, events, live or mirror_files,
+                                    gestures_path, processor_options, tracker_options, classifier_path,
+                                    words_path, lexicon_path, max_num_hands))
+        capture = threading.Thread(target=_capture_stream, name=f"capture-{stream_id}", daemon=True,
+                                   args=(stream_id, cap, first_frame, ring, live, stop, counters))
+        streams.append({"id": stream_id, "source": source, "ring": ring, "process": process,
+                        "capture": capture, "counters": counters, "stats": {}, "summary": None})
+    if not streams:
+        return []
+
+    for stream in streams:
+        stream["process"].start()
+    for stream in streams:
+        stream["capture"].start()
+    print(f"🎥 {len(streams)} streams on {len(streams)} worker processes "
+          f"({os.cpu_count()} cores), {slots} shared-memory slots each")
+
+    out = open(output, "w", encoding="utf-8") if output else None
+    start = last_report = time.perf_counter()
+    by_id = {stream["id"]: stream for stream in streams}
+    try:
+        while any(s["summary"] is None for s in streams):
+            if duration is not None and time.perf_counter() - start >= duration:
+                break
+            try:
+                event = events.get(timeout=0.5)
+            except queue.Empty:
+                if not any(s["process"].is_alive() for s in streams if s["summary"] is None):
+                    break
+                continue
+            stream = by_id[event["stream"]]
+            if out:
+                out.write(json.dumps(event) + "\n")
+            if event["type"] == "action":
+                spoken = f" 🔊 '{event['spoken']}'" if "spoken" in event else ""
+                print(f"[{stream['id']}] {event['action']}: '{event['text']}'{spoken}")
+            elif event["type"] == "stats":
+                stream["stats"] = event
+            elif event["type"] == "summary":
+                stream["summary"] = event
+            elif event["type"] == "error":
+                print(f"❌ Stream {stream['id']} ({stream['source']}): {event['error']}")
+                stream["summary"] = event
+
+            now = time.perf_counter()
+            if now - last_report >= stats_interval:
+                last_report = now
+                for s in streams:
+                    st = s["stats"]
+                    print(f"   [{s['id']}] {st.get('fps', 0.0):6.1f} fps | p50 {st.get('latency_p50_ms', '-')} ms "
+                          f"| captured {s['counters']['captured']} dropped {s['counters']['dropped']}")
+    except KeyboardInterrupt:
         pass
-    # Example: All fingers except thumb and pinky for HELLO
-    if not fingers[0] and fingers[1] and fingers[2] and fingers[3] and not fingers[4]:
-        return "WORD:HELLO"
-    # Thumb + Pinky + Index for LOVE (less likely to overlap)
-    if fingers[0] and fingers[1] and not fingers[2] and not fingers[3] and fingers[4]:
-        return "WORD:LOVE"
-    # Index + Pinky + Middle for THANKYOU
-    if not fingers[0] and fingers[1] and fingers[2] and not fingers[3] and fingers[4]:
-        return "WORD:THANKYOU"
-    # Add more unique word gestures as needed
-    return None
+    finally:
+        stop.set()
+        for stream in streams:
+            stream["capture"].join(timeout=2.0)
+        # Workers exit on the end-of-stream marker; give them time to send their summary
+        deadline = time.perf_counter() + 5.0
+        while any(s["summary"] is None for s in streams) and time.perf_counter() < deadline:
+            try:
+                event = events.get(timeout=0.2)
+            except queue.Empty:
+                if not any(s["process"].is_alive() for s in streams):
+                    break
+                continue
+            if event["type"] in ("summary", "error"):
+                by_id[event["stream"]]["summary"] = event
+            if out:
+                out.write(json.dumps(event) + "\n")
+        for stream in streams:
+            stream["process"].join(timeout=2.0)
+            if stream["process"].is_alive():
+                stream["process"].terminate()
+            stream["ring"].close()
+        if out:
+            out.close()
 
+    elapsed = time.perf_counter() - start
+    summaries = [s["summary"] or {"stream": s["id"], "source": s["source"], "frames": 0, "fps": 0.0}
+                 for s in streams]
+    total_frames = sum(s.get("frames", 0) for s in summaries)
+    print("\n" + "="*60)
+    for stream, summary in zip(streams, summaries):
+        print(f"   [{stream['id']}] {stream['source']}: {summary.get('frames', 0)} frames @ "
+              f"{summary.get('fps', 0.0)} fps, dropped {stream['counters']['dropped']} "
+              f"-> '{summary.get('text', '')}'")
+    print(f"📊 {total_frames} frames in {elapsed:.1f}s "
+          f"({total_frames / elapsed if elapsed > 0 else 0.0:.1f} fps across all streams)")
+    print("="*60)
+    return summaries
 
-class SignLanguageProcessor:
-    """Process sign language and build text with word support"""
-    
-    def __init__(self):
-        self.accumulated_text = ""
-        self.current_letter = None
-        self.letter_hold_time = 0
-        self.letter_confirmed = False
-        self.letter_history = deque(maxlen=10)
-        self.hold_duration = 1.2
-        self.space_hold_duration = 1.8
-        self.speak_hold_duration = 1.8
-        self.word_hold_duration = 1.5
-        
-        # Word mappings for common ASL signs (expanded)
-        self.word_mappings = {
-            "WORD:YES": "yes",
-            "WORD:NO": "no",
-            "WORD:HELLO": "hello",
-            "WORD:LOVE": "love",
-            "WORD:THANKYOU": "thank you",
-            "WORD:PLEASE": "please",
-            "WORD:SORRY": "sorry",
-            "WORD:HELP": "help",
-            "WORD:STOP": "stop",
-            "WORD:GOOD": "good",
-            "WORD:BAD": "bad",
-            "WORD:FRIEND": "friend",
-            "WORD:FOOD": "food",
-            "WORD:WATER": "water",
-            "WORD:WHERE": "where",
-            "WORD:WHO": "who",
-            "WORD:WHAT": "what",
-            "WORD:WHEN": "when",
-            "WORD:WHY": "why",
-            "WORD:HOW": "how",
-            "WORD:MOM": "mom",
-            "WORD:DAD": "dad",
-            "WORD:FAMILY": "family",
-            "WORD:SCHOOL": "school",
-            "WORD:HOME": "home",
-            "WORD:WORK": "work",
-            "WORD:PLAY": "play",
-            "WORD:MORE": "more",
-            "WORD:FINISH": "finish",
-            "WORD:THANK": "thank",
-            "WORD:PLEASE": "please",
-            "WORD:EXCUSE": "excuse",
-            "WORD:DEAF": "deaf",
-            "WORD:HEARING": "hearing",
-            "WORD:TEACHER": "teacher",
-            "WORD:STUDENT": "student"
-        }
-        
-    def process_detection(self, letter):
-        """Process detected letter or word"""
-        current_time = time.time()
-        
-        if letter:
-            self.letter_history.append(letter)
-            
-            if len(self.letter_history) >= 5:
-                most_common = max(set(self.letter_history), key=self.letter_history.count)
-                
-                if most_common != self.current_letter:
-                    self.current_letter = most_common
-                    self.letter_hold_time = current_time
-                    self.letter_confirmed = False
-                
-                elif not self.letter_confirmed:
-                    hold_time = current_time - self.letter_hold_time
-                    
-                    if self.current_letter == "SPACE" and hold_time >= self.space_hold_duration:
-                        if self.accumulated_text and not self.accumulated_text.endswith(" "):
-                            self.accumulated_text += " "
-                        self.letter_confirmed = True
-                        return "SPACE_ADDED"
-                    
-                    elif self.current_letter == "SPEAK" and hold_time >= self.speak_hold_duration:
-                        self.letter_confirmed = True
-                        return "SPEAK_NOW"
-                    
-                    elif self.current_letter == "DELETE" and hold_time >= self.hold_duration:
-                        if self.accumulated_text:
-                            # Delete last word or character
-                            if self.accumulated_text.endswith(" "):
-                                self.accumulated_text = self.accumulated_text[:-1]
-                            else:
-                                parts = self.accumulated_text.rsplit(' ', 1)
-                                if len(parts) > 1:
-                                    self.accumulated_text = parts[0] + " "
-                                else:
-                                    self.accumulated_text = ""
-                        self.letter_confirmed = True
-                        return "DELETED"
-                    
-                    # Handle word gestures
-                    elif self.current_letter.startswith("WORD:") and hold_time >= self.word_hold_duration:
-                        word = self.word_mappings.get(self.current_letter, self.current_letter.replace("WORD:", "").lower())
-                        self.accumulated_text += word + " "
-                        self.letter_confirmed = True
-                        return "WORD_ADDED"
-                    
-                    elif self.current_letter not in ["SPACE", "SPEAK", "DELETE"] and not self.current_letter.startswith("WORD:") and hold_time >= self.hold_duration:
-                        self.accumulated_text += self.current_letter
-                        self.letter_confirmed = True
-                        return "LETTER_ADDED"
-        
-        return None
-    
-    def get_current_letter(self):
-        if self.current_letter and self.current_letter.startswith("WORD:"):
-            word = self.word_mappings.get(self.current_letter, self.current_letter.replace("WORD:", ""))
-            return word.upper()
-        return self.current_letter if self.current_letter else ""
-    
-    def get_hold_progress(self):
-        if not self.current_letter or self.letter_confirmed:
-            return 0
-        hold_time = time.time() - self.letter_hold_time
-        threshold = self.hold_duration
-        if self.current_letter == "SPACE":
-            threshold = self.space_hold_duration
-        elif self.current_letter == "SPEAK":
-            threshold = self.speak_hold_duration
-        elif self.current_letter.startswith("WORD:"):
-            threshold = self.word_hold_duration
-        return min(hold_time / threshold, 1.0)
-    
-    def clear(self):
-        self.accumulated_text = ""
-        self.current_letter = None
-        self.letter_confirmed = False
-        self.letter_history.clear()
 
+def run_sign_language_local(pipelined: bool = False, queue_size: int = 1,
+                            profile: bool = False, metrics_file: Optional[str] = None,
+                            metrics_interval: float = 5.0, processor_options: Optional[dict] = None,
+                            tracker_options: Optional[dict] = None,
+                            tts_policy: str = "queue", transcript: Optional[str] = None,
+                            tts_cache_dir: Optional[str] = None, tts_cache_mb: float = 50.0,
+                            tts_prewarm: bool = False, record: Optional[str] = None,
+                            max_num_hands: int = 2):
+    """Run sign language recognition using local webcam
 
-def run_sign_language_local():
-    """Run sign language recognition using local webcam"""
+    With pipelined=True, capture, inference and rendering overlap in
+    separate stages joined by bounded latest-frame queues.
+    With profile=True (or a metrics_file), per-stage timings are collected;
+    the on-screen panel is toggled with 'p'.
+    With record, every frame's landmarks are appended to that file for
+    replay (see LandmarkRecorder).
+    """
     
     print("="*60)
     print("SIGN LANGUAGE TO VOICE - LOCAL VERSION")
     print("="*60)
-    print("\nControls:")
-    print("  LETTERS:")
-    print("    - Hold ASL letters for 1.2 seconds")
-    print("  COMMON WORDS (hold 1.5s):")
-    print("    - Thumbs up = YES")
-    print("    - Pinky only = NO")
-    print("    - 3 fingers (index+middle+ring) = HELLO")
-    print("    - Thumb+Pinky = LOVE")
-    print("    - Index+Pinky = THANK YOU")
-    print("  ACTIONS:")
-    print("    - Closed fist (1.8s) = ADD SPACE")
-    print("    - Open palm (1.8s) = SPEAK text")
-    print("    - Peace sign (1.2s) = DELETE last word")
+    print("\nGestures (from " + os.path.basename(get_gesture_table().path or DEFAULT_GESTURES_PATH) + "):")
+    for line in get_gesture_table().help_lines():
+        print(line)
+    print("  KEYS:")
+    print("    - Press Tab to take the first word completion (with --lexicon)")
     print("    - Press 'q' to quit")
     print("    - Press 'c' to clear text")
+    print("    - Press 'p' to toggle the profiler panel")
+    print("    - Press 'r' to reload the gesture vocabulary (also reloads automatically on change)")
     print("="*60 + "\n")
     
+    timer = StartupTimer()
+    timer.record("imports", _PROCESS_START, _IMPORTS_DONE)
+
+    # Load and warm up the landmarker and the speech engine while the camera opens
+    warm = {}
+
+    def load_tracker():
+        try:
+            with timer.phase("model resolve"):
+                model_path = resolve_model_path()
+            with timer.phase("landmarker load"):
+                tracker = HandTracker(max_num_hands=max_num_hands, model_path=model_path,
+                                      **(tracker_options or {}))
+            with timer.phase("landmarker warm-up"):
+                tracker.warm_up()
+            warm["tracker"] = tracker
+        except Exception as e:
+            warm["error"] = e
+    loader = threading.Thread(target=load_tracker, name="landmarker-load", daemon=True)
+    loader.start()
+
+    audio_cache = AudioCache(tts_cache_dir, int(tts_cache_mb * 1024 * 1024)) if tts_cache_dir else None
+    tts_engine = TextToSpeechEngine(policy=tts_policy, cache=audio_cache)
+    tts_started = time.perf_counter()
+    tts_engine.start()
+
+    def time_tts():
+        if tts_engine.wait_ready(timeout=30.0):
+            timer.record("speech engine init", tts_started, time.perf_counter())
+    threading.Thread(target=time_tts, name="tts-startup", daemon=True).start()
+
     # Initialize webcam
-    cap = cv2.VideoCapture(0)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 960)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 540)
-    cap.set(cv2.CAP_PROP_FPS, 30)
-    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-    
-    if not cap.isOpened():
-        print("❌ Cannot access webcam!")
+    with timer.phase("camera open"):
+        cap = cv2.VideoCapture(0)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 960)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 540)
+        cap.set(cv2.CAP_PROP_FPS, 30)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        camera_ok = cap.isOpened()
+
+    loader.join()
+    if not camera_ok or "error" in warm:
+        if not camera_ok:
+            print("❌ Cannot access webcam!")
+        if "error" in warm:
+            print(f"❌ Hand landmarker unavailable: {warm['error']}")
+        cap.release()
+        tts_engine.close()
+        if "tracker" in warm:
+            warm["tracker"].close()
         return
     
     # Initialize components
-    tracker = HandTracker(max_num_hands=1)
-    processor = SignLanguageProcessor()
-    tts_engine = TextToSpeechEngine()
+    gesture_table = get_gesture_table()
+    print(f"🖐️ Gesture vocabulary: {sum(l is not None for l in gesture_table.labels)}/32 patterns "
+          f"from {gesture_table.path}")
+    tracker = warm["tracker"]
+    processor = SignLanguageProcessor(**(processor_options or {}))
+    if tts_prewarm:
+        tts_engine.prewarm(sorted(set(processor.word_mappings.values())))
+    action_bus = create_action_bus(tts_engine, transcript)
+    profiler = None
+    if profile or metrics_file:
+        profiler = StageProfiler(export_path=metrics_file, export_interval=metrics_interval)
+        tracker.profiler = profiler
+    show_panel = profile
     
     print("✅ Webcam initialized")
     print("📷 Starting sign language recognition...\n")
     
     frame_count = 0
     hand_detect_count = 0
+    first_frame_shown = False
+    first_hand_seen = False
     pTime = 0
+    last_vocab_check = time.time()
+    pipeline = None
+    frame_buffers = FramePreprocessor()
+    raw = None
+    hud = HUDRenderer()
+    recorder = LandmarkRecorder(record, max_hands=max_num_hands) if record else None
     
     try:
+        if pipelined:
+            pipeline = RecognitionPipeline(cap, tracker, processor, action_bus, queue_size)
+            pipeline.profiler = profiler
+            pipeline.recorder = recorder
+            pipeline.start()
+            print(f"⚙️ Pipelined mode (queue size {queue_size})\n")
+
         while True:
-            success, img = cap.read()
-            if not success:
-                print("Failed to read frame")
-                break
-            
-            frame_count += 1
-            img = cv2.flip(img, 1)  # Mirror for natural interaction
-            
-            # Process hand landmarks
-            landmarks = tracker.process(img, return_pixel_landmarks=True)
-            
-            detected_letter = None
-            if landmarks and len(landmarks) > 0:
-                hand_detect_count += 1
-                hand0 = landmarks[0]
-                detected_letter = recognize_asl_letter(hand0)
-                tracker.draw_landmarks(img)
-            
-            # Process detection
-            action = processor.process_detection(detected_letter)
-            
-            # Handle actions
-            if action == "SPEAK_NOW":
-                text_to_speak = processor.accumulated_text.strip()
-                if text_to_speak:
-                    print(f"🔊 Speaking: {text_to_speak}")
-                    tts_engine.speak(text_to_speak)
-                    # Don't clear immediately, wait for speech to complete
-                    time.sleep(0.5)  # Small delay to ensure speech starts
-                    processor.clear()
-            elif action == "WORD_ADDED":
-                print(f"✓ Word added: '{processor.accumulated_text}'")
-            elif action in ["LETTER_ADDED", "SPACE_ADDED", "DELETED"]:
-                print(f"✓ {action}: '{processor.accumulated_text}'")
-            
-            # Draw UI
-            h, w = img.shape[:2]
-            
-            # Semi-transparent overlay
-            overlay = img.copy()
-            cv2.rectangle(overlay, (10, 10), (w-10, 180), (0, 0, 0), -1)
-            cv2.addWeighted(overlay, 0.5, img, 0.5, 0, img)
-            
-            # Hand detection status
-            if landmarks and len(landmarks) > 0:
-                status_text = "✓ HAND DETECTED"
-                status_color = (0, 255, 0)
-                cv2.circle(img, (w-50, 40), 15, (0, 255, 0), -1)
+            if pipeline:
+                result = pipeline.next_result()
+                if result is None:
+                    if not pipeline.running.is_set():
+                        break
+                    continue
+                img, landmarks, hand_detected, text, current_letter, progress, completions = result
+                with profile_stage(profiler, "draw_landmarks"):
+                    tracker.draw_landmarks(img, landmarks)
+                frame_count = pipeline.inferred_count
+                hand_detect_count = pipeline.hand_detect_count
+                stats = pipeline.stats()
+                extra_lines = [
+                    f"Queues cap/render: {stats['capture_queue_depth']}/{stats['render_queue_depth']}"
+                    f" | Dropped: {stats['capture_dropped']}/{stats['render_dropped']}"
+                ]
             else:
-                status_text = "✗ NO HAND"
-                status_color = (0, 0, 255)
-                cv2.circle(img, (w-50, 40), 15, (0, 0, 255), -1)
-            
-            cv2.putText(img, status_text, (w-200, 45), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, status_color, 2)
-            
-            # Display accumulated text
-            text_display = processor.accumulated_text if processor.accumulated_text else "[Empty]"
-            cv2.putText(img, f"Text: {text_display}", (20, 40), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            
-            # Display current letter being held
-            current_letter = processor.get_current_letter()
-            progress = processor.get_hold_progress()
-            if current_letter:
-                color = (0, 255, 0) if progress >= 1.0 else (0, 255, 255)
-                cv2.putText(img, f"Detecting: {current_letter}", (20, 80), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
-                
-                # Progress bar
-                bar_width = int(300 * progress)
-                cv2.rectangle(img, (20, 100), (320, 120), (50, 50, 50), -1)
-                cv2.rectangle(img, (20, 100), (20 + bar_width, 120), color, -1)
-                cv2.putText(img, f"{int(progress*100)}%", (330, 115), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                
-                # Status text
-                if progress >= 1.0:
-                    cv2.putText(img, "✓ CONFIRMED", (20, 145), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-                else:
-                    cv2.putText(img, "⏳ HOLD...", (20, 145), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-            
+                with profile_stage(profiler, "capture"):
+                    success, raw = cap.read(raw)  # Decode into the same buffer each time
+                if not success:
+                    print("Failed to read frame")
+                    break
+
+                frame_count += 1
+                img = frame_buffers.mirror(raw)  # Mirror for natural interaction
+
+                # Process hand landmarks
+                tracker.process(img)
+                landmarks = tracker.get_landmark_array()
+                handedness = tracker.get_handedness()
+                if recorder:
+                    recorder.append(int(time.time() * 1000), landmarks, handedness, img.shape)
+
+                hand_detected = len(landmarks) > 0
+                if hand_detected:
+                    hand_detect_count += 1
+                    with profile_stage(profiler, "draw_landmarks"):
+                        tracker.draw_landmarks(img)
+
+                # Tracks, landmark filter, batched recognition of all hands, votes and holds
+                with profile_stage(profiler, "recognize"):
+                    action = processor.process_frame(landmarks, handedness, frame_shape=img.shape)
+
+                # Publish actions to sinks (speech, console, transcript) off-thread
+                with profile_stage(profiler, "actions"):
+                    dispatch_action(action, processor, action_bus, processor.detected)
+
+                text = processor.accumulated_text
+                current_letter = processor.get_current_letter()
+                progress = processor.get_hold_progress()
+                completions = processor.completions()
+                extra_lines = None
+
             # FPS counter
             cTime = time.time()
             fps = 1 / (cTime - pTime) if pTime else 0
             pTime = cTime
-            cv2.putText(img, f"FPS: {int(fps)}", (20, h-60), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-            
-            # Statistics
             detection_rate = int(hand_detect_count/frame_count*100) if frame_count > 0 else 0
-            cv2.putText(img, f"Frames: {frame_count} | Detection: {detection_rate}%", (20, h-30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-            
-            # Instructions
-            cv2.putText(img, "Press 'q' to quit | 'c' to clear", (20, h-5), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 150), 1)
-            
-            cv2.imshow("Sign Language to Voice", img)
-            
-            key = cv2.waitKey(5) & 0xFF
+
+            # Pick up edits to the vocabulary file without restarting the camera
+            if cTime - last_vocab_check >= 1.0:
+                last_vocab_check = cTime
+                reload_gesture_table_if_changed()
+
+            # Draw UI
+            with profile_stage(profiler, "hud"):
+                hud.render(img, hand_detected, text, current_letter, progress, fps,
+                         frame_count, detection_rate, extra_lines, completions)
+                if profiler and show_panel:
+                    profiler.draw_panel(img)
+
+            with profile_stage(profiler, "display"):
+                cv2.imshow("Sign Language to Voice", img)
+                key = cv2.waitKey(5) & 0xFF
+            if pipeline:
+                pipeline.release_frame(img)
+            if profiler:
+                profiler.frame_tick()
+            if not first_frame_shown:
+                first_frame_shown = True
+                timer.mark("first frame shown")
+                timer.report()
+            if hand_detected and not first_hand_seen:
+                first_hand_seen = True
+                print(f"⏱️ First hand recognized {timer.elapsed():.2f}s after start")
+
             if key == ord('q'):
                 break
+            elif key == ord('r'):
+                try:
+                    load_gesture_table(get_gesture_table().path)
+                    print("🔄 Gesture vocabulary reloaded")
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"❌ Gesture reload failed, keeping previous vocabulary: {e}")
+            elif key == ord('p'):
+                if profiler is None:
+                    profiler = StageProfiler()
+                    tracker.profiler = profiler
+                    if pipeline:
+                        pipeline.profiler = profiler
+                show_panel = not show_panel
             elif key == ord('c'):
-                processor.clear()
+                if pipeline:
+                    pipeline.clear_text()
+                else:
+                    processor.clear()
                 print("Text cleared")
+            elif key == 9:  # Tab: take the first word completion
+                if pipeline:
+                    pipeline.accept_completion()
+                else:
+                    action = processor.accept_completion()
+                    if action:
+                        dispatch_action(action, processor, action_bus)
                 
     except KeyboardInterrupt:
         print("\n⚠️ Interrupted by user")
     finally:
+        if pipeline:
+            pipeline.stop()
+            frame_count = pipeline.inferred_count
+            hand_detect_count = pipeline.hand_detect_count
         cap.release()
         cv2.destroyAllWindows()
         tracker.close()
+        action_bus.close()
+        tts_engine.close()
+        if profiler:
+            profiler.close()
+        if recorder:
+            recorder.close()
         
         print("\n" + "="*60)
         print("✅ SESSION COMPLETE!")
@@ -593,9 +5170,272 @@ def run_sign_language_local():
         print(f"📊 Statistics:")
         print(f"   Total frames: {frame_count}")
         print(f"   Hands detected: {hand_detect_count} frames ({int(hand_detect_count/max(frame_count,1)*100)}%)")
+        flips = processor.flip_stats()
+        print(f"   State flips: {flips['finger_flips_per_s']}/s finger, {flips['letter_flips_per_s']}/s letter "
+              f"(landmark filter: {processor.landmark_filter.kind}, hysteresis {processor.hysteresis})")
+        commits = processor.commit_stats()
+        print(f"   Commits: {commits['commits']}, mean hold {commits['mean_hold_s']}s "
+              f"({processor.commit_policy} policy)")
+        if pipeline:
+            stats = pipeline.stats()
+            print(f"   Captured frames: {stats['captured']}")
+            print(f"   Dropped (capture -> inference): {stats['capture_dropped']}")
+            print(f"   Dropped (inference -> render): {stats['render_dropped']}")
+        buffers = (tracker.preprocessor, tracker.roi_preprocessor,
+                   pipeline.frame_buffers if pipeline else frame_buffers)
+        buffer_bytes = sum(b.bytes_allocated for b in buffers)
+        print(f"   Frame buffers: {buffer_bytes / 1e6:.1f} MB allocated in total, "
+              f"{buffer_bytes / max(frame_count, 1) / 1024:.1f} KB/frame")
+        if tracker.roi_landmarker:
+            roi_stats = tracker.roi_stats()
+            print(f"   ROI frames: {roi_stats['roi_frames']} ({int(roi_stats['roi_ratio']*100)}%), "
+                  f"fallbacks to full frame: {roi_stats['roi_fallbacks']}")
+        if tracker.motion_gate:
+            inference_stats = tracker.inference_stats()
+            print(f"   Inference skipped: {inference_stats['skipped']} frames "
+                  f"({int(inference_stats['skip_ratio']*100)}%), "
+                  f"effective rate {inference_stats['inference_rate']}/s")
+        if profiler:
+            print("   Stage timings (p50 / p99 ms):")
+            for name, stage_stats in profiler.snapshot().items():
+                print(f"     {name:<18} {stage_stats['p50_ms']:7.2f} / {stage_stats['p99_ms']:7.2f}")
+        for name, sink_stats in action_bus.stats().items():
+            print(f"   Sink '{name}': {sink_stats['handled']} events, latency {sink_stats['latency_ms']} ms "
+                  f"(max {sink_stats['max_latency_ms']} ms), dropped {sink_stats['dropped']}")
+        tts_stats = tts_engine.stats()
+        print(f"   Utterances spoken: {tts_stats['spoken']} ({tts_stats['from_cache']} from cache, "
+              f"dropped {tts_stats['dropped']}, "
+              f"coalesced {tts_stats['coalesced']}, interrupted {tts_stats['interrupted']})")
+        if tts_stats["synthesis_ms"] is not None:
+            print(f"   Speech queue latency: {tts_stats['queue_latency_ms']} ms | "
+                  f"synthesis: {tts_stats['synthesis_ms']} ms (mean)")
+        if recorder:
+            print(f"   Recorded {recorder.frames} frames to {recorder.path}")
         print(f"   Final text: '{processor.accumulated_text}'")
         print("="*60)
 
 
 if __name__ == "__main__":
-    run_sign_language_local()
+    parser = argparse.ArgumentParser(description="Sign Language to Voice")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="overlap capture, inference and rendering in separate threads")
+    parser.add_argument("--queue-size", type=int, default=1,
+                        help="max frames buffered between pipeline stages (default: 1)")
+    parser.add_argument("--batch", nargs="+", metavar="SOURCE",
+                        help="headless mode: process video files / image directories instead of the webcam")
+    parser.add_argument("--output", help="JSON Lines output file for --batch/--replay (default: stdout) or --streams")
+    parser.add_argument("--fps", type=float, default=30.0,
+                        help="frame rate used to timestamp image directories in --batch (default: 30)")
+    parser.add_argument("--mirror", action="store_true",
+                        help="mirror recorded frames in --batch/--streams, like the live webcam view")
+    parser.add_argument("--max-hands", type=int, default=2,
+                        help="hands tracked per frame (default: 2; two-handed gestures need 2)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="time each pipeline stage offline and write p50/p99 results as JSON")
+    parser.add_argument("--benchmark-output", default="benchmark_results.json",
+                        help="where --benchmark writes its results (default: benchmark_results.json)")
+    parser.add_argument("--baseline", help="benchmark JSON to compare --benchmark results against")
+    parser.add_argument("--fixtures", help="(N, 21, 3) .npy landmark fixtures for --benchmark (default: synthetic)")
+    parser.add_argument("--iterations", type=int, default=500, help="iterations per benchmark stage")
+    parser.add_argument("--no-inference", action="store_true",
+                        help="skip the landmarker inference stage in --benchmark")
+    parser.add_argument("--profile", action="store_true",
+                        help="collect per-stage timings and show the profiler panel (toggle with 'p')")
+    parser.add_argument("--metrics-file",
+                        help="periodically export stage metrics here (.prom/.txt = Prometheus text, else JSON)")
+    parser.add_argument("--metrics-interval", type=float, default=5.0,
+                        help="seconds between metrics exports (default: 5)")
+    parser.add_argument("--gestures", default=DEFAULT_GESTURES_PATH,
+                        help="gesture vocabulary JSON file (default: gestures.json next to this script)")
+    parser.add_argument("--landmark-filter", choices=LandmarkFilter.KINDS, default="one-euro",
+                        help="temporal filter on each hand's landmarks before recognition (default: one-euro)")
+    parser.add_argument("--filter-min-cutoff", type=float, default=1.0,
+                        help="one-euro cutoff (Hz) for a still hand; lower = smoother (default: 1.0)")
+    parser.add_argument("--filter-beta", type=float, default=20.0,
+                        help="one-euro cutoff increase with speed; higher = less lag when moving (default: 20)")
+    parser.add_argument("--hysteresis", type=float, default=0.1,
+                        help="palm-size fraction a finger must pass its threshold by to change state (0 = off, default: 0.1)")
+    parser.add_argument("--commit-policy", choices=SignLanguageProcessor.COMMIT_POLICIES, default="evidence",
+                        help="commit a gesture once its frames are convincing (evidence, bounded by each "
+                             "gesture's min_hold and hold) or only after its fixed hold time (hold) "
+                             "(default: evidence)")
+    parser.add_argument("--commit-error", type=float, default=0.01,
+                        help="error rate of the evidence policy's sequential test; lower waits longer (default: 0.01)")
+    parser.add_argument("--evidence-margin", type=float, default=0.25,
+                        help="palm-size fraction the deciding fingers must clear their thresholds by "
+                             "for a frame to count as full evidence (default: 0.25)")
+    parser.add_argument("--vote-window", type=int, default=10,
+                        help="frames in the smoothing majority-vote window (default: 10)")
+    parser.add_argument("--vote-seconds", type=float,
+                        help="also expire votes older than this many seconds")
+    parser.add_argument("--vote-half-life", type=float,
+                        help="weight recent frames more: vote weight halves every N frames")
+    parser.add_argument("--tts-policy", choices=TextToSpeechEngine.POLICIES, default="queue",
+                        help="what to do with speech requested while speaking (default: queue)")
+    parser.add_argument("--transcript", help="append every committed action as JSON Lines to this file")
+    parser.add_argument("--tts-cache", metavar="DIR",
+                        help="cache synthesized audio for repeated phrases in this directory")
+    parser.add_argument("--tts-cache-mb", type=float, default=50.0,
+                        help="size limit of the audio cache; least recently used phrases are evicted (default: 50)")
+    parser.add_argument("--tts-prewarm", action="store_true",
+                        help="render the whole word vocabulary into the audio cache at startup")
+    parser.add_argument("--roi", action="store_true",
+                        help="run the landmarker on a crop around the last known hand instead of the full frame")
+    parser.add_argument("--roi-size", type=int, default=256,
+                        help="max side in pixels the ROI crop is downscaled to (default: 256)")
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="skip landmark inference on frames without motion, reusing the last landmarks")
+    parser.add_argument("--motion-threshold", type=float, default=2.0,
+                        help="mean grey-level change (0-255) that counts as motion (default: 2.0)")
+    parser.add_argument("--max-skip", type=int, default=5,
+                        help="max consecutive frames skipped by --motion-gate (default: 5)")
+    parser.add_argument("--serve", action="store_true",
+                        help="run the local HTTP/WebSocket recognition server instead of the webcam loop")
+    parser.add_argument("--host", default="127.0.0.1", help="address for --serve (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port for --serve (default: 8765)")
+    parser.add_argument("--pool-size", type=int, default=2,
+                        help="landmarker instances shared by all --serve sessions (default: 2)")
+    parser.add_argument("--session-timeout", type=float, default=300.0,
+                        help="drop --serve sessions idle for this many seconds (default: 300)")
+    parser.add_argument("--load-test", metavar="URL",
+                        help="drive a running server at URL with simulated clients and report latency")
+    parser.add_argument("--clients", type=int, default=4, help="simulated clients for --load-test (default: 4)")
+    parser.add_argument("--duration", type=float,
+                        help="seconds to run --load-test (default: 10) or --streams (default: until done/Ctrl+C)")
+    parser.add_argument("--load-fps", type=float, default=30.0,
+                        help="frames/s per --load-test client, 0 = as fast as possible (default: 30)")
+    parser.add_argument("--load-source",
+                        help="video/image directory whose JPEG frames --load-test sends (default: synthetic landmarks)")
+    parser.add_argument("--streams", nargs="+", metavar="SOURCE",
+                        help="recognize several cameras (device indices) and/or video files, one worker process each")
+    parser.add_argument("--ring-slots", type=int, default=4,
+                        help="shared-memory frame slots per --streams source (default: 4)")
+    parser.add_argument("--model", help="hand landmarker .task file to use instead of the cached copy")
+    parser.add_argument("--model-cache", metavar="DIR",
+                        help="directory holding the cached model (default: $SIGN_TO_VOICE_CACHE or the user cache dir)")
+    parser.add_argument("--model-sha256", help="expected SHA-256 of the model; anything else is rejected")
+    parser.add_argument("--offline", action="store_true",
+                        help="never download the model; fail if it is not cached")
+    parser.add_argument("--record", metavar="PATH",
+                        help="save every frame's landmarks for replay (live, or --batch: a directory for several sources)")
+    parser.add_argument("--replay", nargs="+", metavar="RECORDING",
+                        help="run recognition over landmark recordings (no camera or model) and write JSON Lines")
+    parser.add_argument("--realtime", action="store_true",
+                        help="pace --replay like the recorded session instead of running at full speed")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="playback speed factor for --replay --realtime (default: 1)")
+    parser.add_argument("--classifier", metavar="MODEL",
+                        help="recognize with a learned classifier (.npz from --train-classifier) instead of finger rules")
+    parser.add_argument("--train-classifier", metavar="MODEL",
+                        help="train a classifier on --train-data recordings and save it here")
+    parser.add_argument("--train-data", nargs="+", metavar="[LABEL=]RECORDING",
+                        help="labelled recordings, one gesture per take (label defaults to the file name, e.g. B_1.lmrec)")
+    parser.add_argument("--classifier-kind", choices=LandmarkClassifier.KINDS, default="centroid",
+                        help="classifier backend for --train-classifier (default: centroid)")
+    parser.add_argument("--knn-k", type=int, default=5, help="neighbours for --classifier-kind knn (default: 5)")
+    parser.add_argument("--words", metavar="LIBRARY",
+                        help="recognize motion word signs with a trajectory template library (.npz from --train-words)")
+    parser.add_argument("--train-words", metavar="LIBRARY",
+                        help="build a word template library from --word-data recordings and save it here")
+    parser.add_argument("--word-data", nargs="+", metavar="[LABEL=]RECORDING",
+                        help="recorded word takes, one sign per take (label defaults to the file name, e.g. WORD-HELLO-1.lmrec)")
+    parser.add_argument("--dtw-band", type=int, default=4,
+                        help="Sakoe-Chiba band (in resampled steps) for --train-words (default: 4)")
+    parser.add_argument("--lexicon", metavar="LEXICON",
+                        help="suggest completions of fingerspelled words from a lexicon (from --build-lexicon); "
+                             "the ACCEPT gesture or Tab takes the first")
+    parser.add_argument("--build-lexicon", metavar="LEXICON",
+                        help="compile the --lexicon-words word list into a lexicon file saved here")
+    parser.add_argument("--lexicon-words", metavar="WORDLIST",
+                        help="word list for --build-lexicon: one word per line, most frequent first, "
+                             "or 'word count' lines")
+    parser.add_argument("--completions", type=int, default=4,
+                        help="completions kept per prefix by --build-lexicon (default: 4)")
+    args = parser.parse_args()
+
+    load_gesture_table(args.gestures)
+    configure_model(args.model, args.model_cache, args.model_sha256, allow_download=not args.offline)
+    if args.classifier:
+        classifier = load_classifier(args.classifier)
+        print(f"🧠 Learned classifier ({classifier.kind}): {len(classifier.labels)} gestures from {args.classifier}")
+    if args.words:
+        library = load_word_library(args.words)
+        print(f"👋 Word templates: {len(set(library.labels))} words, {len(library.labels)} templates from {args.words}")
+    if args.lexicon:
+        lexicon = load_lexicon(args.lexicon)
+        print(f"📖 Lexicon: {len(lexicon)} words from {args.lexicon}")
+    processor_options = {
+        "window": args.vote_window,
+        "window_seconds": args.vote_seconds,
+        "recency_half_life": args.vote_half_life,
+        "landmark_filter": args.landmark_filter,
+        "filter_options": {"min_cutoff": args.filter_min_cutoff, "beta": args.filter_beta},
+        "hysteresis": args.hysteresis,
+        "commit_policy": args.commit_policy,
+        "commit_error": args.commit_error,
+        "evidence_margin": args.evidence_margin,
+    }
+    tracker_options = {
+        "roi_mode": args.roi,
+        "roi_target_size": args.roi_size,
+        "motion_gate": args.motion_gate,
+        "motion_threshold": args.motion_threshold,
+        "max_skip": args.max_skip,
+    }
+
+    if args.train_classifier:
+        if not args.train_data:
+            parser.error("--train-classifier needs --train-data")
+        print(json.dumps(train_classifier(args.train_data, args.train_classifier,
+                                          kind=args.classifier_kind, k=args.knn_k), indent=2))
+    elif args.train_words:
+        if not args.word_data:
+            parser.error("--train-words needs --word-data")
+        print(json.dumps(train_word_library(args.word_data, args.train_words, band=args.dtw_band), indent=2))
+    elif args.build_lexicon:
+        if not args.lexicon_words:
+            parser.error("--build-lexicon needs --lexicon-words")
+        print(json.dumps(build_lexicon(args.lexicon_words, args.build_lexicon, top_k=args.completions), indent=2))
+    elif args.benchmark:
+        results = run_benchmarks(iterations=args.iterations, fixtures=args.fixtures,
+                                 include_inference=not args.no_inference)
+        with open(args.benchmark_output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📊 Benchmark results written to {args.benchmark_output}")
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                regressions = compare_benchmarks(results, json.load(f))
+            if regressions:
+                print(f"⚠️ Regressions: {', '.join(regressions)}")
+                sys.exit(1)
+        else:
+            compare_benchmarks(results, {})
+    elif args.load_test:
+        print(json.dumps(run_load_test(args.load_test, clients=args.clients, duration=args.duration or 10.0,
+                                       fps=args.load_fps, source=args.load_source), indent=2))
+    elif args.streams:
+        run_multi_stream(args.streams, slots=args.ring_slots, mirror_files=args.mirror,
+                         output=args.output, duration=args.duration, gestures_path=args.gestures,
+                         classifier_path=args.classifier, words_path=args.words,
+                         lexicon_path=args.lexicon, max_num_hands=args.max_hands,
+                         processor_options=processor_options, tracker_options=tracker_options)
+    elif args.serve:
+        run_server(args.host, args.port, pool_size=args.pool_size,
+                   processor_options=processor_options, session_timeout=args.session_timeout,
+                   max_num_hands=args.max_hands)
+    elif args.replay:
+        run_replay(args.replay, output=args.output, realtime=args.realtime, speed=args.speed,
+                   processor_options=processor_options)
+    elif args.batch:
+        run_batch(args.batch, output=args.output, fps=args.fps, mirror=args.mirror,
+                  processor_options=processor_options, tracker_options=tracker_options,
+                  record=args.record, max_num_hands=args.max_hands)
+    else:
+        run_sign_language_local(pipelined=args.pipelined, queue_size=args.queue_size,
+                                profile=args.profile, metrics_file=args.metrics_file,
+                                metrics_interval=args.metrics_interval,
+                                processor_options=processor_options, tracker_options=tracker_options,
+                                tts_policy=args.tts_policy,
+                                transcript=args.transcript, tts_cache_dir=args.tts_cache,
+                                tts_cache_mb=args.tts_cache_mb, tts_prewarm=args.tts_prewarm,
+                                record=args.record, max_num_hands=args.max_hands)
@@ -0,0 +1,33 @@
+"""Shared fixtures: the app is one script whose file name isn't importable"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sign_to_voice.py.py")
+
+
+def _load_app():
+    spec = importlib.util.spec_from_file_location("sign_to_voice", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["sign_to_voice"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The sign_to_voice module, loaded once per test run"""
+    return _load_app()
+
+
+@pytest.fixture(autouse=True)
+def default_recognizer(app):
+    """Every test starts from the bundled vocabulary and no classifier or lexicon"""
+    app.load_gesture_table(app.DEFAULT_GESTURES_PATH)
+    app.load_classifier(None)
+    app.load_lexicon(None)
+    yield
+    app.load_classifier(None)
+    app.load_lexicon(None)
@@ -0,0 +1,80 @@
+"""Compiling gestures.json vocabularies into GestureTable lookup tables"""
+import pytest
+
+
+def test_default_vocabulary_compiles_without_conflicts(app):
+    table = app.get_gesture_table()
+    assert table.conflicts == []
+    assert table.lookup(0b00001) == "A"   # Thumb only (bit 0 = thumb)
+    assert table.lookup(0b11110) == "B"
+    assert table.lookup(0b00000) == "SPACE"
+    assert table.hold_time("SPACE") == 1.8
+    assert table.min_hold_time("A") == 0.3
+
+
+def test_wildcards_expand_to_every_mask(app):
+    table = app.GestureTable.from_dict({"gestures": [{"pattern": "x1100", "type": "action", "value": "DELETE"}]})
+    assert [mask for mask in range(32) if table.lookup(mask) == "DELETE"] == [0b00110, 0b00111]
+    # Flipping the thumb can't change a gesture that ignores it
+    assert not table.sensitive[0b00110, 0]
+    assert table.sensitive[0b00110, 1:].all()
+
+
+def test_overlapping_patterns_keep_the_first_and_report_the_conflict(app):
+    table = app.GestureTable.from_dict({"gestures": [
+        {"pattern": "1x000", "type": "letter", "value": "A"},
+        {"pattern": "11000", "type": "letter", "value": "L"},
+        {"pattern": "00001", "type": "word", "value": "hi", "hold": 2.0},
+        {"pattern": "00001", "type": "word", "value": "hi", "hold": 1.0},
+    ]})
+    assert table.lookup(0b00011) == "A"
+    assert table.lookup(0b10000) == "WORD:HI"
+    assert table.hold_time("WORD:HI") == 2.0
+    assert len(table.conflicts) == 2
+    assert "overlaps 1x000 -> A" in table.conflicts[0]
+    assert "conflicting hold times" in table.conflicts[1]
+
+
+def test_two_handed_gestures_compile_into_the_pair_table(app):
+    table = app.GestureTable.from_dict({"two_handed": [{"left": "11111", "right": "0000x", "value": "help"}]})
+    assert table.has_pairs
+    assert table.lookup_pair(0b11111, 0b00000) == "WORD:HELP"
+    assert table.lookup_pair(0b11111, 0b10000) == "WORD:HELP"
+    assert table.lookup_pair(0b00000, 0b11111) is None
+
+
+@pytest.mark.parametrize("spec", [
+    {"gestures": [{"pattern": "1100", "value": "A"}]},
+    {"gestures": [{"pattern": "11a00", "value": "A"}]},
+    {"gestures": [{"pattern": "11000", "type": "phrase", "value": "A"}]},
+])
+def test_invalid_entries_are_rejected(app, spec):
+    with pytest.raises(ValueError):
+        app.GestureTable.from_dict(spec)
+
+
+def test_help_lists_the_loaded_vocabulary(app):
+    table = app.GestureTable.from_dict({
+        "gestures": [{"pattern": "x1100", "type": "action", "value": "DELETE"},
+                     {"pattern": "10000", "type": "letter", "value": "A"}],
+        "two_handed": [{"left": "11111", "right": "00000", "value": "stop"}],
+    })
+    assert table.help_lines() == [
+        "  LETTERS:",
+        "    - thumb up = A (hold 0.3-1.2s)",
+        "  WORDS:",
+        "    - left open palm, right fist = STOP (hold 0.4-1.5s)",
+        "  ACTIONS:",
+        "    - index+middle up (thumb either way) = DELETE (hold 0.6-1.8s): delete the last word",
+    ]
+
+
+def test_two_handed_overlaps_are_reported_once(app):
+    table = app.GestureTable.from_dict({"two_handed": [
+        {"left": "1111x", "right": "11111", "value": "book"},
+        {"left": "1111x", "right": "1111x", "value": "read"},
+    ]})
+    # Overlaps at both left masks, reported once
+    assert table.conflicts == ["1111x+1111x -> WORD:READ overlaps WORD:BOOK; keeping WORD:BOOK"]
+    assert table.lookup_pair(0b01111, 0b11111) == "WORD:BOOK"
+    assert table.lookup_pair(0b11111, 0b01111) == "WORD:READ"
@@ -0,0 +1,32 @@
+"""Landmark input formats accepted by the recognition entry points"""
+import pytest
+
+
+def _pixel_tuples(hand, width=640, height=480):
+    """A normalized (21, 3) hand as the legacy list of (id, x, y) pixel tuples"""
+    return [(i, int(x * width), int(y * height)) for i, (x, y, _) in enumerate(hand)]
+
+
+def test_shim_accepts_legacy_tuples_and_arrays(app):
+    hands = app.make_synthetic_hands(32)
+    expected = app.recognize_asl_letters(hands)
+    for hand, label in zip(hands, expected):
+        assert app.recognize_asl_letter(hand) == label
+        assert app.recognize_asl_letter(_pixel_tuples(hand)) == label
+        assert app.get_finger_states(_pixel_tuples(hand)) == app.get_finger_states(hand)
+    assert app.recognize_asl_letter([]) is None
+    assert app.recognize_asl_letter(None) is None
+
+
+def test_shim_keeps_2d_input_on_the_rule_table_with_a_classifier_loaded(app, tmp_path):
+    hands = app.make_synthetic_hands(64)
+    rules = app.recognize_asl_letters(hands)
+    classifier = app.LandmarkClassifier.train(hands, ["Z"] * len(hands))
+    classifier.save(str(tmp_path / "all_z.npz"))
+    app.load_classifier(str(tmp_path / "all_z.npz"))
+
+    assert app.recognize_asl_letter(hands[3]) == "Z"
+    assert app.recognize_asl_letter(_pixel_tuples(hands[3])) == rules[3]
+    assert app.recognize_asl_letter(hands[3][:, :2] * 640) == rules[3]
+    with pytest.raises(ValueError, match="landmarks"):
+        classifier.predict_one(hands[3][:, :2])
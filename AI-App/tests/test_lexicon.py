@@ -0,0 +1,83 @@
+"""Lexicon trie build, prefix lookup and completion in SignLanguageProcessor"""
+import pytest
+
+WORDS = ["the", "thank", "they", "then", "this", "there", "help", "hello", "hell", "hi"]
+
+
+@pytest.fixture
+def lexicon(app, tmp_path):
+    lexicon = app.Lexicon.build(WORDS + ["The", "don't", "café"], str(tmp_path / "words.lex"), top_k=3)
+    yield lexicon
+    lexicon.close()
+
+
+def test_build_and_lookup(lexicon):
+    assert len(lexicon) == len(WORDS)  # Duplicates and words that can't be fingerspelled are dropped
+    assert lexicon.complete("th") == ["the", "thank", "they"]
+    assert lexicon.complete("THE") == ["the", "they", "then"]
+    assert lexicon.complete("hel") == ["help", "hello", "hell"]
+    assert lexicon.complete("hello") == ["hello"]
+    assert lexicon.complete("x") == []
+    assert lexicon.complete("") == []  # Nothing to complete before the first letter
+    assert lexicon.walk("thx") == -1 and lexicon.completions(-1) == []
+    assert lexicon.walk("en", lexicon.walk("th")) == lexicon.walk("then")
+
+
+def test_file_reopens_without_rebuilding(app, lexicon):
+    reopened = app.Lexicon(lexicon.path)
+    try:
+        assert [reopened.word(rank) for rank in range(len(reopened))] == WORDS
+        assert reopened.complete("t") == lexicon.complete("t")
+    finally:
+        reopened.close()
+
+
+def test_word_list_is_ranked_by_count(app, tmp_path):
+    source = tmp_path / "counts.txt"
+    source.write_text("help 10\nthe 500\n\nhello 20\n42 7\n", encoding="utf-8")
+    assert app.read_word_list(str(source)) == ["the", "hello", "help"]
+    summary = app.build_lexicon(str(source), str(tmp_path / "counts.lex"), top_k=2)
+    assert summary["words"] == 3 and summary["completions_per_node"] == 2
+
+
+def test_processor_completes_the_word_being_spelled(app, lexicon):
+    app.load_lexicon(lexicon.path)
+    processor = app.SignLanguageProcessor()
+    assert processor.completions() == []
+    processor.accumulated_text = "hi he"
+    assert processor.completions() == ["help", "hello", "hell"]
+    processor.accumulated_text += "l"
+    assert processor.completions() == ["help", "hello", "hell"]
+    assert processor.accept_completion(1) == "WORD_ADDED"
+    assert processor.accumulated_text == "hi hello "
+    assert processor.completions() == []
+    assert processor.accept_completion() is None
+
+
+def _hold(processor, gesture, seconds=2.0):
+    """Feed one gesture at 30 fps until it must have committed; the actions returned"""
+    return [action for frame in range(int(seconds * 30))
+            if (action := processor.process_detection(gesture, timestamp=frame / 30.0))]
+
+
+def test_accept_gesture_without_completion_does_nothing(app, lexicon):
+    app.load_lexicon(lexicon.path)
+    processor = app.SignLanguageProcessor(landmark_filter="none", hysteresis=0.0)
+    processor.accumulated_text = "hi x"
+    assert _hold(processor, "ACCEPT") == []
+    assert processor.accumulated_text == "hi x"
+    assert processor.commit_stats()["commits"] == 0
+
+    processor.accumulated_text = "hi th"
+    processor.current_letter = None
+    assert _hold(processor, "ACCEPT") == ["WORD_ADDED"]
+    assert processor.accumulated_text == "hi the "
+
+
+def test_loading_a_lexicon_closes_the_previous_one(app, lexicon):
+    first = app.load_lexicon(lexicon.path)
+    second = app.load_lexicon(lexicon.path)
+    assert app.get_lexicon() is second and second.complete("th") == ["the", "thank", "they"]
+    assert first.top is None and first._map.closed
+    app.load_lexicon(None)
+    assert second._map.closed
@@ -0,0 +1,82 @@
+"""Buffer ownership in the pipelined capture -> inference -> render mode"""
+import time
+
+import numpy as np
+
+
+class FakeCapture:
+    """Numbered frames at camera pace: every pixel holds the frame number (mod 256)"""
+
+    def __init__(self, count):
+        self.count = count
+        self.index = 0
+
+    def read(self, out=None):
+        if self.index >= self.count:
+            return False, None
+        if out is None:
+            out = np.empty((48, 64, 3), dtype=np.uint8)
+        time.sleep(0.002)
+        out[:] = self.index % 256
+        self.index += 1
+        return True, out
+
+
+class SlowTracker:
+    """Remembers the value it saw in the landmarks, then takes its time"""
+
+    def __init__(self):
+        self.landmarks = np.zeros((0, 21, 3), dtype=np.float32)
+
+    def process(self, frame):
+        self.landmarks = np.full((1, 21, 3), frame[0, 0, 0], dtype=np.float32)
+        time.sleep(0.005)
+
+    def get_landmark_array(self):
+        return self.landmarks
+
+    def get_handedness(self):
+        return [("Right", 0.9)]
+
+
+def test_checked_out_buffers_are_not_reused_until_released(app):
+    buffers = app.FramePreprocessor()
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+    first = buffers.checkout_mirror(frame)
+    second = buffers.checkout_mirror(frame + 1)
+    assert first is not second and first.max() == 0
+    buffers.release(first)
+    assert buffers.checkout_mirror(frame + 2) is first
+
+
+def test_latest_frame_queue_hands_dropped_items_back(app):
+    dropped = []
+    frames = app.LatestFrameQueue(2, on_drop=dropped.append)
+    for item in range(5):
+        frames.put(item)
+    assert dropped == [0, 1, 2]
+    assert frames.get() == 3
+
+
+def test_rendered_frames_are_the_frames_that_were_recognized(app):
+    pipeline = app.RecognitionPipeline(FakeCapture(150), SlowTracker(), app.SignLanguageProcessor(),
+                                       action_bus=None, queue_size=1)
+    pipeline.start()
+    rendered = 0
+    try:
+        while True:
+            result = pipeline.next_result()
+            if result is None:
+                if not pipeline.running.is_set():
+                    break
+                continue
+            img, landmarks = result[:2]
+            time.sleep(0.02)  # Rendering slower than capture and inference
+            assert img[0, 0, 0] == landmarks[0, 0, 0]
+            pipeline.release_frame(img)
+            rendered += 1
+    finally:
+        pipeline.stop()
+    assert rendered > 0
+    # Buffers in flight: both queues plus one per stage
+    assert pipeline.frame_buffers.bytes_allocated <= 6 * 48 * 64 * 3
@@ -0,0 +1,88 @@
+"""LandmarkRecorder / LandmarkRecording round trip and crash recovery"""
+import os
+
+import numpy as np
+import pytest
+
+
+def _record(app, path, frames, max_hands=2):
+    recorder = app.LandmarkRecorder(path, max_hands)
+    for timestamp_ms, landmarks, handedness in frames:
+        recorder.append(timestamp_ms, landmarks, handedness, (720, 1280, 3))
+    recorder.close()
+
+
+def _frames(app, count=5):
+    hands = app.make_synthetic_hands(count * 2)
+    sides = [("Right", 0.75), ("Left", 0.5)]
+    return [(1000 + 33 * i, hands[2 * i:2 * i + i % 3], sides[:i % 3]) for i in range(count)]
+
+
+def test_round_trip(app, tmp_path):
+    path = str(tmp_path / "take.lmrec")
+    frames = _frames(app)
+    _record(app, path, frames)
+
+    recording = app.LandmarkRecording(path)
+    try:
+        assert len(recording) == len(frames)
+        assert recording.frame_shape == (720, 1280)
+        assert recording.duration_s() == 0.132
+        for index, (timestamp_ms, landmarks, handedness) in enumerate(frames):
+            assert recording.timestamps_ms[index] == timestamp_ms
+            np.testing.assert_array_equal(recording.frame(index), landmarks[:2])
+            assert recording.handedness(index) == handedness
+    finally:
+        recording.close()
+
+
+def test_extra_hands_are_dropped(app, tmp_path):
+    path = str(tmp_path / "one_hand.lmrec")
+    hands = app.make_synthetic_hands(3)
+    _record(app, path, [(0, hands, [("Left", 0.9)] * 3)], max_hands=1)
+    recording = app.LandmarkRecording(path)
+    try:
+        np.testing.assert_array_equal(recording.frame(0), hands[:1])
+    finally:
+        recording.close()
+
+
+def test_torn_record_is_ignored_and_truncated_on_append(app, tmp_path):
+    path = str(tmp_path / "crash.lmrec")
+    frames = _frames(app)
+    _record(app, path, frames[:3])
+    size = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 17)  # Half-written record from a crash
+
+    recording = app.LandmarkRecording(path)
+    assert len(recording) == 3
+    recording.close()
+
+    _record(app, path, frames[3:])
+    assert os.path.getsize(path) == size + 2 * app.recording_dtype(2).itemsize
+    recording = app.LandmarkRecording(path)
+    try:
+        assert recording.timestamps_ms.tolist() == [frame[0] for frame in frames]
+        np.testing.assert_array_equal(recording.frame(4), frames[4][1])
+    finally:
+        recording.close()
+
+
+@pytest.mark.parametrize("opener", ["LandmarkRecording", "LandmarkRecorder"])
+def test_foreign_files_are_rejected(app, tmp_path, opener):
+    foreign = tmp_path / "notes.txt"
+    foreign.write_bytes(b"not a recording" * 10)
+    with pytest.raises(ValueError, match="not a landmark recording"):
+        getattr(app, opener)(str(foreign))
+
+
+def test_frames_outlive_close(app, tmp_path):
+    path = str(tmp_path / "closed.lmrec")
+    frames = _frames(app)
+    _record(app, path, frames)
+    recording = app.LandmarkRecording(path)
+    frame = recording.frame(2)
+    recording.close()
+    np.testing.assert_array_equal(frame, frames[2][1])
+    assert recording.records is None
@@ -0,0 +1,89 @@
+"""--replay of a --record file must reproduce the --batch run it was recorded from"""
+import io
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+FPS = 30.0
+FRAME_SHAPE = (9, 16, 3)  # 16:9, so the frame aspect matters
+
+
+class FakeTracker:
+    """HandTracker stand-in: each frame's first pixels encode an index into FRAMES"""
+
+    frames = []
+
+    def __init__(self, **options):
+        self.landmarks = np.zeros((0, 21, 3), dtype=np.float32)
+
+    def process(self, frame, timestamp_ms=None):
+        index = int(frame[0, 0, 0]) + 256 * int(frame[0, 1, 0])
+        self.landmarks = self.frames[index]
+
+    def get_landmark_array(self):
+        return self.landmarks
+
+    def get_handedness(self):
+        return [("Right", 0.9), ("Left", 0.8)][:len(self.landmarks)]
+
+    def close(self):
+        pass
+
+
+def _session(app, seconds_per_pose=1.5, noise=0.01):
+    """Noisy holds of a few letters, with gaps and a second hand, as per-frame landmarks"""
+    hands = app.make_synthetic_hands(32)
+    labels = app.recognize_asl_letters(hands)
+    letters = [i for i, label in enumerate(labels) if label and len(label) == 1][:4]
+    rng = np.random.default_rng(7)
+    frames = []
+    for n, pose in enumerate(letters):
+        for _ in range(int(seconds_per_pose * FPS)):
+            shown = [hands[pose]] if n % 2 == 0 else [hands[pose], hands[letters[0]] + 0.2]
+            frames.append((np.array(shown) + rng.normal(0, noise, (len(shown), 21, 3))).astype(np.float32))
+        frames.extend([np.zeros((0, 21, 3), dtype=np.float32)] * 10)
+    return frames
+
+
+def _write_images(directory, count):
+    for index in range(count):
+        image = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+        image[0, 0], image[0, 1] = index % 256, index // 256
+        cv2.imwrite(str(directory / f"{index:05d}.png"), image)
+
+
+def _records(text, source):
+    records = [json.loads(line) for line in text.splitlines()]
+    for record in records:
+        assert record.pop("source") == source
+        for key in ("elapsed_s", "fps", "recorded_s"):
+            record.pop(key, None)
+    return records
+
+
+@pytest.mark.parametrize("options", [
+    {"landmark_filter": "none", "hysteresis": 0.0},  # Batched replay path
+    {},  # Default filter and hysteresis: per-frame replay path
+])
+def test_replay_matches_batch(app, tmp_path, monkeypatch, options):
+    FakeTracker.frames = _session(app)
+    monkeypatch.setattr(app, "HandTracker", FakeTracker)
+    images = tmp_path / "frames"
+    images.mkdir()
+    _write_images(images, len(FakeTracker.frames))
+    recording = str(tmp_path / "session.lmrec")
+
+    batch_out = io.StringIO()
+    summary = app.process_source_batch(str(images), batch_out, fps=FPS, processor_options=options,
+                                       record_path=recording)
+    replay_out = io.StringIO()
+    app.replay_recording(recording, replay_out, processor_options=options)
+
+    assert app.SignLanguageProcessor(**options).stateless_recognition == bool(options)
+    assert summary["text"].strip()
+    batch = _records(batch_out.getvalue(), str(images))
+    replay = _records(replay_out.getvalue(), recording)
+    assert batch[-1].pop("hands_detected") == replay[-1].pop("hands_detected")
+    assert replay == batch
@@ -0,0 +1,42 @@
+"""--serve request handling that doesn't need the hand landmarker"""
+import http.client
+import json
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def server(app):
+    server = app.RecognitionServer(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.close()
+
+
+def _post(server, path, body=b"", headers=None):
+    conn = http.client.HTTPConnection(*server.address, timeout=5)
+    try:
+        conn.putrequest("POST", path)
+        for name, value in (headers or {"Content-Length": str(len(body))}).items():
+            conn.putheader(name, value)
+        conn.endheaders(body)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+
+def test_landmark_frames_produce_events(app, server):
+    status, created = _post(server, "/sessions")
+    assert status == 201
+    body = json.dumps({"landmarks": app.make_synthetic_hands(1).tolist(), "timestamp_ms": 0}).encode()
+    status, event = _post(server, f"/sessions/{created['session']}/landmarks", body)
+    assert status == 200 and event["hands"] == 1
+
+
+@pytest.mark.parametrize("length", ["-1", "twelve"])
+def test_invalid_content_length_is_rejected(server, length):
+    status, error = _post(server, "/sessions", headers={"Content-Length": length})
+    assert status == 400 and "Content-Length" in error["error"]
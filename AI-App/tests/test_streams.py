@@ -0,0 +1,81 @@
+"""--streams capture: what a worker that falls behind gets handed"""
+import queue
+import threading
+import types
+
+import numpy as np
+
+SHAPE = (8, 8, 3)
+
+
+class NumberedCapture:
+    """Every pixel of frame n holds n; ends after `count` frames"""
+
+    def __init__(self, count):
+        self.count = count
+        self.index = 0
+
+    def read(self, out=None):
+        if self.index >= self.count:
+            return False, None
+        out = np.empty(SHAPE, dtype=np.uint8) if out is None else out
+        out[:] = self.index
+        self.index += 1
+        return True, out
+
+    def grab(self):
+        self.index += 1
+        return self.index <= self.count
+
+    def get(self, prop):
+        return 0.0
+
+    def release(self):
+        pass
+
+
+def _waiting_frames(ring):
+    frames = []
+    while (item := ring.next(timeout=0.01)) is not None and item[0] >= 0:
+        frames.append((item[1], int(ring.frames[item[0]][0, 0, 0])))
+    return frames
+
+
+def _capture(app, live, count=20, slots=3):
+    # Thread queues instead of process queues so puts are visible immediately
+    ring = app.SharedFrameRing(SHAPE, slots, ctx=types.SimpleNamespace(Queue=queue.Queue))
+    counters = {"captured": 0, "dropped": 0}
+    cap = NumberedCapture(count)
+    capture = threading.Thread(target=app._capture_stream,
+                               args=(0, cap, None, ring, live, threading.Event(), counters))
+    capture.start()
+    return ring, counters, capture
+
+
+def test_live_stream_replaces_the_oldest_waiting_frame(app):
+    ring, counters, capture = _capture(app, live=True)
+    capture.join(timeout=5)
+    try:
+        # Nobody consumed: the ring holds the newest frames, not the first ones.
+        # Frame 17's slot was taken back for the read that hit the end of the
+        # stream, so only the end marker follows 18 and 19.
+        assert _waiting_frames(ring) == [(18, 18), (19, 19)]
+        assert counters == {"captured": 20, "dropped": 18}
+    finally:
+        ring.close()
+
+
+def test_file_stream_waits_for_free_slots(app):
+    ring, counters, capture = _capture(app, live=False)
+    try:
+        seen = []
+        while len(seen) < 20:
+            item = ring.next(timeout=1.0)
+            assert item is not None
+            seen.append(int(ring.frames[item[0]][0, 0, 0]))
+            ring.release(item[0])
+        assert seen == list(range(20))
+        capture.join(timeout=5)
+        assert counters["dropped"] == 0
+    finally:
+        ring.close()